@@ -1,3 +1,4 @@
+import re
 from logging.config import fileConfig
 
 from sqlalchemy import engine_from_config
@@ -7,7 +8,7 @@ from alembic import context
 
 from app.core.config import settings
 from app.database.database import Base
-from app.models.models import User, Category, Transaction, Budget
+from app.models.models import User, Category, Transaction, Budget, BudgetSpend, MonthlyRollup, IdempotencyKey, SyncTombstone, UserInsight, RecurringTransaction
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -32,6 +33,16 @@ target_metadata = Base.metadata
 # my_important_option = config.get_main_option("my_important_option")
 # ... etc.
 
+# Monthly partitions of transactions (and its default partition) are created at runtime by
+# PartitionService.ensure_partitions() and have no model, so autogenerate must not try to drop them
+PARTITION_TABLE = re.compile(r"^transactions_(\d{4}_\d{2}|default)$")
+
+
+def include_name(name, type_, parent_names) -> bool:
+    if type_ == "table":
+        return not PARTITION_TABLE.match(name)
+    return True
+
 
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
@@ -51,6 +62,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_name=include_name,
     )
 
     with context.begin_transaction():
@@ -72,7 +84,7 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata, include_name=include_name
         )
 
         with context.begin_transaction():
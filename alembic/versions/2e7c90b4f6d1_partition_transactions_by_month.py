@@ -0,0 +1,126 @@
+"""Partition transactions by month
+
+Revision ID: 2e7c90b4f6d1
+Revises: b6d2f48e1a93
+Create Date: 2026-10-18 17:26:40.981305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2e7c90b4f6d1'
+down_revision: Union[str, None] = 'b6d2f48e1a93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = (
+    ('ix_transactions_user_id_id', ['user_id', 'id']),
+    ('ix_transactions_user_id_transaction_date_id', ['user_id', 'transaction_date', 'id']),
+    ('ix_transactions_user_id_category_id_transaction_date_id', ['user_id', 'category_id', 'transaction_date', 'id']),
+    ('ix_transactions_user_id_amount_id', ['user_id', 'amount', 'id']),
+)
+COLUMNS = 'id, amount, is_expense, transaction_date, user_id, category_id'
+
+# Creates (or returns) the partition holding month_start. Rows that already landed in the default
+# partition for that month are moved into the new table before it is attached, since ATTACH
+# refuses ranges the default partition still has rows for.
+CREATE_PARTITION_FUNCTION = """
+CREATE OR REPLACE FUNCTION create_transaction_partition(month_start date) RETURNS text AS $$
+DECLARE
+    lower_bound date := date_trunc('month', month_start)::date;
+    upper_bound date := (date_trunc('month', month_start) + interval '1 month')::date;
+    partition_name text := 'transactions_' || to_char(month_start, 'YYYY_MM');
+BEGIN
+    IF to_regclass(partition_name) IS NOT NULL THEN
+        RETURN partition_name;
+    END IF;
+
+    EXECUTE format('CREATE TABLE %I (LIKE transactions INCLUDING DEFAULTS INCLUDING CONSTRAINTS)', partition_name);
+    EXECUTE format(
+        'WITH moved AS (DELETE FROM transactions_default WHERE transaction_date >= %L AND transaction_date < %L RETURNING *) '
+        'INSERT INTO %I SELECT * FROM moved',
+        lower_bound, upper_bound, partition_name
+    );
+    EXECUTE format(
+        'ALTER TABLE transactions ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+        partition_name, lower_bound, upper_bound
+    );
+    RETURN partition_name;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+
+def upgrade() -> None:
+    # Rows without a date cannot be routed to a partition
+    op.execute("UPDATE transactions SET transaction_date = CURRENT_DATE WHERE transaction_date IS NULL")
+
+    op.rename_table('transactions', 'transactions_legacy')
+    op.execute("ALTER TABLE transactions_legacy RENAME CONSTRAINT transactions_pkey TO transactions_legacy_pkey")
+    for name, _ in INDEXES:
+        op.drop_index(name, table_name='transactions_legacy')
+
+    op.create_table('transactions',
+    sa.Column('id', sa.Integer(), server_default=sa.text("nextval('transactions_id_seq'::regclass)"), nullable=False),
+    sa.Column('amount', sa.Float(), nullable=False),
+    sa.Column('is_expense', sa.Boolean(), server_default='true', nullable=False),
+    sa.Column('transaction_date', sa.Date(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('category_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['category_id'], ['categories.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id', 'transaction_date', name='transactions_pkey'),
+    postgresql_partition_by='RANGE (transaction_date)'
+    )
+    op.execute("CREATE TABLE transactions_default PARTITION OF transactions DEFAULT")
+    op.execute(CREATE_PARTITION_FUNCTION)
+
+    # One partition per month that has data, through a few months ahead
+    op.execute("""
+        SELECT create_transaction_partition(month::date)
+        FROM generate_series(
+            date_trunc('month', (SELECT coalesce(min(transaction_date), CURRENT_DATE) FROM transactions_legacy)),
+            date_trunc('month', greatest(
+                (SELECT max(transaction_date) FROM transactions_legacy),
+                (CURRENT_DATE + interval '3 months')::date
+            )),
+            interval '1 month'
+        ) AS month
+    """)
+    op.execute(f"INSERT INTO transactions ({COLUMNS}) SELECT {COLUMNS} FROM transactions_legacy")
+
+    for name, columns in INDEXES:
+        op.create_index(name, 'transactions', columns, unique=False)
+
+    op.execute("ALTER SEQUENCE transactions_id_seq OWNED BY transactions.id")
+    op.drop_table('transactions_legacy')
+
+
+def downgrade() -> None:
+    op.create_table('transactions_unpartitioned',
+    sa.Column('id', sa.Integer(), server_default=sa.text("nextval('transactions_id_seq'::regclass)"), nullable=False),
+    sa.Column('amount', sa.Float(), nullable=False),
+    sa.Column('is_expense', sa.Boolean(), server_default='true', nullable=False),
+    sa.Column('transaction_date', sa.Date(), server_default=sa.text('now()'), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('category_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['category_id'], ['categories.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id', name='transactions_unpartitioned_pkey'),
+    sa.UniqueConstraint('id', name='transactions_id_key')
+    )
+    op.execute(f"INSERT INTO transactions_unpartitioned ({COLUMNS}) SELECT {COLUMNS} FROM transactions")
+    op.execute("ALTER SEQUENCE transactions_id_seq OWNED BY transactions_unpartitioned.id")
+
+    # Dropping the parent drops every attached partition; detached (archived) ones are left alone
+    op.drop_table('transactions')
+    op.execute("DROP FUNCTION create_transaction_partition(date)")
+
+    op.rename_table('transactions_unpartitioned', 'transactions')
+    op.execute("ALTER TABLE transactions RENAME CONSTRAINT transactions_unpartitioned_pkey TO transactions_pkey")
+    for name, columns in INDEXES:
+        op.create_index(name, 'transactions', columns, unique=False)
@@ -0,0 +1,32 @@
+"""Add user name search indexes
+
+Revision ID: 71fa4c2e9d05
+Revises: 5c08e2d7b9a3
+Create Date: 2026-10-18 16:21:48.337120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '71fa4c2e9d05'
+down_revision: Union[str, None] = '5c08e2d7b9a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Serves ILIKE '%term%' and the % similarity operator used by the relevance-ranked search
+    op.create_index('ix_users_user_name_trgm', 'users', ['user_name'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'user_name': 'gin_trgm_ops'})
+    # Serves lower(user_name) LIKE 'prefix%' for typeahead as a plain btree range scan
+    op.create_index('ix_users_user_name_lower_prefix', 'users', [sa.text('lower(user_name) text_pattern_ops')], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_user_name_lower_prefix', table_name='users')
+    op.drop_index('ix_users_user_name_trgm', table_name='users', postgresql_using='gin')
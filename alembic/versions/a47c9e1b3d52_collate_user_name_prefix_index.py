@@ -0,0 +1,30 @@
+"""Collate the user name prefix index in "C"
+
+Revision ID: a47c9e1b3d52
+Revises: f39b62d0c7a8
+Create Date: 2026-10-18 23:41:09.518274
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a47c9e1b3d52'
+down_revision: Union[str, None] = 'f39b62d0c7a8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # text_pattern_ops serves LIKE 'prefix%' but not ORDER BY, so typeahead sorted every match. The
+    # default opclass in the "C" collation serves both the prefix range scan and the ordered read
+    op.create_index('ix_users_user_name_lower_c', 'users', [sa.text('lower(user_name) COLLATE "C"')], unique=False)
+    op.drop_index('ix_users_user_name_lower_prefix', table_name='users')
+
+
+def downgrade() -> None:
+    op.create_index('ix_users_user_name_lower_prefix', 'users', [sa.text('lower(user_name) text_pattern_ops')], unique=False)
+    op.drop_index('ix_users_user_name_lower_c', table_name='users')
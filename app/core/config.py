@@ -6,11 +6,84 @@ class Settings(BaseSettings):
     db_hostname: str
     db_port: str
     db_name: str
+    # Serve the CRUD routers from an asyncpg AsyncEngine instead of the sync engine
+    db_async: bool = False
+
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: int = 30
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    db_statement_timeout_ms: int = 0
+    # PgBouncer transaction pooling: no session startup options and no server-side prepared statements;
+    # db_statement_timeout_ms is then applied with SET LOCAL at the start of every transaction
+    db_pgbouncer_mode: bool = False
 
     secret_key: str
     algorithm: str
     access_token_expiry_minutes: int
 
+    # Re-check token claims against the users table (through a TTL/LRU cache) on every request, so
+    # deleted users and revoked tokens get a 401. Turned off, a token stays valid until it expires
+    auth_verify_user: bool = True
+    user_cache_ttl_seconds: int = 60
+    user_cache_max_size: int = 10000
+
+    # Stored hashes with a different cost are transparently re-hashed on the next successful login
+    bcrypt_rounds: int = 12
+    # bcrypt releases the GIL, so a small thread pool hashes in parallel without starving other requests
+    password_hash_workers: int = 2
+    # Hash jobs allowed to wait for a worker before signup/login get a 503
+    password_hash_queue_size: int = 32
+
+    # Shared cache version store so every worker sees invalidations. Leave unset only for a single worker
+    # process: in-process counters cannot see writes handled by other workers
+    cache_redis_url: str | None = None
+
+    # Rows validated and written per round-trip by POST /transactions/bulk
+    bulk_ingest_chunk_size: int = 1000
+
+    # Monthly transactions partitions kept ready ahead of the current month, and where detached ones go
+    partition_months_ahead: int = 3
+    partition_archive_schema: str = "archive"
+    partition_maintenance_on_startup: bool = False
+
+    # Per-route latency, SQL and serialization metrics on /metrics and in a Server-Timing header
+    instrumentation_enabled: bool = False
+    instrumentation_server_timing: bool = True
+
+    # Log statements slower than this to the app.database.slow_queries logger; 0 disables it
+    slow_query_threshold_ms: int = 0
+
+    # How long Idempotency-Key responses are replayed, and how many stay cached in process
+    idempotency_key_ttl_seconds: int = 86400
+    idempotency_cache_max_size: int = 10000
+
+    # Spending insights: history window, anomaly cut-off, and how long precomputed results are served
+    insights_lookback_days: int = 180
+    insights_recent_days: int = 30
+    insights_anomaly_z: float = 3.0
+    insights_min_samples: int = 5
+    insights_max_age_hours: int = 24
+
+    # Recurring transactions: rules leased per batch, pause between passes, and whether the API
+    # process runs the scheduler itself instead of relying on app.jobs.run_recurring workers.
+    # A batch blocks its users' writes and /sync reads until it commits, so keep it small
+    recurring_batch_size: int = 50
+    recurring_interval_seconds: int = 300
+    recurring_scheduler_enabled: bool = False
+
+    # Users whose tokens may request an X-Profile report of a single request and read /internal
+    profiling_enabled: bool = False
+    admin_user_names: list[str] = []
+
+    # Responses smaller than compression_min_size bytes are sent as they are; brotli is used
+    # when the client accepts it and the brotli package is installed, gzip otherwise
+    compression_enabled: bool = True
+    compression_min_size: int = 1024
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 4
+
     class Config():
         env_file = ".env"
 
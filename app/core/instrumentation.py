@@ -0,0 +1,173 @@
+import threading
+from bisect import bisect_left
+from contextvars import ContextVar
+from time import perf_counter
+from sqlalchemy import event
+from starlette.datastructures import MutableHeaders
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+class RequestStats:
+    """Per-request counters, shared by reference with the threadpool contexts sync endpoints run in."""
+
+    __slots__ = ("query_count", "db_seconds", "serialize_seconds", "response_size")
+
+    def __init__(self):
+        self.query_count = 0
+        self.db_seconds = 0.0
+        self.serialize_seconds = 0.0
+        self.response_size = 0
+
+    def server_timing(self, total_seconds: float) -> str:
+        return (
+            f'db;dur={self.db_seconds * 1000:.2f};desc="{self.query_count} queries", '
+            f"serialize;dur={self.serialize_seconds * 1000:.2f}, "
+            f"total;dur={total_seconds * 1000:.2f}"
+        )
+
+
+current_request: ContextVar[RequestStats | None] = ContextVar("current_request", default=None)
+
+
+class Histogram:
+    """Prometheus-style histogram; counts are kept per bucket and made cumulative when rendered."""
+
+    __slots__ = ("buckets", "counts", "total", "count")
+
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def render(self, name: str, labels: str) -> list:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {self.count}')
+        lines.append(f"{name}_sum{{{labels}}} {self.total}")
+        lines.append(f"{name}_count{{{labels}}} {self.count}")
+        return lines
+
+
+HISTOGRAMS = (
+    ("http_request_duration_seconds", "Request latency", LATENCY_BUCKETS),
+    ("http_request_db_queries", "SQL statements executed per request", QUERY_COUNT_BUCKETS),
+    ("http_request_db_duration_seconds", "Time spent in SQL statements per request", LATENCY_BUCKETS),
+    ("http_request_serialize_duration_seconds", "Time spent serializing the response body", LATENCY_BUCKETS),
+    ("http_response_size_bytes", "Response body size", SIZE_BUCKETS),
+)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._requests = {}
+
+    def observe(self, method: str, route: str, status: int, seconds: float, stats: RequestStats):
+        values = (seconds, stats.query_count, stats.db_seconds, stats.serialize_seconds, stats.response_size)
+        with self._lock:
+            histograms = self._histograms.get((method, route))
+            if histograms is None:
+                histograms = self._histograms[(method, route)] = [Histogram(buckets) for _, _, buckets in HISTOGRAMS]
+            for histogram, value in zip(histograms, values):
+                histogram.observe(value)
+            key = (method, route, status)
+            self._requests[key] = self._requests.get(key, 0) + 1
+
+    def render(self) -> str:
+        """Prometheus text exposition format, version 0.0.4."""
+        with self._lock:
+            lines = ["# HELP http_requests_total Requests handled", "# TYPE http_requests_total counter"]
+            for (method, route, status), count in sorted(self._requests.items()):
+                lines.append(f'http_requests_total{{method="{method}",route="{_escape(route)}",status="{status}"}} {count}')
+
+            for index, (name, description, _) in enumerate(HISTOGRAMS):
+                lines.append(f"# HELP {name} {description}")
+                lines.append(f"# TYPE {name} histogram")
+                for (method, route), histograms in sorted(self._histograms.items()):
+                    lines.extend(histograms[index].render(name, f'method="{method}",route="{_escape(route)}"'))
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+
+def record_serialization(seconds: float):
+    stats = current_request.get()
+    if stats is not None:
+        stats.serialize_seconds += seconds
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and current_request.get() is not None:
+        context._instrumentation_start = perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = current_request.get()
+    start = getattr(context, "_instrumentation_start", None)
+    if stats is not None and start is not None:
+        stats.query_count += 1
+        stats.db_seconds += perf_counter() - start
+
+
+def attach_engine(engine):
+    """Count and time every statement ``engine`` runs on behalf of an instrumented request."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class InstrumentationMiddleware:
+    """Pure ASGI middleware, so streaming responses pass through without being buffered.
+
+    Routes are labelled by their path template (``/transactions/{transaction_id}``), never the raw
+    path, to keep the label set bounded.
+    """
+
+    def __init__(self, app, registry: MetricsRegistry = metrics, server_timing: bool = True):
+        self.app = app
+        self.registry = registry
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = current_request.set(stats)
+        start = perf_counter()
+        status = 500
+
+        async def send_with_stats(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.server_timing:
+                    MutableHeaders(scope=message).append("Server-Timing", stats.server_timing(perf_counter() - start))
+            elif message["type"] == "http.response.body":
+                stats.response_size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            current_request.reset(token)
+            route = getattr(scope.get("route"), "path", "<unmatched>")
+            self.registry.observe(scope["method"], route, status, perf_counter() - start, stats)
@@ -0,0 +1,140 @@
+import cProfile
+import inspect
+import io
+import pstats
+from contextvars import ContextVar
+from functools import wraps
+from fastapi import HTTPException
+from fastapi.routing import APIRoute
+from app.core.config import settings
+from app.core.security import get_access_token_payload
+
+try:
+    import pyinstrument
+except ImportError:
+    pyinstrument = None
+
+
+class ProfileSession:
+    """One request's profiler: pyinstrument when installed, cProfile otherwise."""
+
+    def __init__(self):
+        if pyinstrument is not None:
+            self.profiler = pyinstrument.Profiler(async_mode="enabled")
+        else:
+            self.profiler = cProfile.Profile()
+
+    def start(self):
+        if pyinstrument is not None:
+            self.profiler.start()
+        else:
+            self.profiler.enable()
+
+    def stop(self):
+        if pyinstrument is not None:
+            self.profiler.stop()
+        else:
+            self.profiler.disable()
+
+    def report(self) -> str:
+        if pyinstrument is not None:
+            return self.profiler.output_text(unicode=True)
+        stream = io.StringIO()
+        pstats.Stats(self.profiler, stream=stream).sort_stats("cumulative").print_stats(50)
+        return stream.getvalue()
+
+
+current_profile: ContextVar[ProfileSession | None] = ContextVar("current_profile", default=None)
+
+
+def profiled(endpoint):
+    """Run ``endpoint`` under the request's profiler, if one was requested.
+
+    Wrapping the endpoint rather than the ASGI app puts the profiler on the thread that actually
+    runs sync endpoints, instead of the event loop that only awaits them.
+    """
+    if inspect.iscoroutinefunction(endpoint):
+        @wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            session = current_profile.get()
+            if session is None:
+                return await endpoint(*args, **kwargs)
+            session.start()
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                session.stop()
+    else:
+        @wraps(endpoint)
+        def wrapper(*args, **kwargs):
+            session = current_profile.get()
+            if session is None:
+                return endpoint(*args, **kwargs)
+            session.start()
+            try:
+                return endpoint(*args, **kwargs)
+            finally:
+                session.stop()
+    return wrapper
+
+
+class ProfiledRoute(APIRoute):
+    """Route class for routers whose endpoints can be profiled with the X-Profile header."""
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, profiled(endpoint), **kwargs)
+
+
+def is_admin_request(headers: dict) -> bool:
+    scheme, _, token = headers.get(b"authorization", b"").decode("latin-1").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    try:
+        payload = get_access_token_payload(token)
+    except HTTPException:
+        return False
+    return payload.get("username") in settings.admin_user_names
+
+
+class ProfilingMiddleware:
+    """Replace the response with a profile report when an admin sends ``X-Profile: 1``.
+
+    The endpoint's own response is discarded; its status is returned in ``X-Profiled-Status``.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        if headers.get(b"x-profile") not in (b"1", b"true") or not is_admin_request(headers):
+            await self.app(scope, receive, send)
+            return
+
+        session = ProfileSession()
+        token = current_profile.set(session)
+        status = 500
+
+        async def discard(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+
+        try:
+            await self.app(scope, receive, discard)
+        finally:
+            current_profile.reset(token)
+
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"text/plain; charset=utf-8"),
+                (b"x-profiled-status", str(status).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": session.report().encode()})
@@ -1,38 +1,85 @@
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError, jwt
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta, timezone
 from passlib.context import CryptContext
-from app.database.database import get_db
+from app.database.database import get_async_db, get_db
 from app.models.models import User
-from app.schemas.auth import TokenResponse
+from app.schemas.auth import TokenResponse, CurrentUser
 from app.core.config import settings
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.core.cache import TTLCache
+
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.bcrypt_rounds,
+    bcrypt__min_rounds=settings.bcrypt_rounds,
+    bcrypt__max_rounds=settings.bcrypt_rounds,
+)
 auth_scheme = HTTPBearer()
 
+# user id -> token_version, only consulted when settings.auth_verify_user is on
+user_cache = TTLCache(max_size=settings.user_cache_max_size, ttl=settings.user_cache_ttl_seconds)
+
+password_hash_executor = ThreadPoolExecutor(max_workers=settings.password_hash_workers, thread_name_prefix="password-hash")
+password_hash_slots = threading.BoundedSemaphore(settings.password_hash_workers + settings.password_hash_queue_size)
+
+
+def submit_password_job(fn, *args) -> Future:
+    """Run a bcrypt call on the bounded hashing pool, rejecting with 503 once the queue is full."""
+    if not password_hash_slots.acquire(blocking=False):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many authentication requests, please retry shortly.",
+            headers={"Retry-After": "1"},
+        )
+    future = password_hash_executor.submit(fn, *args)
+    future.add_done_callback(lambda _: password_hash_slots.release())
+    return future
+
+
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return submit_password_job(pwd_context.hash, password).result()
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return submit_password_job(pwd_context.verify, plain_password, hashed_password).result()
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """Verify a password, also returning a new hash when the stored one uses an outdated cost."""
+    return submit_password_job(pwd_context.verify_and_update, plain_password, hashed_password).result()
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await asyncio.wrap_future(submit_password_job(pwd_context.hash, password))
+
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    return await asyncio.wrap_future(submit_password_job(pwd_context.verify_and_update, plain_password, hashed_password))
 
 
 def create_access_token(data: dict, expires_delta: timedelta):
     payload = data.copy()
     expire = datetime.now(timezone.utc) + expires_delta
-    payload.update({"exp": expire})
+    payload.update({"exp": expire, "type": "access"})
     return jwt.encode(payload, settings.secret_key, algorithm=settings.algorithm)
 
 
 def create_refresh_token(data: dict):
-    return jwt.encode(data, settings.secret_key, algorithm=settings.algorithm)
+    payload = data.copy()
+    payload.update({"type": "refresh"})
+    return jwt.encode(payload, settings.secret_key, algorithm=settings.algorithm)
 
 
-def get_user_token(user_id: int, refresh_token: str = None):
-    payload = {"id": user_id}
+def get_user_token(user_id: int, user_name: str = None, token_version: int = 0, refresh_token: str = None):
+    payload = {"id": user_id, "username": user_name, "ver": token_version}
     access_token = create_access_token(payload, timedelta(minutes=settings.access_token_expiry_minutes))
 
     if not refresh_token:
@@ -56,11 +103,24 @@ def get_token_payload(token: str):
         )
 
 
+def get_access_token_payload(token: str):
+    """Claims of a bearer token, rejecting refresh tokens and anything else without an expiry."""
+    payload = get_token_payload(token)
+    # Access tokens issued before the type claim existed still carry exp; refresh tokens never do
+    if payload.get("type", "access") != "access" or "exp" not in payload or payload.get("id") is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return payload
+
+
 def get_current_user(
     token: HTTPAuthorizationCredentials = Depends(auth_scheme),
     db: Session = Depends(get_db),
 ):
-    payload = get_token_payload(token.credentials)
+    payload = get_access_token_payload(token.credentials)
     user_id = payload.get("id")
     user = db.query(User).filter(User.id == user_id).first()
 
@@ -68,3 +128,69 @@ def get_current_user(
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
 
     return user
+
+
+def get_current_principal(
+    token: HTTPAuthorizationCredentials = Depends(auth_scheme),
+    db: Session = Depends(get_db),
+) -> CurrentUser:
+    """Build the request principal from verified token claims, checked against the users table
+    (through user_cache) when auth_verify_user is on."""
+    payload = get_access_token_payload(token.credentials)
+    principal = CurrentUser(id=payload["id"], user_name=payload.get("username"), token_version=payload.get("ver", 0))
+    if settings.auth_verify_user:
+        verify_principal(db, principal)
+    return principal
+
+
+async def get_current_principal_async(
+    token: HTTPAuthorizationCredentials = Depends(auth_scheme),
+    db: AsyncSession = Depends(get_async_db),
+) -> CurrentUser:
+    """get_current_principal for the async routers, verifying through the request's AsyncSession."""
+    payload = get_access_token_payload(token.credentials)
+    principal = CurrentUser(id=payload["id"], user_name=payload.get("username"), token_version=payload.get("ver", 0))
+    if settings.auth_verify_user:
+        await verify_principal_async(db, principal)
+    return principal
+
+
+def get_admin_principal(principal: CurrentUser = Depends(get_current_principal)) -> CurrentUser:
+    """The request principal, provided its user name is listed in ``admin_user_names``."""
+    if principal.user_name not in settings.admin_user_names:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+    return principal
+
+
+def verify_principal(db: Session, principal: CurrentUser):
+    token_version = user_cache.get(principal.id)
+    if token_version is None:
+        db_user = db.query(User.token_version).filter(User.id == principal.id).first()
+        if not db_user:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+        token_version = db_user.token_version
+        user_cache.set(principal.id, token_version)
+
+    if token_version != principal.token_version:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token has been revoked")
+
+
+async def verify_principal_async(db: AsyncSession, principal: CurrentUser):
+    token_version = user_cache.get(principal.id)
+    if token_version is None:
+        token_version = (await db.execute(select(User.token_version).where(User.id == principal.id))).scalar()
+        if token_version is None:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+        user_cache.set(principal.id, token_version)
+
+    if token_version != principal.token_version:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token has been revoked")
+
+
+def invalidate_cached_user(user_id: int):
+    user_cache.invalidate(user_id)
+
+
+def revoke_tokens(db_user: User):
+    """Invalidate every token issued to ``db_user`` so far; the caller commits, then drops the cache entry."""
+    db_user.token_version = User.token_version + 1
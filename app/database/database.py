@@ -1,21 +1,104 @@
-from sqlalchemy import create_engine
+from uuid import uuid4
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from typing import Generator
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+from typing import AsyncGenerator, Generator
 from app.core.config import settings
+from app.database.pool_stats import PoolStats, instrumented
+from app.database.slow_queries import SlowQueryLogger
 
 DATABASE_URL = f"postgresql://{settings.db_username}:{settings.db_password}@{settings.db_hostname}:{settings.db_port}/{settings.db_name}"
+ASYNC_DATABASE_URL = f"postgresql+asyncpg://{settings.db_username}:{settings.db_password}@{settings.db_hostname}:{settings.db_port}/{settings.db_name}"
 
-engine = create_engine(DATABASE_URL)
+
+def engine_options(is_async: bool = False) -> dict:
+    connect_args = {}
+    if settings.db_pgbouncer_mode:
+        # Transaction pooling hands each transaction to any server connection, so session state and
+        # named prepared statements cannot be relied on. psycopg2 never prepares server-side.
+        # The statement timeout is set per transaction instead; see set_local_statement_timeout.
+        if is_async:
+            connect_args["statement_cache_size"] = 0
+            connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid4()}__"
+    elif settings.db_statement_timeout_ms:
+        if is_async:
+            connect_args["server_settings"] = {"statement_timeout": str(settings.db_statement_timeout_ms)}
+        else:
+            connect_args["options"] = f"-c statement_timeout={settings.db_statement_timeout_ms}"
+
+    return {
+        "poolclass": instrumented(AsyncAdaptedQueuePool if is_async else QueuePool),
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "connect_args": connect_args,
+    }
+
+
+def set_local_statement_timeout(target_engine):
+    """Run ``SET LOCAL statement_timeout`` at the start of every transaction on ``target_engine``.
+
+    Costs a round trip per transaction, so it is only used where the connection startup option
+    cannot be: PgBouncer rejects it, and a plain SET would leak to whichever client gets the server
+    connection next.
+    """
+    timeout_ms = int(settings.db_statement_timeout_ms)
+
+    @event.listens_for(target_engine, "begin")
+    def apply_timeout(connection):
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {timeout_ms}")
+
+
+engine = create_engine(DATABASE_URL, **engine_options())
+if settings.db_pgbouncer_mode and settings.db_statement_timeout_ms:
+    set_local_statement_timeout(engine)
+pool_stats = {"sync": PoolStats()}
+pool_stats["sync"].attach(engine.pool)
+
+slow_query_logger = None
+if settings.slow_query_threshold_ms:
+    slow_query_logger = SlowQueryLogger(settings.slow_query_threshold_ms)
+    slow_query_logger.attach(engine)
 
 Base = declarative_base()
 Base.metadata.create_all(engine)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = None
+AsyncSessionLocal = None
+if settings.db_async:
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+    async_url = ASYNC_DATABASE_URL + ("?prepared_statement_cache_size=0" if settings.db_pgbouncer_mode else "")
+    async_engine = create_async_engine(async_url, **engine_options(is_async=True))
+    if settings.db_pgbouncer_mode and settings.db_statement_timeout_ms:
+        set_local_statement_timeout(async_engine.sync_engine)
+    pool_stats["async"] = PoolStats()
+    pool_stats["async"].attach(async_engine.sync_engine.pool)
+    if slow_query_logger is not None:
+        slow_query_logger.attach(async_engine.sync_engine)
+    # Objects stay loaded after commit; there is no implicit lazy refresh on an AsyncSession
+    AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
 def get_db() -> Generator:
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def get_pool_stats() -> dict:
+    stats = {"sync": pool_stats["sync"].snapshot(engine.pool)}
+    if async_engine is not None:
+        stats["async"] = pool_stats["async"].snapshot(async_engine.sync_engine.pool)
+    return stats
@@ -0,0 +1,74 @@
+import logging
+import sys
+from time import perf_counter
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+
+def parameter_shape(parameters, executemany: bool = False):
+    """Describe bound parameters by type (and length for sequences) without logging their values."""
+    if executemany:
+        rows = list(parameters or ())
+        return {"rows": len(rows), "row": parameter_shape(rows[0]) if rows else None}
+    if isinstance(parameters, dict):
+        return {key: _value_shape(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [_value_shape(value) for value in parameters]
+    return _value_shape(parameters)
+
+
+def _value_shape(value) -> str:
+    if isinstance(value, (list, tuple, set)):
+        return f"{type(value).__name__}[{len(value)}]"
+    return type(value).__name__
+
+
+def find_origin(frame) -> dict:
+    """Walk outwards from ``frame`` to the innermost service function and the router endpoint above it.
+
+    Statements issued through AsyncSession run in a greenlet whose stack stops at SQLAlchemy, so
+    their origin is reported as unknown.
+    """
+    origin = {}
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith("app.services.") and "service" not in origin:
+            origin["service"] = f"{module}.{frame.f_code.co_qualname}"
+        elif module.startswith("app.routers.") or module.startswith("app.jobs."):
+            origin["caller"] = f"{module}.{frame.f_code.co_qualname}"
+            break
+        frame = frame.f_back
+    return origin or {"caller": "unknown"}
+
+
+class SlowQueryLogger:
+    """Logs every statement slower than ``threshold_ms`` with its SQL, parameter shapes and origin."""
+
+    def __init__(self, threshold_ms: int):
+        self.threshold = threshold_ms / 1000
+
+    def attach(self, engine):
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._slow_query_start = perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, "_slow_query_start", None)
+        if start is None:
+            return
+        duration = perf_counter() - start
+        if duration < self.threshold:
+            return
+
+        origin = find_origin(sys._getframe(1))
+        logger.warning(
+            "slow query %.1f ms from %s: %s params=%s",
+            duration * 1000,
+            " <- ".join(origin.get(key) for key in ("service", "caller") if origin.get(key)),
+            " ".join(statement.split()),
+            parameter_shape(parameters, executemany),
+        )
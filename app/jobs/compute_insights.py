@@ -0,0 +1,65 @@
+"""Precompute spending insights for every user across a pool of worker processes.
+
+Usage: python -m app.jobs.compute_insights [--workers 4] [--batch-size 200]
+"""
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from sqlalchemy import select
+from app.database.database import SessionLocal, engine
+from app.models.models import User
+from app.services.insights import InsightService
+
+
+def reset_engine():
+    # Forked workers must not reuse the parent's pooled connections
+    engine.dispose(close=False)
+
+
+def compute_batch(user_ids: list) -> int:
+    db = SessionLocal()
+    try:
+        for user_id in user_ids:
+            InsightService.refresh(db, user_id)
+        db.commit()
+        return len(user_ids)
+    finally:
+        db.close()
+
+
+def iter_user_batches(batch_size: int):
+    db = SessionLocal()
+    try:
+        last_id = 0
+        while True:
+            user_ids = db.execute(
+                select(User.id).where(User.id > last_id).order_by(User.id.asc()).limit(batch_size)
+            ).scalars().all()
+            if not user_ids:
+                return
+            last_id = user_ids[-1]
+            yield user_ids
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes")
+    parser.add_argument("--batch-size", type=int, default=200, help="Users computed and committed per task")
+    args = parser.parse_args()
+
+    if not InsightService.numpy_available():
+        parser.error("numpy is required to compute insights")
+
+    computed = 0
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=reset_engine) as pool:
+        futures = [pool.submit(compute_batch, user_ids) for user_ids in iter_user_batches(args.batch_size)]
+        for future in as_completed(futures):
+            computed += future.result()
+    print(json.dumps({"users": computed}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""Create upcoming monthly transactions partitions and archive old ones.
+
+Usage: python -m app.jobs.maintain_partitions [--months-ahead 3] [--archive-before 2024-01-01 [--drop]]
+"""
+import argparse
+import json
+from datetime import date
+from app.database.database import SessionLocal
+from app.services.partitions import PartitionService
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--months-ahead", type=int, default=None, help="Months after the current one to keep partitioned")
+    parser.add_argument("--archive-before", type=date.fromisoformat, default=None,
+                        help="Detach partitions for months before this date's month")
+    parser.add_argument("--drop", action="store_true", help="Drop archived partitions instead of moving them to the archive schema")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        report = {"partitions": PartitionService.ensure_partitions(db, args.months_ahead)}
+        if args.archive_before:
+            report["archived"] = PartitionService.archive_partitions(db, args.archive_before, drop=args.drop)
+    finally:
+        db.close()
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+"""Delete Idempotency-Key records older than IDEMPOTENCY_KEY_TTL_SECONDS.
+
+Usage: python -m app.jobs.purge_idempotency_keys [--ttl-seconds 86400] [--batch-size 1000]
+"""
+import argparse
+import json
+from app.database.database import SessionLocal
+from app.services.idempotency import IdempotencyService
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ttl-seconds", type=int, default=None, help="Override the configured key lifetime")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Keys deleted per transaction")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        purged = IdempotencyService.purge_expired(db, ttl_seconds=args.ttl_seconds, batch_size=args.batch_size)
+    finally:
+        db.close()
+    print(json.dumps({"purged": purged}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
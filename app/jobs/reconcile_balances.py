@@ -0,0 +1,26 @@
+"""Recompute users.current_balance from the transaction ledger and report drift.
+
+Usage: python -m app.jobs.reconcile_balances [--batch-size 500] [--fix]
+"""
+import argparse
+import json
+from app.database.database import SessionLocal
+from app.services.balances import BalanceService
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=500, help="Users locked and checked per batch")
+    parser.add_argument("--fix", action="store_true", help="Overwrite drifted balances with the recomputed value")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        report = BalanceService.reconcile(db, batch_size=args.batch_size, fix=args.fix)
+    finally:
+        db.close()
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Post due recurring transactions, once or on a fixed interval.
+
+Usage: python -m app.jobs.run_recurring [--once] [--interval-seconds 300] [--batch-size 50]
+
+Any number of workers can run side by side; each leases different rules.
+"""
+import argparse
+import json
+import threading
+from app.core.config import settings
+from app.database.database import SessionLocal
+from app.services.recurring import RecurringService
+
+
+def run_pending(batch_size: int = None) -> dict:
+    db = SessionLocal()
+    try:
+        return RecurringService.materialize_due(db, batch_size=batch_size or settings.recurring_batch_size)
+    finally:
+        db.close()
+
+
+def serve(stop: threading.Event, interval_seconds: int = None, batch_size: int = None, report=None):
+    """Run until ``stop`` is set, sleeping ``interval_seconds`` between passes."""
+    interval_seconds = interval_seconds or settings.recurring_interval_seconds
+    while not stop.is_set():
+        try:
+            result = run_pending(batch_size)
+            if report:
+                report(result)
+        except ValueError as e:
+            # A failed pass rolled back; its rules are retried on the next one
+            if report:
+                report({"error": str(e)})
+        stop.wait(interval_seconds)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--once", action="store_true", help="Run a single catch-up pass and exit")
+    parser.add_argument("--interval-seconds", type=int, default=None, help="Pause between passes")
+    parser.add_argument("--batch-size", type=int, default=None, help="Rules leased per DB transaction")
+    args = parser.parse_args()
+
+    if args.once:
+        print(json.dumps(run_pending(args.batch_size), indent=2))
+        return
+
+    stop = threading.Event()
+    try:
+        serve(stop, args.interval_seconds, args.batch_size, report=lambda result: print(json.dumps(result), flush=True))
+    except KeyboardInterrupt:
+        stop.set()
+
+
+if __name__ == "__main__":
+    main()
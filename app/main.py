@@ -1,11 +1,92 @@
-from fastapi import FastAPI
-from app.routers import categories, auth, users, transactions
+from fastapi import APIRouter, FastAPI, Request
+from app.core.config import settings
+from app.utils.responses import BadRequest, ResponseHandler
+from app.routers import categories, auth, users, transactions, budgets, recurring, reports, insights, sync, internal
 
 app = FastAPI(
     title="Personal Budget App"
 )
 
-app.include_router(categories.router)
-app.include_router(transactions.router)
-app.include_router(users.router)
-app.include_router(auth.router)
\ No newline at end of file
+@app.exception_handler(BadRequest)
+async def bad_request_handler(request: Request, exc: BadRequest):
+    return ResponseHandler.bad_request_response(message=str(exc))
+
+
+def include_routers(app: FastAPI, routers: list, overrides: list = ()):
+    """Mount ``routers``, letting routes in ``overrides`` replace those with the same path and method."""
+    overridden = {(route.path, method) for router in overrides for route in router.routes for method in route.methods}
+    for router in routers:
+        remaining = APIRouter()
+        remaining.routes.extend(
+            route for route in router.routes
+            if not overridden.intersection((route.path, method) for method in route.methods)
+        )
+        app.include_router(remaining)
+    for router in overrides:
+        app.include_router(router)
+
+
+async_routers = []
+if settings.db_async:
+    from app.routers.aio import categories as aio_categories, auth as aio_auth, users as aio_users, transactions as aio_transactions
+    async_routers = [aio_categories.router, aio_transactions.router, aio_users.router, aio_auth.router]
+
+if settings.partition_maintenance_on_startup:
+    from app.database.database import SessionLocal
+    from app.services.partitions import PartitionService
+
+    @app.on_event("startup")
+    def ensure_transaction_partitions():
+        db = SessionLocal()
+        try:
+            PartitionService.ensure_partitions(db)
+        finally:
+            db.close()
+
+
+if settings.recurring_scheduler_enabled:
+    import threading
+    from app.jobs.run_recurring import serve
+
+    recurring_stop = threading.Event()
+
+    @app.on_event("startup")
+    def start_recurring_scheduler():
+        threading.Thread(target=serve, args=(recurring_stop,), name="recurring-scheduler", daemon=True).start()
+
+    @app.on_event("shutdown")
+    def stop_recurring_scheduler():
+        recurring_stop.set()
+
+
+if settings.compression_enabled:
+    from app.core.compression import CompressionMiddleware
+
+    # Added before instrumentation so response size metrics count the compressed bytes
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.compression_min_size,
+        gzip_level=settings.compression_gzip_level,
+        brotli_quality=settings.compression_brotli_quality
+    )
+
+
+if settings.instrumentation_enabled:
+    from app.core.instrumentation import InstrumentationMiddleware, attach_engine
+    from app.database.database import engine, async_engine
+    from app.routers import metrics
+
+    attach_engine(engine)
+    if async_engine is not None:
+        attach_engine(async_engine.sync_engine)
+    app.add_middleware(InstrumentationMiddleware, server_timing=settings.instrumentation_server_timing)
+    app.include_router(metrics.router)
+
+
+if settings.profiling_enabled:
+    from app.core.profiling import ProfilingMiddleware
+
+    app.add_middleware(ProfilingMiddleware)
+
+
+include_routers(app, [categories.router, transactions.router, budgets.router, recurring.router, reports.router, insights.router, sync.router, users.router, auth.router, internal.router], async_routers)
@@ -1,7 +1,20 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, Float, Enum, Date, func
+from sqlalchemy import Column, Integer, BigInteger, String, Text, ForeignKey, Boolean, Float, Enum, Date, DateTime, Index, PrimaryKeyConstraint, Sequence, FetchedValue, func
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from app.database.database import Base
 
+# One counter shared by every synced table, so a single number orders all changes a client has seen
+sync_change_seq = Sequence("sync_change_seq", metadata=Base.metadata)
+
+
+def updated_at_column():
+    return Column(DateTime(timezone=True), nullable=False, server_default=func.now(), server_onupdate=FetchedValue())
+
+
+def change_id_column():
+    """Stamped with the next sync_change_seq value by the sync_stamp_row() trigger on every insert and update."""
+    return Column(BigInteger, nullable=False, server_default=sync_change_seq.next_value(), server_onupdate=FetchedValue())
+
 class User(Base):
     __tablename__ = "users"
 
@@ -12,10 +25,18 @@ class User(Base):
     email = Column(String, unique=True, nullable=False)
     hashed_password = Column(String, nullable=False)
     current_balance = Column(Float, nullable=False, default=0.0, server_default="0.0")
+    opening_balance = Column(Float, nullable=False, default=0.0, server_default="0.0")
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
 
     transactions = relationship("Transaction", back_populates="user")
     budgets = relationship("Budget", back_populates="user")
 
+    __table_args__ = (
+        # Substring search (ILIKE '%q%') and case-insensitive prefix search with a byte-order sort
+        Index("ix_users_user_name_trgm", "user_name", postgresql_using="gin", postgresql_ops={"user_name": "gin_trgm_ops"}),
+        Index("ix_users_user_name_lower_c", func.lower(user_name).collate("C")),
+    )
+
 
 class Category(Base):
     __tablename__ = "categories"
@@ -23,18 +44,25 @@ class Category(Base):
     id = Column(Integer, primary_key=True, nullable=False, unique=True, autoincrement=True)
     name = Column(String, unique=True, nullable=False)
     description = Column(String, nullable=True)
+    updated_at = updated_at_column()
+    change_id = change_id_column()
 
     transactions = relationship("Transaction", back_populates="category")
     budgets = relationship("Budget", back_populates="category")
 
+    __table_args__ = (
+        Index("ix_categories_change_id", "change_id"),
+    )
+
 
 class Transaction(Base):
     __tablename__ = "transactions"
 
-    id = Column(Integer, primary_key=True, nullable=False, unique=True, autoincrement=True)
+    id = Column(Integer, primary_key=True, nullable=False, autoincrement=True)
     amount = Column(Float, nullable=False)
     is_expense = Column(Boolean, nullable=False, default=True, server_default="true")
-    transaction_date = Column(Date, server_default=func.now())
+    # Part of the table's primary key because Postgres requires the partition key in every unique constraint
+    transaction_date = Column(Date, primary_key=True, nullable=False, server_default=func.now())
 
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     user = relationship("User", back_populates="transactions")
@@ -42,6 +70,20 @@ class Transaction(Base):
     category_id = Column(Integer, ForeignKey("categories.id", ondelete="CASCADE"), nullable=False)
     category = relationship("Category", back_populates="transactions")
 
+    updated_at = updated_at_column()
+    change_id = change_id_column()
+
+    __table_args__ = (
+        Index("ix_transactions_user_id_id", "user_id", "id"),
+        Index("ix_transactions_user_id_change_id", "user_id", "change_id"),
+        Index("ix_transactions_user_id_transaction_date_id", "user_id", "transaction_date", "id"),
+        Index("ix_transactions_user_id_category_id_transaction_date_id", "user_id", "category_id", "transaction_date", "id"),
+        Index("ix_transactions_user_id_amount_id", "user_id", "amount", "id"),
+        {"postgresql_partition_by": "RANGE (transaction_date)"},
+    )
+    # Rows are still identified by id alone, so updates and deletes keep addressing them the same way
+    __mapper_args__ = {"primary_key": [id]}
+
 
 class Budget(Base):
     __tablename__ = "budgets"
@@ -55,3 +97,114 @@ class Budget(Base):
 
     category_id = Column(Integer, ForeignKey("categories.id", ondelete="CASCADE"), nullable=False)
     category = relationship("Category", back_populates="budgets")
+
+    updated_at = updated_at_column()
+    change_id = change_id_column()
+
+    __table_args__ = (
+        Index("ix_budgets_user_id_change_id", "user_id", "change_id"),
+    )
+
+
+class BudgetSpend(Base):
+    """Running expense total per (user, category, period bucket), maintained on every transaction write."""
+    __tablename__ = "budget_spend"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    category_id = Column(Integer, ForeignKey("categories.id", ondelete="CASCADE"), nullable=False)
+    period = Column(Enum("daily", "weekly", "monthly", name="budget_period", create_type=False), nullable=False)
+    period_start = Column(Date, nullable=False)
+    spent = Column(Float, nullable=False, default=0.0, server_default="0.0")
+
+    __table_args__ = (
+        PrimaryKeyConstraint("user_id", "category_id", "period", "period_start"),
+    )
+
+
+class MonthlyRollup(Base):
+    """Per (user, category, month) income and expense totals, maintained on every transaction write."""
+    __tablename__ = "monthly_rollups"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    category_id = Column(Integer, ForeignKey("categories.id", ondelete="CASCADE"), nullable=False)
+    month = Column(Date, nullable=False)
+    income = Column(Float, nullable=False, default=0.0, server_default="0.0")
+    expense = Column(Float, nullable=False, default=0.0, server_default="0.0")
+    transaction_count = Column(Integer, nullable=False, default=0, server_default="0")
+
+    __table_args__ = (
+        PrimaryKeyConstraint("user_id", "month", "category_id"),
+    )
+
+
+class IdempotencyKey(Base):
+    """Response of a create request, replayed to retries that send the same Idempotency-Key."""
+    __tablename__ = "idempotency_keys"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    key = Column(String(255), nullable=False)
+    request_hash = Column(String(64), nullable=False)
+    # NULL until the original request has finished
+    status_code = Column(Integer, nullable=True)
+    response_body = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        PrimaryKeyConstraint("user_id", "key"),
+        Index("ix_idempotency_keys_created_at", "created_at"),
+    )
+
+
+class SyncTombstone(Base):
+    """A deleted transaction, budget or category, recorded by trigger so GET /sync can report the delete."""
+    __tablename__ = "sync_tombstones"
+
+    change_id = Column(BigInteger, primary_key=True, autoincrement=False)
+    entity = Column(String(32), nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    # NULL for categories, which every user syncs
+    user_id = Column(Integer, nullable=True)
+    deleted_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_sync_tombstones_user_id_change_id", "user_id", "change_id"),
+    )
+
+
+class UserInsight(Base):
+    """Latest precomputed InsightsResponse per user, written by the nightly insights job."""
+    __tablename__ = "user_insights"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True, autoincrement=False)
+    generated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    payload = Column(JSONB, nullable=False)
+
+
+class RecurringTransaction(Base):
+    """A rule that posts a transaction every ``interval`` days, weeks, months or years from start_date.
+
+    Occurrence n is computed from start_date rather than from the previous one, so a rule anchored on
+    the 31st posts on the last day of shorter months and returns to the 31st afterwards.
+    """
+    __tablename__ = "recurring_transactions"
+
+    id = Column(Integer, primary_key=True, nullable=False, autoincrement=True)
+    amount = Column(Float, nullable=False)
+    is_expense = Column(Boolean, nullable=False, default=True, server_default="true")
+    frequency = Column(Enum("daily", "weekly", "monthly", "yearly", name="recurrence_frequency", create_type=True), nullable=False)
+    interval = Column(Integer, nullable=False, default=1, server_default="1")
+    start_date = Column(Date, nullable=False)
+    end_date = Column(Date, nullable=True)
+    # Occurrences posted so far, and the date of the next one
+    occurrences = Column(Integer, nullable=False, default=0, server_default="0")
+    next_run_date = Column(Date, nullable=False)
+    active = Column(Boolean, nullable=False, default=True, server_default="true")
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    category_id = Column(Integer, ForeignKey("categories.id", ondelete="CASCADE"), nullable=False)
+    category = relationship("Category")
+
+    __table_args__ = (
+        Index("ix_recurring_transactions_user_id_id", "user_id", "id"),
+        Index("ix_recurring_transactions_due", "next_run_date", postgresql_where=active.is_(True)),
+    )
@@ -0,0 +1,46 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.schemas.auth import Signup, Login, TokenResponse
+from app.database.database import get_async_db
+from app.services.auth import AsyncAuthService
+from app.utils.responses import ResponseHandler
+from app.core.profiling import ProfiledRoute
+
+router = APIRouter(tags=["Auth"], prefix="/auth", route_class=ProfiledRoute)
+
+@router.post("/signup")
+async def signup(signup_data: Signup, db: AsyncSession = Depends(get_async_db)):
+    try:
+        new_user = await AsyncAuthService.signup(db, signup_data)
+        return ResponseHandler.success_response(
+            data={
+                "first_name": new_user.first_name,
+                "last_name": new_user.last_name,
+                "user_name": new_user.user_name,
+                "email": new_user.email
+            },
+            message="User registered successfully."
+        )
+    except HTTPException as e:
+        if e.status_code == 401:
+            return ResponseHandler.unauthorized_response(message=e.detail)
+        if e.status_code == 503:
+            return ResponseHandler.error_response(message=e.detail, status_code=503)
+        return ResponseHandler.error_response(message="Failed to register user.")
+    
+
+@router.post("/login")
+async def login(login_data: Login, db: AsyncSession = Depends(get_async_db)):
+    try:
+        tokens = await AsyncAuthService.login(db, login_data)
+        token_response = TokenResponse.model_validate(tokens, from_attributes=True)
+        return ResponseHandler.success_response(
+            data=token_response,
+            message="Login successful."
+        )
+    except HTTPException as e:
+        if e.status_code == 401:
+            return ResponseHandler.unauthorized_response(message=e.detail)
+        if e.status_code == 503:
+            return ResponseHandler.error_response(message=e.detail, status_code=503)
+        return ResponseHandler.error_response(message="Login failed.")
\ No newline at end of file
@@ -0,0 +1,100 @@
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.schemas.categories import CategoryCreate, CategoryUpdate, CategoryResponse, CategoriesResponse
+from app.services.categories import AsyncCategoryService
+from app.database.database import get_async_db
+from app.utils.responses import ResponseHandler
+from app.utils.http_cache import make_etag, etag_matches
+from app.core.profiling import ProfiledRoute
+
+router = APIRouter(tags=["Categories"], prefix="/categories", route_class=ProfiledRoute)
+
+@router.get("/", response_model=CategoriesResponse)
+async def get_all_categories(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    page: int = Query(1, ge=1, description="Page Number"),
+    limit: int = Query(10, ge=1, le=100, description="Items per page"),
+    search: str | None = Query("", description="Search based on name of categories")
+    ):
+    try:
+        etag = make_etag("categories", *await AsyncCategoryService.get_version(db), page, limit, search)
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return ResponseHandler.not_modified_response(etag)
+
+        categories = await AsyncCategoryService.get_all_categories(db, page, limit, search)
+        categories_response = [CategoryResponse.model_validate(category, from_attributes=True)
+                               for category in categories]
+        response = CategoriesResponse(total_count=len(categories_response), data=categories_response)
+        return ResponseHandler.success_response(data=response, status_code=200, headers={"ETag": etag})
+    except Exception as e:
+        return ResponseHandler.error_response(message=f"Internal server error: {str(e)}", status_code=500)
+
+
+@router.get("/{category_id}", response_model=CategoryResponse)
+async def get_category_by_id(
+    category_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db)
+    ):
+    try:
+        etag = make_etag("categories", *await AsyncCategoryService.get_version(db), category_id)
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return ResponseHandler.not_modified_response(etag)
+
+        category = await AsyncCategoryService.get_category_by_id(db, category_id)
+        if not category:
+            return ResponseHandler.not_found_response(f"Category with id {category_id} not found")
+        
+        category_response = CategoryResponse.model_validate(category, from_attributes=True)
+        return ResponseHandler.success_response(data=category_response, message="Category found successfully", status_code=200, headers={"ETag": etag})
+    except Exception as e:
+        return ResponseHandler.error_response(message=f"Internal server error: {str(e)}", status_code=500)
+    
+
+@router.post("/", response_model=CategoryResponse)
+async def create_category(
+    category: CategoryCreate,
+    db: AsyncSession = Depends(get_async_db)
+    ):
+    try:
+        created_category = await AsyncCategoryService.create_category(db, category)
+        created_category_response = CategoryResponse.model_validate(created_category, from_attributes=True)
+        return ResponseHandler.success_response(data=created_category_response, message="Category created successfully", status_code=201)
+    except Exception as e:
+        return ResponseHandler.error_response(message=f"Internal server error: {str(e)}", status_code=500)
+
+
+@router.put("/{category_id}", response_model=CategoryResponse)
+async def update_category(
+    category_id: int,
+    category: CategoryUpdate,
+    db: AsyncSession = Depends(get_async_db)
+    ):
+    try:
+        updated_category = await AsyncCategoryService.update_category(db, category_id, category)
+        if not updated_category:
+            ResponseHandler.not_found_response(f"Category with id {category_id} not found")
+
+        update_category_response = CategoryResponse.model_validate(updated_category, from_attributes=True)
+        return ResponseHandler.success_response(data=update_category_response, message="Category updated successfully", status_code=200)
+
+    except Exception as e:
+        return ResponseHandler.error_response(message=f"Internal server error: {str(e)}", status_code=500)
+    
+
+@router.delete("/{category_id}", response_model=CategoryResponse)
+async def delete_category(
+    category_id: int,
+    db: AsyncSession = Depends(get_async_db)
+    ):
+    try:
+        deleted_category = await AsyncCategoryService.delete_category(db, category_id)
+        if not deleted_category:
+            return ResponseHandler.not_found_response(f"Category with id {category_id} not found")
+
+        deleted_category_response = CategoryResponse.model_validate(deleted_category, from_attributes=True)
+        return ResponseHandler.success_response(data=deleted_category_response, message="Category deleted successfully", status_code=200)
+
+    except Exception as e:
+        return ResponseHandler.error_response(message=f"Internal server error: {str(e)}", status_code=500)
\ No newline at end of file
@@ -0,0 +1,127 @@
+from fastapi import APIRouter, Depends, Header, Query, HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.schemas.transactions import TransactionResponse, TransactionsResponse, TransactionCreate, TransactionUpdate, TransactionWriteResponse, TransactionFilters
+from app.services.transactions import AsyncTransactionService, decode_page_cursor
+from app.services.budgets import BudgetService
+from app.services.idempotency import IdempotencyService
+from app.database.database import get_async_db
+from app.utils.responses import ResponseHandler
+from app.utils.http_cache import make_etag, etag_matches
+from app.routers.transactions import transaction_filters, replay_stored_response
+from app.core.security import get_current_principal_async
+from app.schemas.auth import CurrentUser
+from app.core.profiling import ProfiledRoute
+
+router = APIRouter(tags=["Transactions"], prefix="/transactions", route_class=ProfiledRoute)
+
+@router.get("/", response_model=TransactionsResponse)
+async def get_all_transactions(
+    request: Request,
+    user: CurrentUser = Depends(get_current_principal_async),
+    db: AsyncSession = Depends(get_async_db),
+    page: int = Query(1, ge=1, description="Page Number"),
+    limit: int = Query(10, ge=1, le=100, description="Items per page"),
+    cursor: str | None = Query(None, description="next_cursor from a previous page; takes precedence over page"),
+    filters: TransactionFilters = Depends(transaction_filters)
+    ):
+    after = None
+    if cursor:
+        try:
+            after = decode_page_cursor(cursor, filters.sort)
+        except (ValueError, KeyError, TypeError):
+            return ResponseHandler.bad_request_response(message="Invalid cursor")
+
+    try:
+        version = await AsyncTransactionService.get_version(db, user)
+        etag = make_etag("transactions", user.id, version, page, limit, cursor, filters.model_dump_json())
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return ResponseHandler.not_modified_response(etag)
+
+        transactions, next_cursor = await AsyncTransactionService.get_all_transactions(db, page, limit, user, filters, after)
+        transactions_response = [TransactionResponse.model_validate(transaction, from_attributes=True)
+                                 for transaction in transactions]
+        response = TransactionsResponse(total_count=len(transactions_response), data=transactions_response, next_cursor=next_cursor)
+        return ResponseHandler.success_response(data=response, status_code=200, headers={"ETag": etag})
+    except HTTPException as http_exc:
+        raise http_exc
+    except Exception as e:
+        return ResponseHandler.error_response(message=f"Internal server error: {str(e)}", status_code=500)
+
+
+@router.get("/{transaction_id}", response_model=TransactionResponse)
+async def get_transaction_by_id(transaction_id: int, user: CurrentUser = Depends(get_current_principal_async), db: AsyncSession = Depends(get_async_db)):
+    try:
+        transaction = await AsyncTransactionService.get_transaction_by_id(db, transaction_id, user)
+        if not transaction:
+            return ResponseHandler.not_found_response(message=f"Transaction with id {transaction_id} not found")
+        
+        transaction_response = TransactionResponse.model_validate(transaction, from_attributes=True)
+        return ResponseHandler.success_response(data=transaction_response, message="Transaction found successfully")
+    except HTTPException as http_exc:
+        raise http_exc
+    except Exception as e:
+        return ResponseHandler.error_response(message=f"Internal Server Error: {str(e)}", status_code=500)
+    
+
+@router.post("/", response_model=TransactionWriteResponse)
+async def create_transaction(
+    transaction: TransactionCreate,
+    user: CurrentUser = Depends(get_current_principal_async),
+    db: AsyncSession = Depends(get_async_db),
+    idempotency_key: str | None = Header(None, max_length=255, description="Retries with the same key replay the first response")
+    ):
+    try:
+        if idempotency_key:
+            request_hash = IdempotencyService.fingerprint(transaction)
+            stored = await db.run_sync(IdempotencyService.reserve, user, idempotency_key, request_hash)
+            if stored is not None:
+                return replay_stored_response(stored, request_hash)
+
+        # With a key, the transaction is committed by complete() below, together with the key and its response
+        created_transaction = await AsyncTransactionService.create_transaction(db, transaction, user, commit=not idempotency_key)
+        over_budget = await db.run_sync(BudgetService.is_over_budget, user.id, created_transaction.category_id, created_transaction.transaction_date)
+        created_transaction_response = TransactionWriteResponse.model_validate(created_transaction, from_attributes=True)
+        created_transaction_response.over_budget = over_budget
+        response = ResponseHandler.success_response(data=created_transaction_response, message="Transaction created successfully", status_code=201)
+        if idempotency_key:
+            await db.run_sync(IdempotencyService.complete, user, idempotency_key, request_hash, response.status_code, response.body.decode())
+        return response
+    except HTTPException as http_exc:
+        raise http_exc
+    except Exception as e:
+        return ResponseHandler.error_response(message=f"Internal Server Error: {str(e)}", status_code=500)
+    
+
+@router.put("/{transaction_id}", response_model=TransactionWriteResponse)
+async def update_transaction(
+    transaction_id: int, 
+    transaction: TransactionUpdate,
+    user: CurrentUser = Depends(get_current_principal_async),
+    db: AsyncSession = Depends(get_async_db)
+    ):
+    try:
+        updated_transaction = await AsyncTransactionService.update_transaction(db, transaction_id, transaction, user)
+        if not updated_transaction:
+            return ResponseHandler.not_found_response(message=f"Transaction with id {transaction_id} not found")
+        over_budget = await db.run_sync(BudgetService.is_over_budget, user.id, updated_transaction.category_id, updated_transaction.transaction_date)
+        updated_transaction_response = TransactionWriteResponse.model_validate(updated_transaction, from_attributes=True)
+        updated_transaction_response.over_budget = over_budget
+        return ResponseHandler.success_response(data=updated_transaction_response, message="Transaction updated successfully", status_code=200)
+    except HTTPException as http_exc:
+        raise http_exc
+    except Exception as e:
+        return ResponseHandler.error_response(message=f"Internal server error: {str(e)}", status_code=500)
+
+
+@router.delete("/{transaction_id}", response_model=dict)
+async def delete_transaction(transaction_id: int, user: CurrentUser = Depends(get_current_principal_async), db: AsyncSession = Depends(get_async_db)):
+    try:
+        deleted_transaction = await AsyncTransactionService.delete_transaction(db, transaction_id, user)
+        if not deleted_transaction:
+            return ResponseHandler.not_found_response(message=f"Transaction with id {transaction_id} not found")
+        return ResponseHandler.success_response(data=deleted_transaction, message="Transaction deleted successfully", status_code=200)
+
+    except HTTPException as http_exc:
+        raise http_exc
+    except Exception as e:
+        return ResponseHandler.error_response(message=f"Internal server error: {str(e)}", status_code=500)
\ No newline at end of file
@@ -0,0 +1,88 @@
+from fastapi import APIRouter, Depends, Query, HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.schemas.users import UserResponse, UsersResponse, UserCreate, UserUpdate
+from app.services.users import AsyncUserService
+from app.database.database import get_async_db
+from app.utils.responses import ResponseHandler
+from app.utils.http_cache import make_etag, etag_matches
+from app.core.profiling import ProfiledRoute
+
+router = APIRouter(tags=["Users"], prefix="/users", route_class=ProfiledRoute)
+
+@router.get("/", response_model=UsersResponse)
+async def get_all_users(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    page: int = Query(1, ge=1, description="Page Number"),
+    limit: int = Query(10, ge=1, le=100, description="Items per page"),
+    search: str | None = Query("", description="Search based on username")
+    ):
+    try:
+        version = await AsyncUserService.get_page_version(db, page, limit, search)
+        etag = make_etag("users", version, page, limit, search) if version is not None else None
+        if etag is not None and etag_matches(request.headers.get("if-none-match"), etag):
+            return ResponseHandler.not_modified_response(etag)
+
+        users = await AsyncUserService.get_all_users(db, page, limit, search)
+        users_response = [UserResponse.model_validate(user, from_attributes=True)
+                          for user in users]
+        response = UsersResponse(total_count=len(users_response), data=users_response)
+        return ResponseHandler.success_response(data=response, status_code=200, headers={"ETag": etag} if etag else None)
+
+    except Exception as e:
+        return ResponseHandler.error_response(message=f"Internal server error: {str(e)}", status_code=500)
+    
+
+@router.get("/{user_id}", response_model=UserResponse)
+async def get_user_by_id(user_id: int, db: AsyncSession = Depends(get_async_db)):
+    try:
+        user = await AsyncUserService.get_user_by_id(db, user_id)
+        if not user:
+            return ResponseHandler.not_found_response(message=f"User with id {user_id} not found")
+        
+        user_response = UserResponse.model_validate(user, from_attributes=True)
+        return ResponseHandler.success_response(data=user_response, message="User found successfully", status_code=200)
+    
+    except Exception as e:
+        return ResponseHandler.error_response(message=f"Internal server error: {str(e)}", status_code=500)
+    
+
+@router.post("/", response_model=UserResponse)
+async def create_user(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
+    try:
+        created_user = await AsyncUserService.create_user(db, user)
+        created_user_response = UserResponse.model_validate(created_user, from_attributes=True)
+        return ResponseHandler.success_response(data=created_user_response, message="User created successfully", status_code=201)
+    
+    except HTTPException as e:
+        return ResponseHandler.error_response(message=e.detail, status_code=e.status_code)
+    except Exception as e:
+        return ResponseHandler.error_response(message=f"Internal server error: {str(e)}", status_code=500)
+    
+
+@router.put("/{user_id}", response_model=UserResponse)
+async def update_user(user_id: int, user: UserUpdate, db: AsyncSession = Depends(get_async_db)):
+    try:
+        updated_user = await AsyncUserService.update_user(db, user_id, user)
+        if not updated_user:
+            ResponseHandler.not_found_response(f"User with id {user_id} not found")
+
+        updated_user_response = UserResponse.model_validate(updated_user, from_attributes=True)
+        return ResponseHandler.success_response(data=updated_user_response, message="User updated successfully", status_code=200)
+    
+    except Exception as e:
+        return ResponseHandler.error_response(message=f"Internal server error: {str(e)}", status_code=500)
+    
+    
+@router.delete("/{user_id}", response_model=UserResponse)
+async def delete_user(user_id: int, db: AsyncSession = Depends(get_async_db)):
+    try:
+        deleted_user = await AsyncUserService.delete_user(db, user_id)
+        if not deleted_user:
+            return ResponseHandler.not_found_response(f"User with id {user_id} not found")
+        
+        deleted_user_response = UserResponse.model_validate(deleted_user, from_attributes=True)
+        return ResponseHandler.success_response(data=deleted_user_response, message="User deleted successfully", status_code=200)
+    
+    except Exception as e:
+        return ResponseHandler.error_response(message=f"Internal server error: {str(e)}", status_code=500)
\ No newline at end of file
@@ -4,8 +4,9 @@ from app.schemas.auth import Signup, Login, TokenResponse
 from app.database.database import get_db
 from app.services.auth import AuthService
 from app.utils.responses import ResponseHandler
+from app.core.profiling import ProfiledRoute
 
-router = APIRouter(tags=["Auth"], prefix="/auth")
+router = APIRouter(tags=["Auth"], prefix="/auth", route_class=ProfiledRoute)
 
 @router.post("/signup")
 def signup(signup_data: Signup, db: Session = Depends(get_db)):
@@ -23,6 +24,8 @@ def signup(signup_data: Signup, db: Session = Depends(get_db)):
     except HTTPException as e:
         if e.status_code == 401:
             return ResponseHandler.unauthorized_response(message=e.detail)
+        if e.status_code == 503:
+            return ResponseHandler.error_response(message=e.detail, status_code=503)
         return ResponseHandler.error_response(message="Failed to register user.")
     
 
@@ -32,10 +35,12 @@ def login(login_data: Login, db: Session = Depends(get_db)):
         tokens = AuthService.login(db, login_data)
         token_response = TokenResponse.model_validate(tokens, from_attributes=True)
         return ResponseHandler.success_response(
-            data=token_response.model_dump(),
+            data=token_response,
             message="Login successful."
         )
     except HTTPException as e:
         if e.status_code == 401:
             return ResponseHandler.unauthorized_response(message=e.detail)
+        if e.status_code == 503:
+            return ResponseHandler.error_response(message=e.detail, status_code=503)
         return ResponseHandler.error_response(message="Login failed.")
\ No newline at end of file
@@ -0,0 +1,112 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from app.schemas.budgets import BudgetCreate, BudgetUpdate, BudgetResponse, BudgetsResponse, BudgetStatusResponse
+from app.schemas.auth import CurrentUser
+from app.services.budgets import BudgetService
+from app.database.database import get_db
+from app.core.security import get_current_principal
+from app.utils.responses import ResponseHandler
+from app.core.profiling import ProfiledRoute
+
+router = APIRouter(tags=["Budgets"], prefix="/budgets", route_class=ProfiledRoute)
+
+@router.get("/", response_model=BudgetsResponse)
+def get_all_budgets(
+    user: CurrentUser = Depends(get_current_principal),
+    db: Session = Depends(get_db),
+    page: int = Query(1, ge=1, description="Page Number"),
+    limit: int = Query(10, ge=1, le=100, description="Items per page")
+    ):
+    try:
+        budgets = BudgetService.get_all_budgets(db, page, limit, user)
+        budgets_response = [BudgetResponse.model_validate(budget, from_attributes=True)
+                            for budget in budgets]
+        response = BudgetsResponse(total_count=len(budgets_response), data=budgets_response)
+        return ResponseHandler.success_response(data=response, status_code=200)
+    except Exception as e:
+        return ResponseHandler.error_response(message=f"Internal server error: {str(e)}", status_code=500)
+
+
+@router.get("/status", response_model=list[BudgetStatusResponse])
+def get_budget_statuses(user: CurrentUser = Depends(get_current_principal), db: Session = Depends(get_db)):
+    try:
+        budgets = BudgetService.get_user_budgets(db, user)
+        statuses = [BudgetStatusResponse.model_validate(status)
+                    for status in BudgetService.get_budget_statuses(db, budgets)]
+        return ResponseHandler.success_response(data=statuses, status_code=200)
+    except Exception as e:
+        return ResponseHandler.error_response(message=f"Internal server error: {str(e)}", status_code=500)
+
+
+@router.post("/status/rebuild", response_model=dict)
+def rebuild_budget_spend(user: CurrentUser = Depends(get_current_principal), db: Session = Depends(get_db)):
+    try:
+        BudgetService.rebuild_spend(db, user.id)
+        return ResponseHandler.success_response(data={"user_id": user.id}, message="Budget spend rebuilt successfully", status_code=200)
+    except Exception as e:
+        return ResponseHandler.error_response(message=f"Internal server error: {str(e)}", status_code=500)
+
+
+@router.get("/{budget_id}", response_model=BudgetResponse)
+def get_budget_by_id(budget_id: int, user: CurrentUser = Depends(get_current_principal), db: Session = Depends(get_db)):
+    try:
+        budget = BudgetService.get_budget_by_id(db, budget_id, user)
+        if not budget:
+            return ResponseHandler.not_found_response(message=f"Budget with id {budget_id} not found")
+
+        budget_response = BudgetResponse.model_validate(budget, from_attributes=True)
+        return ResponseHandler.success_response(data=budget_response, message="Budget found successfully")
+    except Exception as e:
+        return ResponseHandler.error_response(message=f"Internal server error: {str(e)}", status_code=500)
+
+
+@router.get("/{budget_id}/status", response_model=BudgetStatusResponse)
+def get_budget_status(budget_id: int, user: CurrentUser = Depends(get_current_principal), db: Session = Depends(get_db)):
+    try:
+        budget = BudgetService.get_budget_by_id(db, budget_id, user)
+        if not budget:
+            return ResponseHandler.not_found_response(message=f"Budget with id {budget_id} not found")
+
+        status = BudgetStatusResponse.model_validate(BudgetService.get_budget_statuses(db, [budget])[0])
+        return ResponseHandler.success_response(data=status, status_code=200)
+    except Exception as e:
+        return ResponseHandler.error_response(message=f"Internal server error: {str(e)}", status_code=500)
+
+
+@router.post("/", response_model=BudgetResponse)
+def create_budget(budget: BudgetCreate, user: CurrentUser = Depends(get_current_principal), db: Session = Depends(get_db)):
+    try:
+        created_budget = BudgetService.create_budget(db, budget, user)
+        created_budget_response = BudgetResponse.model_validate(created_budget, from_attributes=True)
+        return ResponseHandler.success_response(data=created_budget_response, message="Budget created successfully", status_code=201)
+    except Exception as e:
+        return ResponseHandler.error_response(message=f"Internal server error: {str(e)}", status_code=500)
+
+
+@router.put("/{budget_id}", response_model=BudgetResponse)
+def update_budget(
+    budget_id: int,
+    budget: BudgetUpdate,
+    user: CurrentUser = Depends(get_current_principal),
+    db: Session = Depends(get_db)
+    ):
+    try:
+        updated_budget = BudgetService.update_budget(db, budget_id, budget, user)
+        if not updated_budget:
+            return ResponseHandler.not_found_response(message=f"Budget with id {budget_id} not found")
+
+        updated_budget_response = BudgetResponse.model_validate(updated_budget, from_attributes=True)
+        return ResponseHandler.success_response(data=updated_budget_response, message="Budget updated successfully", status_code=200)
+    except Exception as e:
+        return ResponseHandler.error_response(message=f"Internal server error: {str(e)}", status_code=500)
+
+
+@router.delete("/{budget_id}", response_model=dict)
+def delete_budget(budget_id: int, user: CurrentUser = Depends(get_current_principal), db: Session = Depends(get_db)):
+    try:
+        deleted_budget = BudgetService.delete_budget(db, budget_id, user)
+        if not deleted_budget:
+            return ResponseHandler.not_found_response(message=f"Budget with id {budget_id} not found")
+        return ResponseHandler.success_response(data=deleted_budget, message="Budget deleted successfully", status_code=200)
+    except Exception as e:
+        return ResponseHandler.error_response(message=f"Internal server error: {str(e)}", status_code=500)
@@ -1,25 +1,46 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request
 from sqlalchemy.orm import Session
-from app.schemas.categories import CategoryCreate, CategoryUpdate, CategoryResponse, CategoriesResponse
+from app.schemas.categories import CategoryCreate, CategoryUpdate, CategoryResponse, CategoriesResponse, CategorySuggestion
 from app.services.categories import CategoryService
 from app.database.database import get_db
 from app.utils.responses import ResponseHandler
+from app.utils.http_cache import make_etag, etag_matches
+from app.core.profiling import ProfiledRoute
 
-router = APIRouter(tags=["Categories"], prefix="/categories")
+router = APIRouter(tags=["Categories"], prefix="/categories", route_class=ProfiledRoute)
 
 @router.get("/", response_model=CategoriesResponse)
 def get_all_categories(
+    request: Request,
     db: Session = Depends(get_db),
     page: int = Query(1, ge=1, description="Page Number"),
     limit: int = Query(10, ge=1, le=100, description="Items per page"),
     search: str | None = Query("", description="Search based on name of categories")
     ):
     try:
+        etag = make_etag("categories", *CategoryService.get_version(db), page, limit, search)
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return ResponseHandler.not_modified_response(etag)
+
         categories = CategoryService.get_all_categories(db, page, limit, search)
-        categories_response = [CategoryResponse.model_validate(category, from_attributes=True).model_dump()
+        categories_response = [CategoryResponse.model_validate(category, from_attributes=True)
                                for category in categories]
         response = CategoriesResponse(total_count=len(categories_response), data=categories_response)
-        return ResponseHandler.success_response(data=response.model_dump(), status_code=200)
+        return ResponseHandler.success_response(data=response, status_code=200, headers={"ETag": etag})
+    except Exception as e:
+        return ResponseHandler.error_response(message=f"Internal server error: {str(e)}", status_code=500)
+
+
+@router.get("/typeahead", response_model=list[CategorySuggestion])
+def get_category_suggestions(
+    db: Session = Depends(get_db),
+    q: str = Query(..., min_length=1, description="Category name prefix"),
+    limit: int = Query(10, ge=1, le=50, description="Maximum suggestions")
+    ):
+    try:
+        suggestions = [CategorySuggestion.model_validate(category, from_attributes=True)
+                       for category in CategoryService.get_category_suggestions(db, q, limit)]
+        return ResponseHandler.success_response(data=suggestions, status_code=200)
     except Exception as e:
         return ResponseHandler.error_response(message=f"Internal server error: {str(e)}", status_code=500)
 
@@ -27,15 +48,20 @@ def get_all_categories(
 @router.get("/{category_id}", response_model=CategoryResponse)
 def get_category_by_id(
     category_id: int,
+    request: Request,
     db: Session = Depends(get_db)
     ):
     try:
+        etag = make_etag("categories", *CategoryService.get_version(db), category_id)
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return ResponseHandler.not_modified_response(etag)
+
         category = CategoryService.get_category_by_id(db, category_id)
         if not category:
             return ResponseHandler.not_found_response(f"Category with id {category_id} not found")
         
         category_response = CategoryResponse.model_validate(category, from_attributes=True)
-        return ResponseHandler.success_response(data=category_response.model_dump(), message="Category found successfully", status_code=200)
+        return ResponseHandler.success_response(data=category_response, message="Category found successfully", status_code=200, headers={"ETag": etag})
     except Exception as e:
         return ResponseHandler.error_response(message=f"Internal server error: {str(e)}", status_code=500)
     
@@ -48,7 +74,7 @@ def create_category(
     try:
         created_category = CategoryService.create_category(db, category)
         created_category_response = CategoryResponse.model_validate(created_category, from_attributes=True)
-        return ResponseHandler.success_response(data=created_category_response.model_dump(), message="Category created successfully", status_code=201)
+        return ResponseHandler.success_response(data=created_category_response, message="Category created successfully", status_code=201)
     except Exception as e:
         return ResponseHandler.error_response(message=f"Internal server error: {str(e)}", status_code=500)
 
@@ -65,7 +91,7 @@ def update_category(
             ResponseHandler.not_found_response(f"Category with id {category_id} not found")
 
         update_category_response = CategoryResponse.model_validate(updated_category, from_attributes=True)
-        return ResponseHandler.success_response(data=update_category_response.model_dump(), message="Category updated successfully", status_code=200)
+        return ResponseHandler.success_response(data=update_category_response, message="Category updated successfully", status_code=200)
 
     except Exception as e:
         return ResponseHandler.error_response(message=f"Internal server error: {str(e)}", status_code=500)
@@ -82,7 +108,7 @@ def delete_category(
             return ResponseHandler.not_found_response(f"Category with id {category_id} not found")
 
         deleted_category_response = CategoryResponse.model_validate(deleted_category, from_attributes=True)
-        return ResponseHandler.success_response(data=deleted_category_response.model_dump(), message="Category deleted successfully", status_code=200)
+        return ResponseHandler.success_response(data=deleted_category_response, message="Category deleted successfully", status_code=200)
 
     except Exception as e:
         return ResponseHandler.error_response(message=f"Internal server error: {str(e)}", status_code=500)
\ No newline at end of file
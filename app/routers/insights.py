@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends, Query, HTTPException
+from sqlalchemy.orm import Session
+from app.schemas.insights import InsightsResponse
+from app.schemas.auth import CurrentUser
+from app.services.insights import InsightService
+from app.database.database import get_db
+from app.core.security import get_current_principal
+from app.utils.responses import ResponseHandler
+from app.core.profiling import ProfiledRoute
+
+router = APIRouter(tags=["Insights"], prefix="/insights", route_class=ProfiledRoute)
+
+@router.get("/", response_model=InsightsResponse)
+def get_insights(
+    user: CurrentUser = Depends(get_current_principal),
+    db: Session = Depends(get_db),
+    refresh: bool = Query(False, description="Recompute now instead of serving the nightly result")
+    ):
+    """Per-category spend trends, end-of-period budget projections and unusually large recent expenses."""
+    try:
+        insights = None if refresh else InsightService.get_stored(db, user.id)
+        if insights is None:
+            if not InsightService.numpy_available():
+                return ResponseHandler.error_response(message="Computing insights requires numpy to be installed", status_code=501)
+            insights = InsightService.refresh(db, user.id)
+            db.commit()
+        return ResponseHandler.success_response(data=insights, status_code=200)
+    except HTTPException as http_exc:
+        raise http_exc
+    except Exception as e:
+        return ResponseHandler.error_response(message=f"Internal server error: {str(e)}", status_code=500)
@@ -0,0 +1,14 @@
+from fastapi import APIRouter, Depends
+from app.core.security import get_admin_principal
+from app.database.database import get_pool_stats
+from app.schemas.auth import CurrentUser
+from app.utils.responses import ResponseHandler
+
+router = APIRouter(tags=["Internal"], prefix="/internal", include_in_schema=False)
+
+@router.get("/db-pool", response_model=dict)
+def get_db_pool_stats(admin: CurrentUser = Depends(get_admin_principal)):
+    try:
+        return ResponseHandler.success_response(data=get_pool_stats(), status_code=200)
+    except Exception as e:
+        return ResponseHandler.error_response(message=f"Internal server error: {str(e)}", status_code=500)
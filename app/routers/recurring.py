@@ -0,0 +1,83 @@
+from fastapi import APIRouter, Depends, Query, HTTPException
+from sqlalchemy.orm import Session
+from app.schemas.recurring import RecurringTransactionCreate, RecurringTransactionUpdate, RecurringTransactionResponse, RecurringTransactionsResponse
+from app.schemas.auth import CurrentUser
+from app.services.recurring import RecurringService
+from app.database.database import get_db
+from app.core.security import get_current_principal
+from app.utils.responses import ResponseHandler
+from app.core.profiling import ProfiledRoute
+
+router = APIRouter(tags=["Recurring Transactions"], prefix="/recurring-transactions", route_class=ProfiledRoute)
+
+@router.get("/", response_model=RecurringTransactionsResponse)
+def get_all_recurring(
+    user: CurrentUser = Depends(get_current_principal),
+    db: Session = Depends(get_db),
+    page: int = Query(1, ge=1, description="Page Number"),
+    limit: int = Query(10, ge=1, le=100, description="Items per page")
+    ):
+    try:
+        rules = RecurringService.get_all_recurring(db, page, limit, user)
+        rules_response = [RecurringTransactionResponse.model_validate(rule, from_attributes=True) for rule in rules]
+        response = RecurringTransactionsResponse(total_count=len(rules_response), data=rules_response)
+        return ResponseHandler.success_response(data=response, status_code=200)
+    except Exception as e:
+        return ResponseHandler.error_response(message=f"Internal server error: {str(e)}", status_code=500)
+
+
+@router.get("/{recurring_id}", response_model=RecurringTransactionResponse)
+def get_recurring_by_id(recurring_id: int, user: CurrentUser = Depends(get_current_principal), db: Session = Depends(get_db)):
+    try:
+        rule = RecurringService.get_recurring_by_id(db, recurring_id, user)
+        if not rule:
+            return ResponseHandler.not_found_response(message=f"Recurring transaction with id {recurring_id} not found")
+
+        rule_response = RecurringTransactionResponse.model_validate(rule, from_attributes=True)
+        return ResponseHandler.success_response(data=rule_response, message="Recurring transaction found successfully")
+    except Exception as e:
+        return ResponseHandler.error_response(message=f"Internal server error: {str(e)}", status_code=500)
+
+
+@router.post("/", response_model=RecurringTransactionResponse)
+def create_recurring(recurring: RecurringTransactionCreate, user: CurrentUser = Depends(get_current_principal), db: Session = Depends(get_db)):
+    """Occurrences from start_date up to today are posted by the next scheduler run."""
+    try:
+        created_rule = RecurringService.create_recurring(db, recurring, user)
+        rule_response = RecurringTransactionResponse.model_validate(created_rule, from_attributes=True)
+        return ResponseHandler.success_response(data=rule_response, message="Recurring transaction created successfully", status_code=201)
+    except HTTPException as http_exc:
+        raise http_exc
+    except Exception as e:
+        return ResponseHandler.error_response(message=f"Internal server error: {str(e)}", status_code=500)
+
+
+@router.put("/{recurring_id}", response_model=RecurringTransactionResponse)
+def update_recurring(
+    recurring_id: int,
+    recurring: RecurringTransactionUpdate,
+    user: CurrentUser = Depends(get_current_principal),
+    db: Session = Depends(get_db)
+    ):
+    try:
+        updated_rule = RecurringService.update_recurring(db, recurring_id, recurring, user)
+        if not updated_rule:
+            return ResponseHandler.not_found_response(message=f"Recurring transaction with id {recurring_id} not found")
+
+        rule_response = RecurringTransactionResponse.model_validate(updated_rule, from_attributes=True)
+        return ResponseHandler.success_response(data=rule_response, message="Recurring transaction updated successfully", status_code=200)
+    except HTTPException as http_exc:
+        raise http_exc
+    except Exception as e:
+        return ResponseHandler.error_response(message=f"Internal server error: {str(e)}", status_code=500)
+
+
+@router.delete("/{recurring_id}", response_model=dict)
+def delete_recurring(recurring_id: int, user: CurrentUser = Depends(get_current_principal), db: Session = Depends(get_db)):
+    try:
+        deleted_rule = RecurringService.delete_recurring(db, recurring_id, user)
+        if not deleted_rule:
+            return ResponseHandler.not_found_response(message=f"Recurring transaction with id {recurring_id} not found")
+        return ResponseHandler.success_response(data=deleted_rule, message="Recurring transaction deleted successfully", status_code=200)
+    except Exception as e:
+        return ResponseHandler.error_response(message=f"Internal server error: {str(e)}", status_code=500)
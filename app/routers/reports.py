@@ -0,0 +1,50 @@
+from datetime import date
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from app.schemas.reports import MonthlyReportItem, MonthlyReportResponse, CategoryReportItem, CategoryReportResponse
+from app.schemas.auth import CurrentUser
+from app.services.reports import ReportService
+from app.database.database import get_db
+from app.core.security import get_current_principal
+from app.utils.responses import ResponseHandler
+from app.core.profiling import ProfiledRoute
+
+router = APIRouter(tags=["Reports"], prefix="/reports", route_class=ProfiledRoute)
+
+@router.get("/monthly", response_model=MonthlyReportResponse)
+def get_monthly_report(
+    user: CurrentUser = Depends(get_current_principal),
+    db: Session = Depends(get_db),
+    date_from: date | None = Query(None, description="Include months from this date's month onwards"),
+    date_to: date | None = Query(None, description="Include months up to and including this date's month")
+    ):
+    try:
+        items = [MonthlyReportItem.model_validate(item) for item in ReportService.get_monthly_report(db, user, date_from, date_to)]
+        response = MonthlyReportResponse(total_count=len(items), data=items)
+        return ResponseHandler.success_response(data=response, status_code=200)
+    except Exception as e:
+        return ResponseHandler.error_response(message=f"Internal server error: {str(e)}", status_code=500)
+
+
+@router.get("/by-category", response_model=CategoryReportResponse)
+def get_category_report(
+    user: CurrentUser = Depends(get_current_principal),
+    db: Session = Depends(get_db),
+    date_from: date | None = Query(None, description="Include months from this date's month onwards"),
+    date_to: date | None = Query(None, description="Include months up to and including this date's month")
+    ):
+    try:
+        items = [CategoryReportItem.model_validate(item) for item in ReportService.get_category_report(db, user, date_from, date_to)]
+        response = CategoryReportResponse(total_count=len(items), data=items)
+        return ResponseHandler.success_response(data=response, status_code=200)
+    except Exception as e:
+        return ResponseHandler.error_response(message=f"Internal server error: {str(e)}", status_code=500)
+
+
+@router.post("/rebuild", response_model=dict)
+def rebuild_reports(user: CurrentUser = Depends(get_current_principal), db: Session = Depends(get_db)):
+    try:
+        ReportService.rebuild_rollups(db, user.id)
+        return ResponseHandler.success_response(data={"user_id": user.id}, message="Reports rebuilt successfully", status_code=200)
+    except Exception as e:
+        return ResponseHandler.error_response(message=f"Internal server error: {str(e)}", status_code=500)
@@ -0,0 +1,36 @@
+from fastapi import APIRouter, Depends, Query, HTTPException
+from sqlalchemy.orm import Session
+from app.schemas.sync import SyncResponse
+from app.services.sync import SyncService, decode_sync_token
+from app.database.database import get_db
+from app.utils.responses import ResponseHandler
+from app.core.security import get_current_principal
+from app.schemas.auth import CurrentUser
+from app.core.profiling import ProfiledRoute
+
+router = APIRouter(tags=["Sync"], prefix="/sync", route_class=ProfiledRoute)
+
+@router.get("/", response_model=SyncResponse)
+def get_changes(
+    user: CurrentUser = Depends(get_current_principal),
+    db: Session = Depends(get_db),
+    since: str | None = Query(None, description="next_token from the previous sync; omit for a full download"),
+    limit: int = Query(500, ge=1, le=1000, description="Maximum changes per response")
+    ):
+    """Transactions, budgets and categories created, updated or deleted after ``since``.
+
+    Keep calling with ``next_token`` while ``has_more`` is true; store the last token for the next poll.
+    """
+    try:
+        change_id = decode_sync_token(since) if since else 0
+    except (ValueError, KeyError, TypeError):
+        return ResponseHandler.bad_request_response(message="Invalid sync token")
+
+    try:
+        changes = SyncService.get_changes(db, user, change_id, limit)
+        sync_response = SyncResponse.model_validate(changes, from_attributes=True)
+        return ResponseHandler.success_response(data=sync_response, status_code=200)
+    except HTTPException as http_exc:
+        raise http_exc
+    except Exception as e:
+        return ResponseHandler.error_response(message=f"Internal server error: {str(e)}", status_code=500)
@@ -1,74 +1,219 @@
-from fastapi import APIRouter, Depends, Query, HTTPException
+from datetime import date
+from typing import List, Literal
+from fastapi import APIRouter, Depends, Header, Query, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
-from app.schemas.transactions import TransactionResponse, TransactionsResponse, TransactionCreate, TransactionUpdate
-from app.services.transactions import TransactionService
+from app.schemas.transactions import TransactionResponse, TransactionsResponse, TransactionCreate, TransactionUpdate, TransactionWriteResponse, BulkTransactionResult, TransactionFilters, TransactionSort, BulkTransactionUpdate, BulkTransactionDelete, BulkWriteResult
+from app.services.transactions import TransactionService, decode_page_cursor
+from app.services.budgets import BudgetService
+from app.services.exports import ExportService, MEDIA_TYPES
+from app.services.idempotency import IdempotencyService, StoredResponse
 from app.database.database import get_db
-from app.utils.responses import ResponseHandler
-from fastapi.security.http import HTTPAuthorizationCredentials
-from fastapi.security import HTTPBearer
+from app.utils.responses import BadRequest, ResponseHandler
+from app.utils.http_cache import make_etag, etag_matches
+from app.utils.ingest import read_records
+from app.core.security import get_current_principal
+from app.schemas.auth import CurrentUser
+from app.core.profiling import ProfiledRoute
+
+router = APIRouter(tags=["Transactions"], prefix="/transactions", route_class=ProfiledRoute)
+
+
+def transaction_filters(
+    date_from: date | None = Query(None, description="Earliest transaction date, inclusive"),
+    date_to: date | None = Query(None, description="Latest transaction date, inclusive"),
+    category_id: List[int] | None = Query(None, description="Repeat to match any of several categories"),
+    is_expense: bool | None = Query(None, description="Only expenses (true) or only income (false)"),
+    min_amount: float | None = Query(None, ge=0, description="Smallest amount, inclusive"),
+    max_amount: float | None = Query(None, ge=0, description="Largest amount, inclusive"),
+    sort: TransactionSort = Query("id", description="Sort key; prefix with - for descending")
+    ) -> TransactionFilters:
+    try:
+        return TransactionFilters(
+            date_from=date_from,
+            date_to=date_to,
+            category_ids=category_id,
+            is_expense=is_expense,
+            min_amount=min_amount,
+            max_amount=max_amount,
+            sort=sort
+        )
+    except ValidationError as e:
+        raise BadRequest("; ".join(error["msg"] for error in e.errors()))
+
+
+def replay_stored_response(stored: StoredResponse, request_hash: str):
+    if stored.request_hash != request_hash:
+        return ResponseHandler.error_response(message="Idempotency-Key was already used for a different request", status_code=422)
+    if stored.status_code is None:
+        return ResponseHandler.error_response(message="A request with this Idempotency-Key is still in progress", status_code=409)
+    return ResponseHandler.replayed_response(stored.body, stored.status_code)
 
-router = APIRouter(tags=["Transactions"], prefix="/transactions")
-auth_scheme = HTTPBearer()
 
 @router.get("/", response_model=TransactionsResponse)
 def get_all_transactions(
-    token: HTTPAuthorizationCredentials = Depends(auth_scheme),
+    request: Request,
+    user: CurrentUser = Depends(get_current_principal),
     db: Session = Depends(get_db),
     page: int = Query(1, ge=1, description="Page Number"),
-    limit: int = Query(10, ge=1, le=100, description="Items per page")
+    limit: int = Query(10, ge=1, le=100, description="Items per page"),
+    cursor: str | None = Query(None, description="next_cursor from a previous page; takes precedence over page"),
+    filters: TransactionFilters = Depends(transaction_filters)
     ):
+    after = None
+    if cursor:
+        try:
+            after = decode_page_cursor(cursor, filters.sort)
+        except (ValueError, KeyError, TypeError):
+            return ResponseHandler.bad_request_response(message="Invalid cursor")
+
     try:
-        transactions = TransactionService.get_all_transactions(db, page, limit, token)
-        transactions_response = [TransactionResponse.model_validate(transaction, from_attributes=True).model_dump()
+        etag = make_etag("transactions", user.id, TransactionService.get_version(db, user), page, limit, cursor, filters.model_dump_json())
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return ResponseHandler.not_modified_response(etag)
+
+        transactions, next_cursor = TransactionService.get_all_transactions(db, page, limit, user, filters, after)
+        transactions_response = [TransactionResponse.model_validate(transaction, from_attributes=True)
                                  for transaction in transactions]
-        response = TransactionsResponse(total_count=len(transactions_response), data=transactions_response)
-        return ResponseHandler.success_response(data=response.model_dump(), status_code=200)
+        response = TransactionsResponse(total_count=len(transactions_response), data=transactions_response, next_cursor=next_cursor)
+        return ResponseHandler.success_response(data=response, status_code=200, headers={"ETag": etag})
+    except HTTPException as http_exc:
+        raise http_exc
+    except Exception as e:
+        return ResponseHandler.error_response(message=f"Internal server error: {str(e)}", status_code=500)
+
+
+@router.post("/bulk", response_model=BulkTransactionResult)
+async def bulk_create_transactions(request: Request, user: CurrentUser = Depends(get_current_principal), db: Session = Depends(get_db)):
+    """Import a JSON array, NDJSON (application/x-ndjson) or CSV (text/csv) body of transactions."""
+    content_type = request.headers.get("content-type", "application/json").split(";")[0].strip().lower()
+    try:
+        records = await read_records(content_type, request.stream())
+    except ValueError as e:
+        return ResponseHandler.bad_request_response(message=str(e))
+
+    try:
+        result = await run_in_threadpool(TransactionService.bulk_create_transactions, db, records, user)
+        bulk_response = BulkTransactionResult.model_validate(result)
+        return ResponseHandler.success_response(
+            data=bulk_response,
+            message=f"Imported {bulk_response.inserted} of {len(records)} transactions",
+            status_code=201 if bulk_response.inserted else 200
+        )
+    except Exception as e:
+        return ResponseHandler.error_response(message=f"Internal server error: {str(e)}", status_code=500)
+
+
+@router.patch("/bulk", response_model=BulkWriteResult)
+def bulk_update_transactions(request: BulkTransactionUpdate, user: CurrentUser = Depends(get_current_principal), db: Session = Depends(get_db)):
+    """Apply the same changes to every transaction selected by ``ids`` or ``filters``, in one statement."""
+    try:
+        affected = TransactionService.bulk_update_transactions(db, request, user)
+        return ResponseHandler.success_response(
+            data=BulkWriteResult(affected=affected),
+            message=f"Updated {affected} transactions",
+            status_code=200
+        )
+    except HTTPException as http_exc:
+        raise http_exc
+    except Exception as e:
+        return ResponseHandler.error_response(message=f"Internal server error: {str(e)}", status_code=500)
+
+
+@router.delete("/bulk", response_model=BulkWriteResult)
+def bulk_delete_transactions(request: BulkTransactionDelete, user: CurrentUser = Depends(get_current_principal), db: Session = Depends(get_db)):
+    """Delete every transaction selected by ``ids`` or ``filters``, in one statement."""
+    try:
+        affected = TransactionService.bulk_delete_transactions(db, request, user)
+        return ResponseHandler.success_response(
+            data=BulkWriteResult(affected=affected),
+            message=f"Deleted {affected} transactions",
+            status_code=200
+        )
     except HTTPException as http_exc:
         raise http_exc
     except Exception as e:
         return ResponseHandler.error_response(message=f"Internal server error: {str(e)}", status_code=500)
 
 
+@router.get("/export")
+def export_transactions(
+    user: CurrentUser = Depends(get_current_principal),
+    format: Literal["csv", "ndjson", "parquet"] = Query("csv", description="Export file format"),
+    filters: TransactionFilters = Depends(transaction_filters)
+    ):
+    """Stream the current user's transactions matching the filters without loading them all into memory."""
+    if format == "parquet" and not ExportService.parquet_available():
+        return ResponseHandler.bad_request_response(message="Parquet export requires pyarrow to be installed")
+
+    return StreamingResponse(
+        ExportService.stream(user, format, filters),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="transactions.{format}"'}
+    )
+
+
 @router.get("/{transaction_id}", response_model=TransactionResponse)
-def get_transaction_by_id(transaction_id: int, token: HTTPAuthorizationCredentials = Depends(auth_scheme), db: Session = Depends(get_db)):
+def get_transaction_by_id(transaction_id: int, user: CurrentUser = Depends(get_current_principal), db: Session = Depends(get_db)):
     try:
-        transaction = TransactionService.get_transaction_by_id(db, transaction_id, token)
+        transaction = TransactionService.get_transaction_by_id(db, transaction_id, user)
         if not transaction:
             return ResponseHandler.not_found_response(message=f"Transaction with id {transaction_id} not found")
         
         transaction_response = TransactionResponse.model_validate(transaction, from_attributes=True)
-        return ResponseHandler.success_response(data=transaction_response.model_dump(), message="Transaction found successfully")
+        return ResponseHandler.success_response(data=transaction_response, message="Transaction found successfully")
     except HTTPException as http_exc:
         raise http_exc
     except Exception as e:
         return ResponseHandler.error_response(message=f"Internal Server Error: {str(e)}", status_code=500)
     
 
-@router.post("/", response_model=TransactionResponse)
-def create_transaction(transaction: TransactionCreate, token: HTTPAuthorizationCredentials = Depends(auth_scheme), db: Session = Depends(get_db)):
+@router.post("/", response_model=TransactionWriteResponse)
+def create_transaction(
+    transaction: TransactionCreate,
+    user: CurrentUser = Depends(get_current_principal),
+    db: Session = Depends(get_db),
+    idempotency_key: str | None = Header(None, max_length=255, description="Retries with the same key replay the first response")
+    ):
     try:
-        created_transaction = TransactionService.create_transaction(db, transaction, token)
-        created_transaction_response = TransactionResponse.model_validate(created_transaction, from_attributes=True)
-        return ResponseHandler.success_response(data=created_transaction_response.model_dump(), message="Transaction created successfully", status_code=201)
+        if idempotency_key:
+            request_hash = IdempotencyService.fingerprint(transaction)
+            stored = IdempotencyService.reserve(db, user, idempotency_key, request_hash)
+            if stored is not None:
+                return replay_stored_response(stored, request_hash)
+
+        # With a key, the transaction is committed by complete() below, together with the key and its response
+        created_transaction = TransactionService.create_transaction(db, transaction, user, commit=not idempotency_key)
+        over_budget = BudgetService.is_over_budget(db, user.id, created_transaction.category_id, created_transaction.transaction_date)
+        created_transaction_response = TransactionWriteResponse.model_validate(created_transaction, from_attributes=True)
+        created_transaction_response.over_budget = over_budget
+        response = ResponseHandler.success_response(data=created_transaction_response, message="Transaction created successfully", status_code=201)
+        if idempotency_key:
+            IdempotencyService.complete(db, user, idempotency_key, request_hash, response.status_code, response.body.decode())
+        return response
     except HTTPException as http_exc:
         raise http_exc
     except Exception as e:
         return ResponseHandler.error_response(message=f"Internal Server Error: {str(e)}", status_code=500)
     
 
-@router.put("/{transaction_id}", response_model=TransactionResponse)
+@router.put("/{transaction_id}", response_model=TransactionWriteResponse)
 def update_transaction(
     transaction_id: int, 
     transaction: TransactionUpdate,
-    token: HTTPAuthorizationCredentials = Depends(auth_scheme),
+    user: CurrentUser = Depends(get_current_principal),
     db: Session = Depends(get_db)
     ):
     try:
-        updated_transaction = TransactionService.update_transaction(db, transaction_id, transaction, token)
+        updated_transaction = TransactionService.update_transaction(db, transaction_id, transaction, user)
         if not updated_transaction:
             return ResponseHandler.not_found_response(message=f"Transaction with id {transaction_id} not found")
-        updated_transaction_response = TransactionResponse.model_validate(updated_transaction, from_attributes=True)
-        return ResponseHandler.success_response(data=updated_transaction_response.model_dump(), message="Transaction updated successfully", status_code=200)
+        over_budget = BudgetService.is_over_budget(db, user.id, updated_transaction.category_id, updated_transaction.transaction_date)
+        updated_transaction_response = TransactionWriteResponse.model_validate(updated_transaction, from_attributes=True)
+        updated_transaction_response.over_budget = over_budget
+        return ResponseHandler.success_response(data=updated_transaction_response, message="Transaction updated successfully", status_code=200)
     except HTTPException as http_exc:
         raise http_exc
     except Exception as e:
@@ -76,9 +221,9 @@ def update_transaction(
 
 
 @router.delete("/{transaction_id}", response_model=dict)
-def delete_transaction(transaction_id: int, token: HTTPAuthorizationCredentials = Depends(auth_scheme), db: Session = Depends(get_db)):
+def delete_transaction(transaction_id: int, user: CurrentUser = Depends(get_current_principal), db: Session = Depends(get_db)):
     try:
-        deleted_transaction = TransactionService.delete_transaction(db, transaction_id, token)
+        deleted_transaction = TransactionService.delete_transaction(db, transaction_id, user)
         if not deleted_transaction:
             return ResponseHandler.not_found_response(message=f"Transaction with id {transaction_id} not found")
         return ResponseHandler.success_response(data=deleted_transaction, message="Transaction deleted successfully", status_code=200)
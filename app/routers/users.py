@@ -1,30 +1,52 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, HTTPException, Request
 from sqlalchemy.orm import Session
-from app.schemas.users import UserResponse, UsersResponse, UserCreate, UserUpdate
+from app.schemas.users import UserResponse, UsersResponse, UserCreate, UserUpdate, UserSuggestion
 from app.services.users import UserService
 from app.database.database import get_db
 from app.utils.responses import ResponseHandler
+from app.utils.http_cache import make_etag, etag_matches
+from app.core.profiling import ProfiledRoute
 
-router = APIRouter(tags=["Users"], prefix="/users")
+router = APIRouter(tags=["Users"], prefix="/users", route_class=ProfiledRoute)
 
 @router.get("/", response_model=UsersResponse)
 def get_all_users(
+    request: Request,
     db: Session = Depends(get_db),
     page: int = Query(1, ge=1, description="Page Number"),
     limit: int = Query(10, ge=1, le=100, description="Items per page"),
     search: str | None = Query("", description="Search based on username")
     ):
     try:
+        version = UserService.get_page_version(db, page, limit, search)
+        etag = make_etag("users", version, page, limit, search) if version is not None else None
+        if etag is not None and etag_matches(request.headers.get("if-none-match"), etag):
+            return ResponseHandler.not_modified_response(etag)
+
         users = UserService.get_all_users(db, page, limit, search)
-        users_response = [UserResponse.model_validate(user, from_attributes=True).model_dump()
+        users_response = [UserResponse.model_validate(user, from_attributes=True)
                           for user in users]
         response = UsersResponse(total_count=len(users_response), data=users_response)
-        return ResponseHandler.success_response(data=response.model_dump(), status_code=200)
+        return ResponseHandler.success_response(data=response, status_code=200, headers={"ETag": etag} if etag else None)
 
     except Exception as e:
         return ResponseHandler.error_response(message=f"Internal server error: {str(e)}", status_code=500)
     
 
+@router.get("/typeahead", response_model=list[UserSuggestion])
+def get_user_suggestions(
+    db: Session = Depends(get_db),
+    q: str = Query(..., min_length=1, description="Username prefix"),
+    limit: int = Query(10, ge=1, le=50, description="Maximum suggestions")
+    ):
+    try:
+        suggestions = [UserSuggestion.model_validate(user, from_attributes=True)
+                       for user in UserService.get_user_suggestions(db, q, limit)]
+        return ResponseHandler.success_response(data=suggestions, status_code=200)
+    except Exception as e:
+        return ResponseHandler.error_response(message=f"Internal server error: {str(e)}", status_code=500)
+
+
 @router.get("/{user_id}", response_model=UserResponse)
 def get_user_by_id(user_id: int, db: Session = Depends(get_db)):
     try:
@@ -33,7 +55,7 @@ def get_user_by_id(user_id: int, db: Session = Depends(get_db)):
             return ResponseHandler.not_found_response(message=f"User with id {user_id} not found")
         
         user_response = UserResponse.model_validate(user, from_attributes=True)
-        return ResponseHandler.success_response(data=user_response.model_dump(), message="User found successfully", status_code=200)
+        return ResponseHandler.success_response(data=user_response, message="User found successfully", status_code=200)
     
     except Exception as e:
         return ResponseHandler.error_response(message=f"Internal server error: {str(e)}", status_code=500)
@@ -44,8 +66,10 @@ def create_user(user: UserCreate, db: Session = Depends(get_db)):
     try:
         created_user = UserService.create_user(db, user)
         created_user_response = UserResponse.model_validate(created_user, from_attributes=True)
-        return ResponseHandler.success_response(data=created_user_response.model_dump(), message="User created successfully", status_code=201)
+        return ResponseHandler.success_response(data=created_user_response, message="User created successfully", status_code=201)
     
+    except HTTPException as e:
+        return ResponseHandler.error_response(message=e.detail, status_code=e.status_code)
     except Exception as e:
         return ResponseHandler.error_response(message=f"Internal server error: {str(e)}", status_code=500)
     
@@ -58,7 +82,7 @@ def update_user(user_id: int, user: UserUpdate, db: Session = Depends(get_db)):
             ResponseHandler.not_found_response(f"User with id {user_id} not found")
 
         updated_user_response = UserResponse.model_validate(updated_user, from_attributes=True)
-        return ResponseHandler.success_response(data=updated_user_response.model_dump(), message="User updated successfully", status_code=200)
+        return ResponseHandler.success_response(data=updated_user_response, message="User updated successfully", status_code=200)
     
     except Exception as e:
         return ResponseHandler.error_response(message=f"Internal server error: {str(e)}", status_code=500)
@@ -72,7 +96,7 @@ def delete_user(user_id: int, db: Session = Depends(get_db)):
             return ResponseHandler.not_found_response(f"User with id {user_id} not found")
         
         deleted_user_response = UserResponse.model_validate(deleted_user, from_attributes=True)
-        return ResponseHandler.success_response(data=deleted_user_response.model_dump(), message="User deleted successfully", status_code=200)
+        return ResponseHandler.success_response(data=deleted_user_response, message="User deleted successfully", status_code=200)
     
     except Exception as e:
         return ResponseHandler.error_response(message=f"Internal server error: {str(e)}", status_code=500)
\ No newline at end of file
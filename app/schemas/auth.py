@@ -34,3 +34,8 @@ class TokenResponse(BaseModel):
     token_type: str = 'Bearer'
     expires_in: int
 
+
+class CurrentUser(BaseModel):
+    id: int
+    user_name: str | None = None
+    token_version: int = 0
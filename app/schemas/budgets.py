@@ -1,5 +1,6 @@
 from pydantic import BaseModel, field_validator
 from typing import Optional, List, Literal
+from datetime import date
 from app.schemas.categories import CategoryBase
 
 class BudgetBase(BaseModel):
@@ -11,7 +12,6 @@ class BudgetBase(BaseModel):
 
     limit: float
     period: Literal["daily", "weekly", "monthly"]
-    user_id: int
     category_id: int
 
 class BudgetCreate(BudgetBase):
@@ -24,6 +24,7 @@ class BudgetUpdate(BaseModel):
 
 class BudgetResponse(BudgetBase):
     id: int
+    user_id: int
     category: CategoryBase
     
     class Config:
@@ -34,4 +35,15 @@ class BudgetsResponse(BaseModel):
     data: List[BudgetResponse]
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class BudgetStatusResponse(BaseModel):
+    budget_id: int
+    category_id: int
+    period: Literal["daily", "weekly", "monthly"]
+    period_start: date
+    limit: float
+    spent: float
+    remaining: float
+    over_budget: bool
@@ -23,4 +23,11 @@ class CategoriesResponse(BaseModel):
     data: List[CategoryResponse]
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class CategorySuggestion(BaseModel):
+    id: int
+    name: str
+
+    class Config:
+        from_attributes = True
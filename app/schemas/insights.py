@@ -0,0 +1,34 @@
+from pydantic import BaseModel
+from typing import List, Literal
+from datetime import date, datetime
+
+class CategoryTrend(BaseModel):
+    category_id: int
+    # Average daily spend over the trailing windows
+    rolling_7d: float
+    rolling_30d: float
+
+class BudgetProjection(BaseModel):
+    budget_id: int
+    category_id: int
+    period: Literal["daily", "weekly", "monthly"]
+    period_start: date
+    period_end: date
+    limit: float
+    spent: float
+    projected: float
+    projected_over: bool
+
+class SpendingAnomaly(BaseModel):
+    transaction_id: int
+    category_id: int
+    transaction_date: date
+    amount: float
+    z_score: float
+
+class InsightsResponse(BaseModel):
+    as_of: date
+    generated_at: datetime
+    trends: List[CategoryTrend]
+    projections: List[BudgetProjection]
+    anomalies: List[SpendingAnomaly]
@@ -0,0 +1,44 @@
+from pydantic import BaseModel, Field, model_validator
+from typing import List, Literal
+from datetime import date
+from app.schemas.categories import CategoryBase
+
+class RecurringTransactionBase(BaseModel):
+    amount: float = Field(..., gt=0, description="Transaction amount must be positive.")
+    is_expense: bool
+    category_id: int
+    end_date: date | None = None
+
+class RecurringTransactionCreate(RecurringTransactionBase):
+    frequency: Literal["daily", "weekly", "monthly", "yearly"]
+    interval: int = Field(1, ge=1, le=366, description="Repeat every this many days, weeks, months or years")
+    start_date: date
+
+    @model_validator(mode="after")
+    def check_dates(self):
+        if self.end_date is not None and self.end_date < self.start_date:
+            raise ValueError("end_date must not be before start_date")
+        return self
+
+class RecurringTransactionUpdate(RecurringTransactionBase):
+    active: bool = True
+
+class RecurringTransactionResponse(RecurringTransactionBase):
+    id: int
+    frequency: Literal["daily", "weekly", "monthly", "yearly"]
+    interval: int
+    start_date: date
+    occurrences: int
+    next_run_date: date
+    active: bool
+    category: CategoryBase
+
+    class Config:
+        from_attributes = True
+
+class RecurringTransactionsResponse(BaseModel):
+    total_count: int = Field(..., ge=0, description="Total count must be non-negative.")
+    data: List[RecurringTransactionResponse]
+
+    class Config:
+        from_attributes = True
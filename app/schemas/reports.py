@@ -0,0 +1,25 @@
+from pydantic import BaseModel, Field
+from typing import List
+
+class MonthlyReportItem(BaseModel):
+    month: str
+    income: float
+    expense: float
+    net: float
+    transaction_count: int
+
+class MonthlyReportResponse(BaseModel):
+    total_count: int = Field(..., ge=0, description="Total count must be non-negative.")
+    data: List[MonthlyReportItem]
+
+class CategoryReportItem(BaseModel):
+    category_id: int
+    category_name: str
+    income: float
+    expense: float
+    net: float
+    transaction_count: int
+
+class CategoryReportResponse(BaseModel):
+    total_count: int = Field(..., ge=0, description="Total count must be non-negative.")
+    data: List[CategoryReportItem]
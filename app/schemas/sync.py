@@ -0,0 +1,40 @@
+from pydantic import BaseModel
+from typing import List, Literal
+from datetime import datetime
+from app.schemas.transactions import TransactionBase
+from app.schemas.budgets import BudgetBase
+from app.schemas.categories import CategoryBase
+
+class SyncTransaction(TransactionBase):
+    id: int
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class SyncBudget(BudgetBase):
+    id: int
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class SyncCategory(CategoryBase):
+    id: int
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class SyncDeletion(BaseModel):
+    entity: Literal["transactions", "budgets", "categories"]
+    id: int
+    deleted_at: datetime
+
+class SyncResponse(BaseModel):
+    transactions: List[SyncTransaction]
+    budgets: List[SyncBudget]
+    categories: List[SyncCategory]
+    deleted: List[SyncDeletion]
+    next_token: str
+    has_more: bool
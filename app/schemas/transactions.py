@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field
-from typing import List
+from pydantic import BaseModel, Field, model_validator
+from typing import List, Literal
 from datetime import date
 from app.schemas.categories import CategoryBase
 
@@ -18,19 +18,86 @@ class TransactionUpdate(TransactionBase):
 class TransactionResponse(TransactionBase):
     id: int
     category: CategoryBase
-    transaction_date: str
 
     class Config:
         from_attributes = True
 
-    @classmethod
-    def model_validate(cls, obj, *, from_attributes=False):
-        obj.transaction_date = obj.transaction_date.isoformat()
-        return super().model_validate(obj, from_attributes=from_attributes)
+class TransactionWriteResponse(TransactionResponse):
+    over_budget: bool = False
 
 class TransactionsResponse(BaseModel):
     total_count: int = Field(..., ge=0, description="Total count must be non-negative.")
     data: List[TransactionResponse]
+    next_cursor: str | None = None
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class BulkRowError(BaseModel):
+    row: int
+    errors: List[str]
+
+class BulkTransactionResult(BaseModel):
+    inserted: int = Field(..., ge=0)
+    failed: int = Field(..., ge=0)
+    errors: List[BulkRowError]
+
+
+TransactionSort = Literal["id", "-id", "transaction_date", "-transaction_date", "amount", "-amount"]
+
+class TransactionFilters(BaseModel):
+    date_from: date | None = None
+    date_to: date | None = None
+    category_ids: List[int] | None = None
+    is_expense: bool | None = None
+    min_amount: float | None = Field(None, ge=0)
+    max_amount: float | None = Field(None, ge=0)
+    sort: TransactionSort = "id"
+
+    @model_validator(mode="after")
+    def check_ranges(self):
+        if self.date_from and self.date_to and self.date_from > self.date_to:
+            raise ValueError("date_from must not be after date_to")
+        if self.min_amount is not None and self.max_amount is not None and self.min_amount > self.max_amount:
+            raise ValueError("min_amount must not be greater than max_amount")
+        return self
+
+
+class TransactionPatch(BaseModel):
+    amount: float | None = Field(None, gt=0, description="Transaction amount must be positive.")
+    is_expense: bool | None = None
+    transaction_date: date | None = None
+    category_id: int | None = None
+
+    @model_validator(mode="after")
+    def check_not_empty(self):
+        if not self.model_fields_set:
+            raise ValueError("changes must set at least one field")
+        for field in self.model_fields_set:
+            if getattr(self, field) is None:
+                raise ValueError(f"{field} cannot be null")
+        return self
+
+FILTER_PREDICATES = ("date_from", "date_to", "category_ids", "is_expense", "min_amount", "max_amount")
+
+class BulkTransactionDelete(BaseModel):
+    """Select transactions by id, by filter, or every one with an explicit ``all``; exactly one of the three."""
+    ids: List[int] | None = Field(None, min_length=1, max_length=10000)
+    filters: TransactionFilters | None = None
+    all: bool = False
+
+    @model_validator(mode="after")
+    def check_selection(self):
+        if sum((self.ids is not None, self.filters is not None, self.all)) != 1:
+            raise ValueError("Provide exactly one of ids, filters or all")
+        # sort does not narrow the selection, so filters of only a sort would match every transaction
+        if self.filters is not None and all(getattr(self.filters, field) in (None, []) for field in FILTER_PREDICATES):
+            raise ValueError("filters must set at least one of " + ", ".join(FILTER_PREDICATES) + "; send all: true to select every transaction")
+        return self
+
+class BulkTransactionUpdate(BulkTransactionDelete):
+    changes: TransactionPatch
+
+class BulkWriteResult(BaseModel):
+    affected: int = Field(..., ge=0)
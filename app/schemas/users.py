@@ -23,6 +23,8 @@ class PasswordUpdate(BaseModel):
 
 class UserResponse(UserBase):
     id: int
+    # Expenses can take the running balance below zero
+    current_balance: float
     
     class Config:
         from_attributes = True
@@ -32,4 +34,11 @@ class UsersResponse(BaseModel):
     data: List[UserResponse]
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class UserSuggestion(BaseModel):
+    id: int
+    user_name: str
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,41 @@
+"""Anomaly detection for InsightService, on arrays only: importing it never connects to the database."""
+from datetime import date
+from app.core.config import settings
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+EXPENSE_FIELDS = [("id", "i8"), ("day", "i4"), ("category_id", "i8"), ("amount", "f8")]
+
+
+def find_anomalies(expenses, categories, category_index, today: date) -> list:
+    """Recent expenses whose amount is ``insights_anomaly_z`` standard deviations above their category's mean."""
+    if not len(expenses):
+        return []
+
+    amounts = expenses["amount"]
+    counts = np.bincount(category_index, minlength=len(categories))
+    means = np.bincount(category_index, weights=amounts, minlength=len(categories)) / counts
+    variances = np.bincount(category_index, weights=amounts ** 2, minlength=len(categories)) / counts - means ** 2
+    stds = np.sqrt(np.maximum(variances, 0.0))
+
+    row_stds = stds[category_index]
+    z_scores = np.divide(amounts - means[category_index], row_stds, out=np.zeros_like(amounts), where=row_stds > 0)
+    flagged = (
+        (counts[category_index] >= settings.insights_min_samples)
+        & (z_scores >= settings.insights_anomaly_z)
+        & (expenses["day"] > today.toordinal() - settings.insights_recent_days)
+    )
+
+    return [
+        {
+            "transaction_id": int(row["id"]),
+            "category_id": int(row["category_id"]),
+            "transaction_date": date.fromordinal(int(row["day"])),
+            "amount": float(row["amount"]),
+            "z_score": float(z_score),
+        }
+        for row, z_score in sorted(zip(expenses[flagged], z_scores[flagged]), key=lambda pair: -pair[1])
+    ]
@@ -1,6 +1,8 @@
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.schemas.auth import Signup, Login
-from app.core.security import get_password_hash, verify_password, get_user_token
+from app.core.security import get_password_hash, get_password_hash_async, verify_and_update_password, verify_and_update_password_async, get_user_token
 from app.models.models import User
 from fastapi import HTTPException, status
 
@@ -30,10 +32,55 @@ class AuthService:
     @staticmethod
     def login(db: Session, login_data: Login):
         user = db.query(User).filter(User.user_name == login_data.user_name).first()
-        if not user or not verify_password(login_data.password, user.hashed_password):
+        verified, new_hash = verify_and_update_password(login_data.password, user.hashed_password) if user else (False, None)
+        if not verified:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid username or password."
             )
-        
-        return get_user_token(user_id=user.id)
+        if new_hash:
+            user.hashed_password = new_hash
+            db.commit()
+
+        return get_user_token(user_id=user.id, user_name=user.user_name, token_version=user.token_version)
+
+
+class AsyncAuthService:
+    @staticmethod
+    async def signup(db: AsyncSession, signup_data: Signup):
+        existing = await db.execute(select(User.id).filter(User.user_name == signup_data.user_name))
+        if existing.first():
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Username already exists."
+            )
+        hashed_password = await get_password_hash_async(signup_data.password)
+
+        new_user = User(
+            first_name = signup_data.first_name,
+            last_name = signup_data.last_name,
+            user_name = signup_data.user_name,
+            email = signup_data.email,
+            hashed_password = hashed_password
+        )
+        db.add(new_user)
+        await db.commit()
+        await db.refresh(new_user)
+        return new_user
+
+
+    @staticmethod
+    async def login(db: AsyncSession, login_data: Login):
+        result = await db.execute(select(User).filter(User.user_name == login_data.user_name))
+        user = result.scalars().first()
+        verified, new_hash = await verify_and_update_password_async(login_data.password, user.hashed_password) if user else (False, None)
+        if not verified:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid username or password."
+            )
+        if new_hash:
+            user.hashed_password = new_hash
+            await db.commit()
+
+        return get_user_token(user_id=user.id, user_name=user.user_name, token_version=user.token_version)
@@ -0,0 +1,65 @@
+from collections import defaultdict
+from typing import Iterable
+from sqlalchemy import case, func, update
+from sqlalchemy.orm import Session
+from app.models.models import Transaction, User
+from app.services.ledger import TransactionChange
+
+
+def signed_amount(is_expense: bool, amount: float) -> float:
+    return -amount if is_expense else amount
+
+
+class BalanceService:
+    @staticmethod
+    def apply_changes(db: Session, changes: Iterable[TransactionChange]):
+        """Shift each affected user's current_balance in place; the caller commits.
+
+        ``current_balance = current_balance + :delta`` is evaluated by Postgres under the row lock,
+        so parallel writers for one user serialize instead of overwriting each other.
+        """
+        deltas = defaultdict(float)
+        for change in changes:
+            deltas[change.user_id] += change.sign * signed_amount(change.is_expense, change.amount)
+
+        for user_id, delta in sorted(deltas.items()):
+            if delta:
+                db.execute(update(User).where(User.id == user_id).values(current_balance=User.current_balance + delta))
+
+
+    @staticmethod
+    def reconcile(db: Session, batch_size: int = 500, fix: bool = False) -> dict:
+        """Compare every stored balance with opening_balance plus the transaction ledger, in user id batches.
+
+        Each batch locks its users rows first, so in-flight writes either finish before the ledger is
+        summed or wait until the batch commits.
+        """
+        checked = 0
+        drifted = []
+        last_id = 0
+        while True:
+            users = db.query(User.id, User.opening_balance, User.current_balance).filter(
+                User.id > last_id
+            ).order_by(User.id.asc()).limit(batch_size).with_for_update().all()
+            if not users:
+                break
+            last_id = users[-1].id
+
+            ledger = dict(db.query(
+                Transaction.user_id,
+                func.sum(case((Transaction.is_expense, -Transaction.amount), else_=Transaction.amount))
+            ).filter(Transaction.user_id.in_([user.id for user in users])).group_by(Transaction.user_id).all())
+
+            for user in users:
+                expected = user.opening_balance + (ledger.get(user.id) or 0.0)
+                drift = expected - user.current_balance
+                if abs(drift) > 1e-6:
+                    drifted.append({"user_id": user.id, "stored": user.current_balance, "expected": expected, "drift": drift})
+                    if fix:
+                        db.execute(update(User).where(User.id == user.id).values(current_balance=expected))
+
+            checked += len(users)
+            # Release the batch's row locks before moving on
+            db.commit()
+
+        return {"checked": checked, "drifted": len(drifted), "fixed": fix, "users": drifted}
@@ -0,0 +1,195 @@
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Iterable
+from sqlalchemy import Date, cast, delete, func, select, text, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from app.models.models import Budget, BudgetSpend, Transaction
+from app.schemas.auth import CurrentUser
+from app.schemas.budgets import BudgetCreate, BudgetUpdate
+from app.services.ledger import TransactionChange, lock_ledgers
+
+PERIODS = ("daily", "weekly", "monthly")
+
+
+def period_start(period: str, day: date) -> date:
+    if period == "daily":
+        return day
+    if period == "weekly":
+        return day - timedelta(days=day.weekday())
+    return day.replace(day=1)
+
+
+class BudgetService:
+    @staticmethod
+    def get_all_budgets(db: Session, page: int, limit: int, user: CurrentUser):
+        return db.query(Budget).options(joinedload(Budget.category, innerjoin=True)).filter(Budget.user_id == user.id).order_by(Budget.id.asc()).limit(limit).offset((page-1)*limit).all()
+
+
+    @staticmethod
+    def get_user_budgets(db: Session, user: CurrentUser):
+        """Every budget of ``user``, unpaginated, for views that cover them all."""
+        return db.query(Budget).options(joinedload(Budget.category, innerjoin=True)).filter(Budget.user_id == user.id).order_by(Budget.id.asc()).all()
+
+
+    @staticmethod
+    def get_budget_by_id(db: Session, budget_id: int, user: CurrentUser):
+        db_budget = db.query(Budget).options(joinedload(Budget.category, innerjoin=True)).filter(Budget.id == budget_id, Budget.user_id == user.id).first()
+        if not db_budget:
+            return None
+        return db_budget
+
+
+    @staticmethod
+    def create_budget(db: Session, budget: BudgetCreate, user: CurrentUser):
+        db_budget = Budget(
+            limit = budget.limit,
+            period = budget.period,
+            category_id = budget.category_id,
+            user_id = user.id
+        )
+        try:
+            db.add(db_budget)
+            db.commit()
+            db.refresh(db_budget)
+            return db_budget
+        except IntegrityError:
+            db.rollback()
+            raise ValueError("Error creating budget")
+
+
+    @staticmethod
+    def update_budget(db: Session, budget_id: int, budget: BudgetUpdate, user: CurrentUser):
+        try:
+            db_budget = db.query(Budget).filter(Budget.id == budget_id, Budget.user_id == user.id).first()
+            if not db_budget:
+                return None
+            for key, value in budget.model_dump().items():
+                setattr(db_budget, key, value)
+            db.commit()
+            db.refresh(db_budget)
+            return db_budget
+        except SQLAlchemyError as e:
+            db.rollback()
+            raise ValueError(f"Error updating budget: {str(e)}")
+
+
+    @staticmethod
+    def delete_budget(db: Session, budget_id: int, user: CurrentUser):
+        db_budget = db.query(Budget).filter(Budget.id == budget_id, Budget.user_id == user.id).first()
+        if not db_budget:
+            return None
+        db.delete(db_budget)
+        db.commit()
+        return {"budget_id": budget_id}
+
+
+    @staticmethod
+    def get_budget_statuses(db: Session, budgets: list, on: date = None):
+        """Compute spend against each budget's current period bucket with a single primary key lookup."""
+        on = on or date.today()
+        if not budgets:
+            return []
+
+        keys = [(budget.category_id, budget.period, period_start(budget.period, on)) for budget in budgets]
+        user_id = budgets[0].user_id
+        spent_by_key = {
+            (row.category_id, row.period, row.period_start): row.spent
+            for row in db.query(BudgetSpend).filter(
+                BudgetSpend.user_id == user_id,
+                tuple_(BudgetSpend.category_id, BudgetSpend.period, BudgetSpend.period_start).in_(keys)
+            )
+        }
+
+        statuses = []
+        for budget, key in zip(budgets, keys):
+            spent = spent_by_key.get(key, 0.0)
+            statuses.append({
+                "budget_id": budget.id,
+                "category_id": budget.category_id,
+                "period": budget.period,
+                "period_start": key[2],
+                "limit": budget.limit,
+                "spent": spent,
+                "remaining": budget.limit - spent,
+                "over_budget": spent > budget.limit,
+            })
+        return statuses
+
+
+    @staticmethod
+    def is_over_budget(db: Session, user_id: int, category_id: int, on: date) -> bool:
+        budgets = db.query(Budget).filter(Budget.user_id == user_id, Budget.category_id == category_id).all()
+        return any(status["over_budget"] for status in BudgetService.get_budget_statuses(db, budgets, on))
+
+
+    @staticmethod
+    def apply_changes(db: Session, changes: Iterable[TransactionChange]):
+        """Fold transaction changes into the budget_spend buckets in one upsert; the caller commits."""
+        deltas = defaultdict(float)
+        for change in changes:
+            if not change.is_expense or change.transaction_date is None:
+                continue
+            for period in PERIODS:
+                key = (change.user_id, change.category_id, period, period_start(period, change.transaction_date))
+                deltas[key] += change.sign * change.amount
+
+        if not deltas:
+            return
+
+        # Sorted keys keep lock order stable across concurrent writers
+        rows = [
+            {"user_id": user_id, "category_id": category_id, "period": period, "period_start": start, "spent": spent}
+            for (user_id, category_id, period, start), spent in sorted(deltas.items())
+        ]
+        stmt = insert(BudgetSpend).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[BudgetSpend.user_id, BudgetSpend.category_id, BudgetSpend.period, BudgetSpend.period_start],
+            set_={"spent": BudgetSpend.spent + stmt.excluded.spent}
+        )
+        db.execute(stmt)
+
+
+    @staticmethod
+    def rebuild_spend(db: Session, user_id: int = None):
+        """Recompute budget_spend from the transactions table, for one user or everyone."""
+        try:
+            # Hold off concurrent transaction writes so none lands between the DELETE and the
+            # INSERT ... SELECT: the user's ledger lock, or for everyone a table lock that blocks
+            # their upserts until commit (they already hold their ledger lock, so no cycle forms)
+            if user_id is not None:
+                lock_ledgers(db, [user_id])
+            else:
+                db.execute(text("LOCK TABLE budget_spend IN EXCLUSIVE MODE"))
+            clear = delete(BudgetSpend)
+            if user_id is not None:
+                clear = clear.where(BudgetSpend.user_id == user_id)
+            db.execute(clear)
+
+            for period in PERIODS:
+                if period == "daily":
+                    bucket = Transaction.transaction_date
+                else:
+                    bucket = cast(func.date_trunc("week" if period == "weekly" else "month", Transaction.transaction_date), Date)
+
+                source = select(
+                    Transaction.user_id,
+                    Transaction.category_id,
+                    cast(period, BudgetSpend.period.type),
+                    bucket,
+                    func.sum(Transaction.amount)
+                ).where(
+                    Transaction.is_expense.is_(True),
+                    Transaction.transaction_date.isnot(None)
+                ).group_by(Transaction.user_id, Transaction.category_id, bucket)
+                if user_id is not None:
+                    source = source.where(Transaction.user_id == user_id)
+
+                db.execute(insert(BudgetSpend).from_select(
+                    ["user_id", "category_id", "period", "period_start", "spent"], source
+                ))
+            db.commit()
+        except SQLAlchemyError as e:
+            db.rollback()
+            raise ValueError(f"Error rebuilding budget spend: {str(e)}")
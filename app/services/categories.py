@@ -1,20 +1,98 @@
+import threading
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.models import Category
 from app.schemas.categories import CategoryCreate, CategoryUpdate, CategoryResponse
+from app.core.cache import create_version_backend
+from app.core.config import settings
+from app.services.search import relevance_key
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
+CACHE_NAMESPACE = "categories"
+
+
+class CategoryCache:
+    """In-process copy of the (small, read-mostly) categories table.
+
+    Writers bump a version in the shared backend after committing; readers reload the
+    whole table whenever the version they hold is behind, so every worker converges.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self._lock = threading.Lock()
+        self._version = None
+        self._ordered = []
+        self._by_id = {}
+        self._by_name = {}
+
+    def version(self) -> int:
+        return self.backend.get_version(CACHE_NAMESPACE)
+
+    def snapshot(self, db: Session):
+        version = self.version()
+        if version != self._version:
+            with self._lock:
+                if version != self._version:
+                    # The version is read before loading, so a concurrent write can only make this copy look stale
+                    ordered = [CategoryResponse.model_validate(category, from_attributes=True)
+                               for category in db.query(Category).order_by(Category.id.asc())]
+                    self._by_id = {category.id: category for category in ordered}
+                    self._by_name = {category.name: category for category in ordered}
+                    self._ordered = ordered
+                    self._version = version
+        return self._ordered, self._by_id, self._by_name
+
+    def invalidate(self) -> int:
+        return self.backend.bump(CACHE_NAMESPACE)
+
+
+category_cache = CategoryCache(create_version_backend(settings.cache_redis_url))
+
+
 class CategoryService:
+    @staticmethod
+    def get_version(db: Session) -> tuple:
+        """Highest change_id and row count of the categories table, for ETags.
+
+        Read from the database rather than the cache backend, whose in-memory counter restarts at
+        zero on every boot and in every worker. Every insert or update stamps a higher change_id and
+        every delete lowers the count, so any committed write changes the pair.
+        """
+        return tuple(db.execute(select(func.max(Category.change_id), func.count(Category.id))).one())
+
+
     @staticmethod
     def get_all_categories(db: Session, page: int, limit: int, search: str = ""):
-        return db.query(Category).order_by(Category.id.asc()).filter(Category.name.contains(search)).limit(limit).offset((page-1)*limit).all()
+        ordered, _, _ = category_cache.snapshot(db)
+        if search:
+            term = search.lower()
+            matches = sorted((category for category in ordered if term in category.name.lower()),
+                             key=lambda category: relevance_key(category.name, term))
+        else:
+            matches = ordered
+        return matches[(page-1)*limit:page*limit]
+
+
+    @staticmethod
+    def get_category_suggestions(db: Session, prefix: str, limit: int = 10):
+        ordered, _, _ = category_cache.snapshot(db)
+        term = prefix.lower()
+        matches = [category for category in ordered if category.name.lower().startswith(term)]
+        return sorted(matches, key=lambda category: category.name.lower())[:limit]
 
 
     @staticmethod
     def get_category_by_id(db: Session, category_id: int):
-        db_category = db.query(Category).filter(Category.id == category_id).first()
-        if not db_category:
-            return None
-        return db_category
+        _, by_id, _ = category_cache.snapshot(db)
+        return by_id.get(category_id)
+
+
+    @staticmethod
+    def get_category_by_name(db: Session, name: str):
+        _, _, by_name = category_cache.snapshot(db)
+        return by_name.get(name)
     
 
     @staticmethod
@@ -27,6 +105,7 @@ class CategoryService:
             db.add(db_category)
             db.commit()
             db.refresh(db_category)
+            category_cache.invalidate()
             return db_category
         except IntegrityError:
             db.rollback()
@@ -42,6 +121,7 @@ class CategoryService:
                     setattr(db_category, key, value)
                 db.commit()
                 db.refresh(db_category)
+                category_cache.invalidate()
                 return db_category
             return None
         except SQLAlchemyError as e:
@@ -55,5 +135,73 @@ class CategoryService:
         if db_category:
             db.delete(db_category)
             db.commit()
+            category_cache.invalidate()
+            return db_category
+        return None
+
+
+class AsyncCategoryService:
+    @staticmethod
+    async def get_version(db: AsyncSession) -> tuple:
+        return await db.run_sync(CategoryService.get_version)
+
+
+    @staticmethod
+    async def get_all_categories(db: AsyncSession, page: int, limit: int, search: str = ""):
+        return await db.run_sync(CategoryService.get_all_categories, page, limit, search)
+
+
+    @staticmethod
+    async def get_category_by_id(db: AsyncSession, category_id: int):
+        return await db.run_sync(CategoryService.get_category_by_id, category_id)
+
+
+    @staticmethod
+    async def _get_category_for_write(db: AsyncSession, category_id: int):
+        result = await db.execute(select(Category).filter(Category.id == category_id))
+        return result.scalars().first()
+
+
+    @staticmethod
+    async def create_category(db: AsyncSession, category: CategoryCreate):
+        db_category = Category(
+            name = category.name,
+            description = category.description
+        )
+        try:
+            db.add(db_category)
+            await db.commit()
+            await db.refresh(db_category)
+            category_cache.invalidate()
+            return db_category
+        except IntegrityError:
+            await db.rollback()
+            raise ValueError("Category with this name already exists")
+
+
+    @staticmethod
+    async def update_category(db: AsyncSession, category_id: int, category: CategoryUpdate):
+        try:
+            db_category = await AsyncCategoryService._get_category_for_write(db, category_id)
+            if db_category:
+                for key, value in category.model_dump().items():
+                    setattr(db_category, key, value)
+                await db.commit()
+                await db.refresh(db_category)
+                category_cache.invalidate()
+                return db_category
+            return None
+        except SQLAlchemyError as e:
+            await db.rollback()
+            raise ValueError(f"Error updating category: {str(e)}")
+
+
+    @staticmethod
+    async def delete_category(db: AsyncSession, category_id: int):
+        db_category = await AsyncCategoryService._get_category_for_write(db, category_id)
+        if db_category:
+            await db.delete(db_category)
+            await db.commit()
+            category_cache.invalidate()
             return db_category
-        return None
\ No newline at end of file
+        return None
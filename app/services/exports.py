@@ -0,0 +1,145 @@
+import csv
+import io
+import json
+from typing import Iterator
+from sqlalchemy import select
+from app.database.database import SessionLocal
+from app.models.models import Category, Transaction
+from app.schemas.auth import CurrentUser
+from app.schemas.transactions import TransactionFilters
+from app.services.transactions import filter_transactions, order_transactions
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+EXPORT_COLUMNS = ("id", "amount", "is_expense", "transaction_date", "category_id", "category_name")
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands back whatever was written since the last drain."""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ExportService:
+    @staticmethod
+    def parquet_available() -> bool:
+        return pa is not None
+
+
+    @staticmethod
+    def iter_batches(user: CurrentUser, filters: TransactionFilters = None, batch_size: int = 1000) -> Iterator[list]:
+        """Yield lists of export rows read through a server-side cursor.
+
+        The generator owns its session because it outlives the request's dependencies
+        while the response is streamed.
+        """
+        filters = filters or TransactionFilters()
+        db = SessionLocal()
+        try:
+            query = (
+                select(
+                    Transaction.id,
+                    Transaction.amount,
+                    Transaction.is_expense,
+                    Transaction.transaction_date,
+                    Transaction.category_id,
+                    Category.name.label("category_name")
+                ).join(Category, Category.id == Transaction.category_id)
+                .where(Transaction.user_id == user.id)
+            )
+            query = order_transactions(filter_transactions(query, filters), filters.sort)
+            result = db.execute(query.execution_options(yield_per=batch_size))
+            for partition in result.partitions():
+                yield partition
+        finally:
+            db.close()
+
+
+    @staticmethod
+    def stream(user: CurrentUser, export_format: str, filters: TransactionFilters = None) -> Iterator[bytes]:
+        batches = ExportService.iter_batches(user, filters)
+        if export_format == "csv":
+            return ExportService._stream_csv(batches)
+        if export_format == "ndjson":
+            return ExportService._stream_ndjson(batches)
+        return ExportService._stream_parquet(batches)
+
+
+    @staticmethod
+    def _stream_csv(batches: Iterator[list]) -> Iterator[bytes]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_COLUMNS)
+        for batch in batches:
+            writer.writerows((row.id, row.amount, str(row.is_expense).lower(), row.transaction_date, row.category_id, row.category_name) for row in batch)
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode()
+
+
+    @staticmethod
+    def _stream_ndjson(batches: Iterator[list]) -> Iterator[bytes]:
+        for batch in batches:
+            yield "".join(
+                json.dumps({
+                    "id": row.id,
+                    "amount": row.amount,
+                    "is_expense": row.is_expense,
+                    "transaction_date": row.transaction_date.isoformat() if row.transaction_date else None,
+                    "category_id": row.category_id,
+                    "category_name": row.category_name,
+                }) + "\n"
+                for row in batch
+            ).encode()
+
+
+    @staticmethod
+    def _stream_parquet(batches: Iterator[list]) -> Iterator[bytes]:
+        schema = pa.schema([
+            ("id", pa.int64()),
+            ("amount", pa.float64()),
+            ("is_expense", pa.bool_()),
+            ("transaction_date", pa.date32()),
+            ("category_id", pa.int64()),
+            ("category_name", pa.string()),
+        ])
+        sink = _ChunkSink()
+        # One row group per fetched batch keeps only a single batch in memory
+        with pq.ParquetWriter(sink, schema) as writer:
+            for batch in batches:
+                columns = list(zip(*batch))
+                writer.write_table(pa.Table.from_arrays(
+                    [pa.array(column, type=field.type) for column, field in zip(columns, schema)], schema=schema
+                ))
+                yield sink.drain()
+        yield sink.drain()
@@ -0,0 +1,113 @@
+import hashlib
+from datetime import datetime, timedelta, timezone
+from typing import NamedTuple
+from pydantic import BaseModel
+from sqlalchemy import delete, func, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.models import IdempotencyKey
+from app.schemas.auth import CurrentUser
+
+idempotency_cache = TTLCache(max_size=settings.idempotency_cache_max_size, ttl=settings.idempotency_key_ttl_seconds)
+
+
+class StoredResponse(NamedTuple):
+    request_hash: str
+    # None while the original request is still running
+    status_code: int | None
+    body: str | None
+
+
+def expiry_cutoff(ttl_seconds: int = None) -> datetime:
+    """Keys created before this are expired and no longer replayed."""
+    ttl_seconds = settings.idempotency_key_ttl_seconds if ttl_seconds is None else ttl_seconds
+    return datetime.now(timezone.utc) - timedelta(seconds=ttl_seconds)
+
+
+class IdempotencyService:
+    """Idempotency-Key bookkeeping for create endpoints.
+
+    ``reserve`` inserts the key inside the caller's transaction and ``complete`` stores the response
+    and commits, so the key, the created resource and the response to replay commit together or not
+    at all: a retry racing the original blocks on the primary key until it commits or rolls back,
+    and can never insert a second resource or find a key without a response.
+    """
+
+    @staticmethod
+    def fingerprint(payload: BaseModel) -> str:
+        return hashlib.sha256(payload.model_dump_json().encode()).hexdigest()
+
+
+    @staticmethod
+    def reserve(db: Session, user: CurrentUser, key: str, request_hash: str) -> StoredResponse | None:
+        """Claim ``key`` for this request; returns None if claimed, or what an earlier request stored.
+
+        A key past its TTL is claimed again as if it were new, even before the purge job deletes it.
+        """
+        cached = idempotency_cache.get((user.id, key))
+        if cached is not None:
+            return cached
+
+        cutoff = expiry_cutoff()
+        statement = insert(IdempotencyKey).values(user_id=user.id, key=key, request_hash=request_hash)
+        claimed = db.execute(
+            statement
+            .on_conflict_do_update(
+                index_elements=[IdempotencyKey.user_id, IdempotencyKey.key],
+                set_={"request_hash": statement.excluded.request_hash, "status_code": None, "response_body": None, "created_at": func.now()},
+                where=IdempotencyKey.created_at < cutoff,
+            )
+            .returning(IdempotencyKey.key)
+        ).first()
+        if claimed is not None:
+            return None
+
+        row = db.execute(
+            select(IdempotencyKey.request_hash, IdempotencyKey.status_code, IdempotencyKey.response_body, IdempotencyKey.created_at)
+            .where(IdempotencyKey.user_id == user.id, IdempotencyKey.key == key, IdempotencyKey.created_at >= cutoff)
+        ).first()
+        # Close the read-only transaction so the request does not hold a snapshot open
+        db.rollback()
+        if row is None:
+            # Purged or expired between the insert and the select; the retry may go ahead and claim it again
+            return IdempotencyService.reserve(db, user, key, request_hash)
+
+        stored = StoredResponse(row.request_hash, row.status_code, row.response_body)
+        if stored.status_code is not None:
+            # Cache only for the rest of the key's lifetime, so an expired key is not replayed from memory
+            idempotency_cache.set((user.id, key), stored, ttl=(row.created_at - cutoff).total_seconds())
+        return stored
+
+
+    @staticmethod
+    def complete(db: Session, user: CurrentUser, key: str, request_hash: str, status_code: int, body: str):
+        """Store the response for ``key`` and commit it with the rest of the caller's transaction."""
+        db.execute(
+            update(IdempotencyKey)
+            .where(IdempotencyKey.user_id == user.id, IdempotencyKey.key == key)
+            .values(status_code=status_code, response_body=body)
+        )
+        db.commit()
+        idempotency_cache.set((user.id, key), StoredResponse(request_hash, status_code, body))
+
+
+    @staticmethod
+    def purge_expired(db: Session, ttl_seconds: int = None, batch_size: int = 1000) -> int:
+        """Delete keys older than the TTL in batches, committing after each one; returns the count."""
+        cutoff = expiry_cutoff(ttl_seconds)
+        purged = 0
+        while True:
+            expired = (
+                select(IdempotencyKey.user_id, IdempotencyKey.key)
+                .where(IdempotencyKey.created_at < cutoff)
+                .limit(batch_size)
+            )
+            deleted = db.execute(
+                delete(IdempotencyKey).where(tuple_(IdempotencyKey.user_id, IdempotencyKey.key).in_(expired))
+            ).rowcount
+            db.commit()
+            purged += deleted
+            if deleted < batch_size:
+                return purged
@@ -0,0 +1,156 @@
+import calendar
+from datetime import date, datetime, timedelta, timezone
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.models import Budget, Transaction, UserInsight
+from app.schemas.insights import InsightsResponse
+from app.services.anomalies import EXPENSE_FIELDS, find_anomalies, np
+from app.services.budgets import period_start
+
+
+
+def period_end(period: str, start: date) -> date:
+    """First day after the period that begins on ``start``."""
+    if period == "daily":
+        return start + timedelta(days=1)
+    if period == "weekly":
+        return start + timedelta(days=7)
+    return start + timedelta(days=calendar.monthrange(start.year, start.month)[1])
+
+
+class InsightService:
+    """Spending trends, budget projections and anomalies computed on NumPy arrays.
+
+    History is read as plain row tuples straight into a structured array; no ORM objects are built.
+    """
+
+    @staticmethod
+    def numpy_available() -> bool:
+        return np is not None
+
+
+    @staticmethod
+    def load_expenses(db: Session, user_id: int, start: date, end: date):
+        result = db.execute(
+            select(Transaction.id, Transaction.transaction_date, Transaction.category_id, Transaction.amount)
+            .where(
+                Transaction.user_id == user_id,
+                Transaction.is_expense.is_(True),
+                Transaction.transaction_date.between(start, end)
+            )
+        )
+        return np.fromiter(
+            ((row_id, day.toordinal(), category_id, amount) for row_id, day, category_id, amount in result),
+            dtype=EXPENSE_FIELDS
+        )
+
+
+    @staticmethod
+    def compute(db: Session, user_id: int, today: date = None) -> InsightsResponse:
+        today = today or date.today()
+        budgets = db.execute(
+            select(Budget.id, Budget.category_id, Budget.period, Budget.limit)
+            .where(Budget.user_id == user_id)
+            .order_by(Budget.id.asc())
+        ).all()
+        budget_starts = [period_start(budget.period, today) for budget in budgets]
+        # Reach back to the start of the month and of every budget's current period, e.g. a week that
+        # began last month, so each budget sees its whole period however short the lookback
+        start = min([today - timedelta(days=settings.insights_lookback_days - 1), today.replace(day=1), *budget_starts])
+        n_days = (today - start).days + 1
+
+        expenses = InsightService.load_expenses(db, user_id, start, today)
+        categories, category_index = np.unique(expenses["category_id"], return_inverse=True)
+
+        # Daily spend per category, one row per category and one column per day of the window
+        daily = np.zeros((len(categories), n_days))
+        np.add.at(daily, (category_index, expenses["day"] - start.toordinal()), expenses["amount"])
+        rolling_7d = daily[:, -min(7, n_days):].mean(axis=1)
+        rolling_30d = daily[:, -min(30, n_days):].mean(axis=1)
+
+        return InsightsResponse(
+            as_of=today,
+            generated_at=datetime.now(timezone.utc),
+            trends=[
+                {"category_id": int(category_id), "rolling_7d": float(week), "rolling_30d": float(month)}
+                for category_id, week, month in zip(categories, rolling_7d, rolling_30d)
+            ],
+            projections=InsightService._project_budgets(budgets, budget_starts, today, start, categories, daily, rolling_30d),
+            anomalies=find_anomalies(expenses, categories, category_index, today),
+        )
+
+
+    @staticmethod
+    def _project_budgets(budgets: list, starts: list, today: date, start: date, categories, daily, rolling_30d) -> list:
+        """Spend so far in each budget's current period plus the 30-day daily average for the days left.
+
+        ``starts`` holds each budget's current period start, none of them before ``start``.
+        """
+        if not budgets:
+            return []
+
+        ends = [period_end(budget.period, budget_start) for budget, budget_start in zip(budgets, starts)]
+        budget_categories = np.array([budget.category_id for budget in budgets], dtype="i8")
+        start_columns = np.array([(budget_start - start).days for budget_start in starts])
+        days_left = np.array([(end - today).days - 1 for end in ends])
+        limits = np.array([budget.limit for budget in budgets], dtype="f8")
+
+        # Budgets for categories with no spend in the window get zero spend and zero run rate
+        if len(categories):
+            positions = np.minimum(np.searchsorted(categories, budget_categories), len(categories) - 1)
+            has_spend = categories[positions] == budget_categories
+        else:
+            positions = np.zeros(len(budgets), dtype="i8")
+            has_spend = np.zeros(len(budgets), dtype=bool)
+
+        cumulative = np.concatenate([np.zeros((len(categories), 1)), np.cumsum(daily, axis=1)], axis=1)
+        spent = np.zeros(len(budgets))
+        run_rate = np.zeros(len(budgets))
+        if has_spend.any():
+            rows = positions[has_spend]
+            spent[has_spend] = cumulative[rows, -1] - cumulative[rows, start_columns[has_spend]]
+            run_rate[has_spend] = rolling_30d[rows]
+        projected = spent + run_rate * days_left
+
+        return [
+            {
+                "budget_id": budget.id,
+                "category_id": budget.category_id,
+                "period": budget.period,
+                "period_start": budget_start,
+                "period_end": end - timedelta(days=1),
+                "limit": budget.limit,
+                "spent": float(spent[index]),
+                "projected": float(projected[index]),
+                "projected_over": bool(projected[index] > limits[index]),
+            }
+            for index, (budget, budget_start, end) in enumerate(zip(budgets, starts, ends))
+        ]
+
+
+    @staticmethod
+    def get_stored(db: Session, user_id: int) -> InsightsResponse | None:
+        """The precomputed insights, if they are younger than ``insights_max_age_hours``."""
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=settings.insights_max_age_hours)
+        payload = db.execute(
+            select(UserInsight.payload).where(UserInsight.user_id == user_id, UserInsight.generated_at >= cutoff)
+        ).scalar()
+        return InsightsResponse.model_validate(payload) if payload is not None else None
+
+
+    @staticmethod
+    def refresh(db: Session, user_id: int, today: date = None) -> InsightsResponse:
+        """Compute and store one user's insights; the caller commits."""
+        insights = InsightService.compute(db, user_id, today)
+        stmt = insert(UserInsight).values(
+            user_id=user_id,
+            generated_at=insights.generated_at,
+            payload=insights.model_dump(mode="json")
+        )
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=[UserInsight.user_id],
+            set_={"generated_at": stmt.excluded.generated_at, "payload": stmt.excluded.payload}
+        ))
+        return insights
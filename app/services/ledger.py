@@ -0,0 +1,42 @@
+from datetime import date
+from typing import Iterable, NamedTuple
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+
+class TransactionChange(NamedTuple):
+    """Signed effect of a transaction write on derived totals.
+
+    A create contributes the new row with sign +1, a delete the old row with sign -1,
+    and an update contributes both.
+    """
+    user_id: int
+    category_id: int
+    is_expense: bool
+    amount: float
+    transaction_date: date
+    sign: int
+
+    @classmethod
+    def of(cls, transaction, sign: int) -> "TransactionChange":
+        return cls(
+            user_id=transaction.user_id,
+            category_id=transaction.category_id,
+            is_expense=transaction.is_expense,
+            amount=transaction.amount,
+            transaction_date=transaction.transaction_date,
+            sign=sign,
+        )
+
+
+def lock_ledgers(db: Session, user_ids: Iterable[int]):
+    """Take the sync advisory lock of every user in ``user_ids``, lowest id first, until commit.
+
+    Every write to a user's transactions or to the totals derived from them calls this before it
+    locks any row, so all writers lock in one order: the advisory lock, then transaction rows, then
+    budget_spend, monthly_rollups and users. The sync triggers take the same lock per row, which is
+    then re-entrant and free; left to them alone, paths that touch the aggregates first deadlock
+    against bulk statements that reach the trigger first.
+    """
+    for user_id in sorted(set(user_ids)):
+        db.execute(select(func.pg_advisory_xact_lock(func.hashtext("sync"), user_id)))
@@ -0,0 +1,85 @@
+import re
+from datetime import date
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+from app.core.config import settings
+
+PARTITION_NAME = re.compile(r"^transactions_(\d{4})_(\d{2})$")
+
+
+class PartitionService:
+    """Maintenance for the monthly range partitions of transactions.
+
+    Partitions are created by the create_transaction_partition() SQL function installed by the
+    partitioning migration; rows dated outside every partition land in transactions_default.
+    """
+
+    @staticmethod
+    def list_partitions(db: Session) -> list:
+        """Return (name, month start) for every attached monthly partition, oldest first."""
+        names = db.execute(text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE pg_inherits.inhparent = 'transactions'::regclass"
+        )).scalars().all()
+
+        partitions = []
+        for name in names:
+            match = PARTITION_NAME.match(name)
+            if match:
+                partitions.append((name, date(int(match.group(1)), int(match.group(2)), 1)))
+        return sorted(partitions, key=lambda partition: partition[1])
+
+
+    @staticmethod
+    def ensure_partitions(db: Session, months_ahead: int = None) -> list:
+        """Create any missing partition from the current month through ``months_ahead`` months ahead."""
+        months_ahead = settings.partition_months_ahead if months_ahead is None else months_ahead
+        try:
+            names = db.execute(text(
+                "SELECT create_transaction_partition((date_trunc('month', CURRENT_DATE) + make_interval(months => n))::date) "
+                "FROM generate_series(0, :months_ahead) AS n"
+            ), {"months_ahead": months_ahead}).scalars().all()
+            db.commit()
+            return names
+        except SQLAlchemyError as e:
+            db.rollback()
+            raise ValueError(f"Error creating transaction partitions: {str(e)}")
+
+
+    @staticmethod
+    def archive_partitions(db: Session, before: date, drop: bool = False) -> list:
+        """Detach every monthly partition that ends on or before ``before``'s month.
+
+        Each partition's net amount is folded into users.opening_balance in the same transaction, so
+        current_balance still reconciles against the rows left in the ledger. Detached tables move to
+        the archive schema, or are dropped when ``drop`` is set. budget_spend and monthly_rollups keep
+        their buckets, but a rebuild only sees attached partitions.
+        """
+        cutoff = before.replace(day=1)
+        archived = []
+        for name, month in PartitionService.list_partitions(db):
+            if month >= cutoff:
+                break
+            try:
+                # Detaching first takes the lock, so no write can touch these rows while they are summed
+                db.execute(text(f'ALTER TABLE transactions DETACH PARTITION "{name}"'))
+                db.execute(text(
+                    "UPDATE users SET opening_balance = users.opening_balance + archived.net "
+                    "FROM (SELECT user_id, sum(CASE WHEN is_expense THEN -amount ELSE amount END) AS net "
+                    f'FROM "{name}" GROUP BY user_id) AS archived '
+                    "WHERE users.id = archived.user_id"
+                ))
+                if drop:
+                    db.execute(text(f'DROP TABLE "{name}"'))
+                else:
+                    schema = settings.partition_archive_schema
+                    db.execute(text(f'CREATE SCHEMA IF NOT EXISTS "{schema}"'))
+                    db.execute(text(f'ALTER TABLE "{name}" SET SCHEMA "{schema}"'))
+                db.commit()
+                archived.append(name)
+            except SQLAlchemyError as e:
+                db.rollback()
+                raise ValueError(f"Error archiving partition {name}: {str(e)}")
+        return archived
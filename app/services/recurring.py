@@ -0,0 +1,155 @@
+import calendar
+from datetime import date, timedelta
+from fastapi import HTTPException
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from app.models.models import Category, RecurringTransaction
+from app.schemas.auth import CurrentUser
+from app.schemas.recurring import RecurringTransactionCreate, RecurringTransactionUpdate
+from app.services.ledger import TransactionChange, lock_ledgers
+from app.services.transactions import TransactionService
+
+
+def occurrence_date(start: date, frequency: str, interval: int, n: int) -> date:
+    """Date of the n-th (0-based) occurrence; month and year steps clamp to the end of short months."""
+    if frequency == "daily":
+        return start + timedelta(days=n * interval)
+    if frequency == "weekly":
+        return start + timedelta(weeks=n * interval)
+
+    months = n * interval * (12 if frequency == "yearly" else 1)
+    year, month = divmod(start.month - 1 + months, 12)
+    year += start.year
+    return date(year, month + 1, min(start.day, calendar.monthrange(year, month + 1)[1]))
+
+
+class RecurringService:
+    @staticmethod
+    def get_all_recurring(db: Session, page: int, limit: int, user: CurrentUser):
+        return db.query(RecurringTransaction).options(joinedload(RecurringTransaction.category, innerjoin=True)).filter(
+            RecurringTransaction.user_id == user.id
+        ).order_by(RecurringTransaction.id.asc()).limit(limit).offset((page-1)*limit).all()
+
+
+    @staticmethod
+    def get_recurring_by_id(db: Session, recurring_id: int, user: CurrentUser):
+        return db.query(RecurringTransaction).options(joinedload(RecurringTransaction.category, innerjoin=True)).filter(
+            RecurringTransaction.id == recurring_id, RecurringTransaction.user_id == user.id
+        ).first()
+
+
+    @staticmethod
+    def create_recurring(db: Session, recurring: RecurringTransactionCreate, user: CurrentUser):
+        RecurringService._check_category(db, recurring.category_id)
+        db_recurring = RecurringTransaction(
+            **recurring.model_dump(),
+            user_id = user.id,
+            next_run_date = recurring.start_date
+        )
+        try:
+            db.add(db_recurring)
+            db.commit()
+            return RecurringService.get_recurring_by_id(db, db_recurring.id, user)
+        except IntegrityError:
+            db.rollback()
+            raise ValueError("Error creating recurring transaction")
+
+
+    @staticmethod
+    def update_recurring(db: Session, recurring_id: int, recurring: RecurringTransactionUpdate, user: CurrentUser):
+        """Change what future occurrences post; the schedule itself is fixed once created."""
+        try:
+            db_recurring = db.query(RecurringTransaction).filter(
+                RecurringTransaction.id == recurring_id, RecurringTransaction.user_id == user.id
+            ).with_for_update().first()
+            if not db_recurring:
+                return None
+            RecurringService._check_category(db, recurring.category_id)
+            # start_date is fixed, so the create schema's date check has to run against the stored rule
+            if recurring.end_date is not None and recurring.end_date < db_recurring.start_date:
+                raise HTTPException(status_code=422, detail="end_date must not be before start_date")
+            for key, value in recurring.model_dump().items():
+                setattr(db_recurring, key, value)
+            db.commit()
+            return RecurringService.get_recurring_by_id(db, recurring_id, user)
+        except SQLAlchemyError as e:
+            db.rollback()
+            raise ValueError(f"Error updating recurring transaction: {str(e)}")
+
+
+    @staticmethod
+    def delete_recurring(db: Session, recurring_id: int, user: CurrentUser):
+        """Stop the rule; transactions it already posted are kept."""
+        db_recurring = db.query(RecurringTransaction).filter(
+            RecurringTransaction.id == recurring_id, RecurringTransaction.user_id == user.id
+        ).first()
+        if not db_recurring:
+            return None
+        db.delete(db_recurring)
+        db.commit()
+        return {"recurring_transaction_id": recurring_id}
+
+
+    @staticmethod
+    def materialize_due(db: Session, today: date = None, batch_size: int = 50) -> dict:
+        """Post every occurrence due on or before ``today``, ``batch_size`` rules per DB transaction.
+
+        Rules are leased with FOR UPDATE SKIP LOCKED, so concurrent workers each take different rules
+        and none is posted twice. Until it commits, a batch also holds the sync lock of every user it
+        posts for, blocking their other writes and /sync reads, so keep ``batch_size`` small.
+
+        A leased rule posts all of its missed occurrences at once and moves next_run_date past
+        ``today``, so a single pass catches up however long the workers were down.
+        """
+        today = today or date.today()
+        rules_run = 0
+        posted = 0
+        while True:
+            try:
+                rules = db.query(RecurringTransaction).filter(
+                    RecurringTransaction.active.is_(True),
+                    RecurringTransaction.next_run_date <= today
+                ).order_by(RecurringTransaction.next_run_date.asc(), RecurringTransaction.id.asc()).limit(
+                    batch_size
+                ).with_for_update(skip_locked=True).all()
+                if not rules:
+                    db.rollback()
+                    break
+
+                rows = []
+                for rule in rules:
+                    while rule.next_run_date <= today and (rule.end_date is None or rule.next_run_date <= rule.end_date):
+                        rows.append({
+                            "amount": rule.amount,
+                            "is_expense": rule.is_expense,
+                            "transaction_date": rule.next_run_date,
+                            "user_id": rule.user_id,
+                            "category_id": rule.category_id,
+                        })
+                        rule.occurrences += 1
+                        rule.next_run_date = occurrence_date(rule.start_date, rule.frequency, rule.interval, rule.occurrences)
+                    if rule.end_date is not None and rule.next_run_date > rule.end_date:
+                        rule.active = False
+
+                if rows:
+                    # The batch spans many users; lock_ledgers takes their locks lowest id first,
+                    # before any transaction or aggregate row, like every other transaction write
+                    rows.sort(key=lambda row: (row["user_id"], row["transaction_date"]))
+                    lock_ledgers(db, (row["user_id"] for row in rows))
+                    TransactionService._insert_rows(db, rows)
+                    TransactionService._apply_changes(db, [TransactionChange(sign=1, **row) for row in rows])
+                # Releases the leases together with the posted transactions
+                db.commit()
+                rules_run += len(rules)
+                posted += len(rows)
+            except SQLAlchemyError as e:
+                db.rollback()
+                raise ValueError(f"Error posting recurring transactions: {str(e)}")
+
+        return {"rules": rules_run, "transactions": posted}
+
+
+    @staticmethod
+    def _check_category(db: Session, category_id: int):
+        if not db.query(Category.id).filter(Category.id == category_id).first():
+            raise HTTPException(status_code=404, detail=f"Category with id {category_id} not found")
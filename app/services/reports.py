@@ -0,0 +1,140 @@
+from collections import defaultdict
+from datetime import date
+from typing import Iterable
+from sqlalchemy import Date, Integer, case, cast, delete, func, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+from app.models.models import Category, MonthlyRollup, Transaction
+from app.schemas.auth import CurrentUser
+from app.services.ledger import TransactionChange, lock_ledgers
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+class ReportService:
+    @staticmethod
+    def _filter_range(query, date_from: date | None, date_to: date | None):
+        if date_from:
+            query = query.filter(MonthlyRollup.month >= month_start(date_from))
+        if date_to:
+            query = query.filter(MonthlyRollup.month <= month_start(date_to))
+        return query
+
+
+    @staticmethod
+    def get_monthly_report(db: Session, user: CurrentUser, date_from: date | None = None, date_to: date | None = None):
+        query = db.query(
+            MonthlyRollup.month,
+            func.sum(MonthlyRollup.income).label("income"),
+            func.sum(MonthlyRollup.expense).label("expense"),
+            func.sum(MonthlyRollup.transaction_count).label("transaction_count")
+        ).filter(MonthlyRollup.user_id == user.id)
+        query = ReportService._filter_range(query, date_from, date_to)
+
+        return [
+            {
+                "month": row.month.strftime("%Y-%m"),
+                "income": row.income,
+                "expense": row.expense,
+                "net": row.income - row.expense,
+                "transaction_count": row.transaction_count,
+            }
+            for row in query.group_by(MonthlyRollup.month).order_by(MonthlyRollup.month.asc())
+            if row.transaction_count
+        ]
+
+
+    @staticmethod
+    def get_category_report(db: Session, user: CurrentUser, date_from: date | None = None, date_to: date | None = None):
+        query = db.query(
+            MonthlyRollup.category_id,
+            Category.name,
+            func.sum(MonthlyRollup.income).label("income"),
+            func.sum(MonthlyRollup.expense).label("expense"),
+            func.sum(MonthlyRollup.transaction_count).label("transaction_count")
+        ).join(Category, Category.id == MonthlyRollup.category_id).filter(MonthlyRollup.user_id == user.id)
+        query = ReportService._filter_range(query, date_from, date_to)
+
+        return [
+            {
+                "category_id": row.category_id,
+                "category_name": row.name,
+                "income": row.income,
+                "expense": row.expense,
+                "net": row.income - row.expense,
+                "transaction_count": row.transaction_count,
+            }
+            for row in query.group_by(MonthlyRollup.category_id, Category.name).order_by(func.sum(MonthlyRollup.expense).desc())
+            if row.transaction_count
+        ]
+
+
+    @staticmethod
+    def apply_changes(db: Session, changes: Iterable[TransactionChange]):
+        """Fold transaction changes into monthly_rollups in one upsert; the caller commits."""
+        deltas = defaultdict(lambda: [0.0, 0.0, 0])
+        for change in changes:
+            if change.transaction_date is None:
+                continue
+            totals = deltas[(change.user_id, month_start(change.transaction_date), change.category_id)]
+            totals[1 if change.is_expense else 0] += change.sign * change.amount
+            totals[2] += change.sign
+
+        if not deltas:
+            return
+
+        rows = [
+            {"user_id": user_id, "month": month, "category_id": category_id,
+             "income": income, "expense": expense, "transaction_count": count}
+            for (user_id, month, category_id), (income, expense, count) in sorted(deltas.items())
+        ]
+        stmt = insert(MonthlyRollup).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[MonthlyRollup.user_id, MonthlyRollup.month, MonthlyRollup.category_id],
+            set_={
+                "income": MonthlyRollup.income + stmt.excluded.income,
+                "expense": MonthlyRollup.expense + stmt.excluded.expense,
+                "transaction_count": MonthlyRollup.transaction_count + stmt.excluded.transaction_count,
+            }
+        )
+        db.execute(stmt)
+
+
+    @staticmethod
+    def rebuild_rollups(db: Session, user_id: int = None):
+        """Recompute monthly_rollups from the transactions table, for one user or everyone."""
+        try:
+            # Hold off concurrent transaction writes so none lands between the DELETE and the
+            # INSERT ... SELECT: the user's ledger lock, or for everyone a table lock that blocks
+            # their upserts until commit (they already hold their ledger lock, so no cycle forms)
+            if user_id is not None:
+                lock_ledgers(db, [user_id])
+            else:
+                db.execute(text("LOCK TABLE monthly_rollups IN EXCLUSIVE MODE"))
+            clear = delete(MonthlyRollup)
+            if user_id is not None:
+                clear = clear.where(MonthlyRollup.user_id == user_id)
+            db.execute(clear)
+
+            month = cast(func.date_trunc("month", Transaction.transaction_date), Date)
+            source = select(
+                Transaction.user_id,
+                month,
+                Transaction.category_id,
+                func.sum(case((Transaction.is_expense, 0.0), else_=Transaction.amount)),
+                func.sum(case((Transaction.is_expense, Transaction.amount), else_=0.0)),
+                cast(func.count(), Integer)
+            ).where(Transaction.transaction_date.isnot(None)).group_by(Transaction.user_id, month, Transaction.category_id)
+            if user_id is not None:
+                source = source.where(Transaction.user_id == user_id)
+
+            db.execute(insert(MonthlyRollup).from_select(
+                ["user_id", "month", "category_id", "income", "expense", "transaction_count"], source
+            ))
+            db.commit()
+        except SQLAlchemyError as e:
+            db.rollback()
+            raise ValueError(f"Error rebuilding monthly rollups: {str(e)}")
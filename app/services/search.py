@@ -0,0 +1,62 @@
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+from app.models.models import User
+
+
+def escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def relevance_key(name: str, term: str):
+    """Sort key for in-memory matches: prefix hits first, then earlier and tighter matches."""
+    lowered = name.lower()
+    position = lowered.find(term)
+    return (position != 0, position, len(name), lowered)
+
+
+class SearchService:
+    @staticmethod
+    def _is_postgres(db: Session) -> bool:
+        return db.get_bind().dialect.name == "postgresql"
+
+
+    @staticmethod
+    def search_users(db: Session, search: str, page: int, limit: int):
+        return SearchService.search_users_query(db, search).limit(limit).offset((page-1)*limit).all()
+
+
+    @staticmethod
+    def search_users_query(db: Session, search: str):
+        """Substring or fuzzy username search ranked by relevance.
+
+        On Postgres both predicates are served by the pg_trgm GIN index on users.user_name;
+        other dialects (SQLite test runs) fall back to a lower() substring scan.
+        """
+        pattern = f"%{escape_like(search)}%"
+        if SearchService._is_postgres(db):
+            query = db.query(User).filter(
+                User.user_name.ilike(pattern, escape="\\") | User.user_name.op("%")(search)
+            ).order_by(func.similarity(User.user_name, search).desc(), User.id.asc())
+        else:
+            lowered = func.lower(User.user_name)
+            query = db.query(User).filter(lowered.like(pattern.lower(), escape="\\")).order_by(
+                case((lowered.like(f"{escape_like(search.lower())}%", escape="\\"), 0), else_=1),
+                func.length(User.user_name),
+                User.id.asc()
+            )
+        return query
+
+
+    @staticmethod
+    def typeahead_users(db: Session, prefix: str, limit: int):
+        """Prefix completion on lower(user_name), a range scan on its index in the "C" collation.
+
+        Both the filter and the sort use that collation, so the index serves the LIKE prefix and
+        returns rows already in order; under the default collation Postgres would sort every match.
+        """
+        lowered = func.lower(User.user_name)
+        if SearchService._is_postgres(db):
+            lowered = lowered.collate("C")
+        return db.query(User.id, User.user_name).filter(
+            lowered.like(f"{escape_like(prefix.lower())}%", escape="\\")
+        ).order_by(lowered.asc()).limit(limit).all()
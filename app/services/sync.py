@@ -0,0 +1,88 @@
+from sqlalchemy import func, or_, select
+from sqlalchemy.orm import Session
+from app.models.models import Budget, Category, SyncTombstone, Transaction
+from app.schemas.auth import CurrentUser
+from app.utils.pagination import encode_cursor, decode_cursor
+
+SYNCED_MODELS = {"transactions": Transaction, "budgets": Budget, "categories": Category}
+
+
+def encode_sync_token(change_id: int) -> str:
+    return encode_cursor({"c": change_id})
+
+
+def decode_sync_token(token: str) -> int:
+    change_id = int(decode_cursor(token)["c"])
+    if change_id < 0:
+        raise ValueError("Invalid sync token")
+    return change_id
+
+
+class SyncService:
+    @staticmethod
+    def get_changes(db: Session, user: CurrentUser, since: int, limit: int) -> dict:
+        """Return up to ``limit`` rows and deletions with a change_id above ``since``, in change_id order.
+
+        The shared advisory locks wait out in-flight writers for this user (and for categories, key 0)
+        and keep new ones from stamping until this read ends, so every change_id at or below the
+        returned token is already visible.
+        """
+        try:
+            # Same order as a category delete cascading into user rows, so the two cannot deadlock
+            db.execute(select(func.pg_advisory_xact_lock_shared(func.hashtext("sync"), 0)))
+            db.execute(select(func.pg_advisory_xact_lock_shared(func.hashtext("sync"), user.id)))
+
+            # Each source contributes at most limit + 1 rows, so merging them yields the first limit
+            # changes overall and tells whether more remain
+            sources = {
+                "transactions": db.query(Transaction).filter(Transaction.user_id == user.id, Transaction.change_id > since)
+                    .order_by(Transaction.change_id.asc()).limit(limit + 1).all(),
+                "budgets": db.query(Budget).filter(Budget.user_id == user.id, Budget.change_id > since)
+                    .order_by(Budget.change_id.asc()).limit(limit + 1).all(),
+                "categories": db.query(Category).filter(Category.change_id > since)
+                    .order_by(Category.change_id.asc()).limit(limit + 1).all(),
+                "deleted": db.query(SyncTombstone).filter(
+                    or_(SyncTombstone.user_id == user.id, SyncTombstone.user_id.is_(None)),
+                    SyncTombstone.change_id > since
+                ).order_by(SyncTombstone.change_id.asc()).limit(limit + 1).all(),
+            }
+            changes = sorted(
+                ((row.change_id, kind, row) for kind, rows in sources.items() for row in rows),
+                key=lambda change: change[0]
+            )
+            has_more = len(changes) > limit
+            changes = changes[:limit]
+
+            result = {kind: [] for kind in sources}
+            for _, kind, row in changes:
+                result[kind].append(row)
+            result["deleted"] = SyncService._drop_moved_rows(db, result["deleted"])
+            result["deleted"] = [
+                {"entity": tombstone.entity, "id": tombstone.entity_id, "deleted_at": tombstone.deleted_at}
+                for tombstone in result["deleted"]
+            ]
+            result["next_token"] = encode_sync_token(changes[-1][0] if changes else since)
+            result["has_more"] = has_more
+            return result
+        finally:
+            # Detach the loaded rows so ending the transaction does not expire them, then release the locks
+            db.expunge_all()
+            db.rollback()
+
+
+    @staticmethod
+    def _drop_moved_rows(db: Session, tombstones: list) -> list:
+        """Skip tombstones of rows that still exist.
+
+        Changing a transaction's month moves it to another partition as a DELETE plus INSERT, which
+        fires the delete trigger even though the row lives on under the same id.
+        """
+        ids_by_entity = {}
+        for tombstone in tombstones:
+            ids_by_entity.setdefault(tombstone.entity, set()).add(tombstone.entity_id)
+
+        live = set()
+        for entity, ids in ids_by_entity.items():
+            model = SYNCED_MODELS[entity]
+            live.update((entity, row_id) for row_id in db.execute(select(model.id).where(model.id.in_(ids))).scalars())
+        return [tombstone for tombstone in tombstones if (tombstone.entity, tombstone.entity_id) not in live]
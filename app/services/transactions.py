@@ -1,16 +1,154 @@
-from sqlalchemy.orm import Session
-from app.models.models import Transaction
-from app.schemas.transactions import TransactionCreate, TransactionUpdate
+import csv
+import io
+from datetime import date
+from sqlalchemy import Integer, any_, bindparam, delete, func, insert, select, tuple_, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.models import Transaction, Category, SyncTombstone
+from app.schemas.transactions import TransactionCreate, TransactionUpdate, TransactionFilters, BulkTransactionUpdate, BulkTransactionDelete
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
-from app.core.security import get_current_user
+from pydantic import ValidationError
+from app.schemas.auth import CurrentUser
+from app.core.config import settings
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.utils.ingest import MalformedRow
+from app.services.ledger import TransactionChange, lock_ledgers
+from app.services.budgets import BudgetService
+from app.services.reports import ReportService
+from app.services.balances import BalanceService
 from fastapi import HTTPException
 
+BULK_COLUMNS = ("amount", "is_expense", "transaction_date", "user_id", "category_id")
+LEDGER_COLUMNS = (
+    Transaction.user_id,
+    Transaction.category_id,
+    Transaction.is_expense,
+    Transaction.amount,
+    Transaction.transaction_date,
+)
+SORT_COLUMNS = {
+    "id": Transaction.id,
+    "transaction_date": Transaction.transaction_date,
+    "amount": Transaction.amount,
+}
+
+
+def filter_clauses(filters: TransactionFilters | None) -> list:
+    """WHERE clauses for ``filters``; every one rides on one of the user_id-led indexes."""
+    if filters is None:
+        return []
+    clauses = []
+    if filters.date_from is not None:
+        clauses.append(Transaction.transaction_date >= filters.date_from)
+    if filters.date_to is not None:
+        clauses.append(Transaction.transaction_date <= filters.date_to)
+    if filters.category_ids:
+        clauses.append(Transaction.category_id.in_(filters.category_ids))
+    if filters.is_expense is not None:
+        clauses.append(Transaction.is_expense.is_(filters.is_expense))
+    if filters.min_amount is not None:
+        clauses.append(Transaction.amount >= filters.min_amount)
+    if filters.max_amount is not None:
+        clauses.append(Transaction.amount <= filters.max_amount)
+    return clauses
+
+
+def filter_transactions(query, filters: TransactionFilters | None):
+    """Narrow a Query or Select on transactions by ``filters``."""
+    clauses = filter_clauses(filters)
+    return query.filter(*clauses) if clauses else query
+
+
+def order_transactions(query, sort: str, after: dict | None = None):
+    """Order by the sort key with id as tie-breaker, seeking past `after` with a row comparison.
+
+    (sort key, id) matches the trailing columns of the (user_id, <key>, id) indexes, so the
+    seek and the ORDER BY are both served by the index scan.
+    """
+    descending = sort.startswith("-")
+    field = sort.lstrip("-")
+    column = SORT_COLUMNS[field]
+
+    if after is not None:
+        if field == "id":
+            seek = column < after["id"] if descending else column > after["id"]
+        else:
+            key, bound = tuple_(column, Transaction.id), tuple_(after["k"], after["id"])
+            seek = key < bound if descending else key > bound
+        query = query.filter(seek)
+
+    if field == "id":
+        return query.order_by(column.desc() if descending else column.asc())
+    if descending:
+        return query.order_by(column.desc(), Transaction.id.desc())
+    return query.order_by(column.asc(), Transaction.id.asc())
+
+
+def ids_clause(ids: list):
+    # One array parameter instead of an IN list, so every batch size shares a statement and plan
+    return Transaction.id == any_(bindparam("ids", list(ids), type_=ARRAY(Integer)))
+
+
+def encode_page_cursor(transaction: Transaction, sort: str) -> str:
+    values = {"id": transaction.id}
+    if sort != "id":
+        values["s"] = sort
+    field = sort.lstrip("-")
+    if field != "id":
+        key = getattr(transaction, field)
+        values["k"] = key.isoformat() if isinstance(key, date) else key
+    return encode_cursor(values)
+
+
+def decode_page_cursor(cursor: str, sort: str) -> dict:
+    """Raises ValueError/KeyError/TypeError for cursors that are malformed or were issued for another sort."""
+    values = decode_cursor(cursor)
+    if values.get("s", "id") != sort:
+        raise ValueError("Cursor was issued for a different sort order")
+    after = {"id": int(values["id"])}
+    field = sort.lstrip("-")
+    if field == "transaction_date":
+        after["k"] = date.fromisoformat(values["k"])
+    elif field == "amount":
+        after["k"] = float(values["k"])
+    return after
+
+
 class TransactionService:
     @staticmethod
-    def get_all_transactions(db: Session, page: int, limit: int, token: str):
+    def get_version(db: Session, user: CurrentUser) -> int | None:
+        """Highest change_id behind the user's transaction list, for ETags.
+
+        Covers the user's rows, their deletions (tombstones) and the categories embedded in each row,
+        each a backward scan of a (user_id, change_id) or change_id index. A user's writers serialize
+        on the sync advisory lock, so a commit can only ever raise this value.
+        """
+        return db.execute(select(func.greatest(
+            select(func.max(Transaction.change_id)).where(Transaction.user_id == user.id).scalar_subquery(),
+            select(func.max(SyncTombstone.change_id)).where(SyncTombstone.user_id == user.id).scalar_subquery(),
+            select(func.max(Category.change_id)).scalar_subquery()
+        ))).scalar()
+
+
+    @staticmethod
+    def get_all_transactions(db: Session, page: int, limit: int, user: CurrentUser, filters: TransactionFilters = None, after: dict = None):
+        filters = filters or TransactionFilters()
         try:
-            user = get_current_user(token, db)
-            return db.query(Transaction).filter(Transaction.user_id == user.id).order_by(Transaction.id.asc()).limit(limit).offset((page-1)*limit).all()
+            # Many-to-one, so a join adds one column set per row instead of one lazy query per row
+            query = db.query(Transaction).options(joinedload(Transaction.category, innerjoin=True)).filter(Transaction.user_id == user.id)
+            query = filter_transactions(query, filters)
+            # Keyset pagination: seek past the last seen row via the matching index instead of OFFSET
+            query = order_transactions(query, filters.sort, after).limit(limit + 1)
+            if after is None:
+                query = query.offset((page-1)*limit)
+
+            transactions = query.all()
+            next_cursor = None
+            if len(transactions) > limit:
+                transactions = transactions[:limit]
+                next_cursor = encode_page_cursor(transactions[-1], filters.sort)
+            return transactions, next_cursor
         except HTTPException as http_exc:
             raise http_exc
         except Exception as e:
@@ -18,10 +156,9 @@ class TransactionService:
 
 
     @staticmethod
-    def get_transaction_by_id(db: Session, transaction_id: int, token: str):
+    def get_transaction_by_id(db: Session, transaction_id: int, user: CurrentUser):
         try:
-            user = get_current_user(token, db)
-            db_transaction = db.query(Transaction).filter(Transaction.id == transaction_id, Transaction.user_id == user.id).first()
+            db_transaction = db.query(Transaction).options(joinedload(Transaction.category, innerjoin=True)).filter(Transaction.id == transaction_id, Transaction.user_id == user.id).first()
             if not db_transaction:
                 return None
             return db_transaction
@@ -30,9 +167,10 @@ class TransactionService:
     
 
     @staticmethod
-    def create_transaction(db: Session, transaction: TransactionCreate, token: str):
+    def create_transaction(db: Session, transaction: TransactionCreate, user: CurrentUser, commit: bool = True):
+        """With ``commit=False`` the row is only flushed, for callers that commit more work with it."""
         try:
-            user = get_current_user(token, db)
+            lock_ledgers(db, [user.id])
             db_transaction = Transaction(
                 amount = transaction.amount,
                 is_expense = transaction.is_expense,
@@ -41,7 +179,11 @@ class TransactionService:
                 category_id = transaction.category_id
             )
             db.add(db_transaction)
-            db.commit()
+            TransactionService._apply_changes(db, [TransactionChange.of(db_transaction, 1)])
+            if commit:
+                db.commit()
+            else:
+                db.flush()
             db.refresh(db_transaction)
             return db_transaction
         except HTTPException as http_exc:
@@ -52,14 +194,16 @@ class TransactionService:
 
 
     @staticmethod
-    def update_transaction(db: Session, transaction_id: int, transaction: TransactionUpdate, token: str):
+    def update_transaction(db: Session, transaction_id: int, transaction: TransactionUpdate, user: CurrentUser):
         try:
-            user = get_current_user(token, db)
-            db_transaction = db.query(Transaction).filter(Transaction.id == transaction_id, Transaction.user_id == user.id).first()
+            lock_ledgers(db, [user.id])
+            db_transaction = db.query(Transaction).filter(Transaction.id == transaction_id, Transaction.user_id == user.id).with_for_update().first()
             if not db_transaction:
                 return None
+            previous = TransactionChange.of(db_transaction, -1)
             for key, value in transaction.model_dump().items():
                 setattr(db_transaction, key, value)
+            TransactionService._apply_changes(db, [previous, TransactionChange.of(db_transaction, 1)])
             db.commit()
             db.refresh(db_transaction)
             return db_transaction
@@ -71,12 +215,13 @@ class TransactionService:
 
 
     @staticmethod
-    def delete_transaction(db: Session, transaction_id: int, token: str):
+    def delete_transaction(db: Session, transaction_id: int, user: CurrentUser):
         try:
-            user = get_current_user(token, db)
-            db_transaction = db.query(Transaction).filter(Transaction.id == transaction_id, Transaction.user_id == user.id).first()
+            lock_ledgers(db, [user.id])
+            db_transaction = db.query(Transaction).filter(Transaction.id == transaction_id, Transaction.user_id == user.id).with_for_update().first()
             if not db_transaction:
                 return None
+            TransactionService._apply_changes(db, [TransactionChange.of(db_transaction, -1)])
             db.delete(db_transaction)
             db.commit()
             return {"transaction_id": transaction_id }
@@ -84,4 +229,252 @@ class TransactionService:
             raise http_exc
         except IntegrityError:
             db.rollback()
-            raise ValueError("Error deleting transaction")
\ No newline at end of file
+            raise ValueError("Error deleting transaction")
+
+
+    @staticmethod
+    def bulk_create_transactions(db: Session, records: list, user: CurrentUser, chunk_size: int = None):
+        """Validate and insert ``records`` in chunks within a single DB transaction.
+
+        Invalid rows are skipped and reported by their 1-based position instead of failing the batch.
+        """
+        chunk_size = chunk_size or settings.bulk_ingest_chunk_size
+        category_ids = {category_id for (category_id,) in db.query(Category.id).all()}
+        inserted = 0
+        errors = []
+        changes = []
+
+        try:
+            lock_ledgers(db, [user.id])
+            for start in range(0, len(records), chunk_size):
+                rows = []
+                for row_number, record in enumerate(records[start:start + chunk_size], start=start + 1):
+                    if isinstance(record, MalformedRow):
+                        errors.append({"row": row_number, "errors": [record.message]})
+                        continue
+                    try:
+                        transaction = TransactionCreate.model_validate(record)
+                    except ValidationError as e:
+                        errors.append({
+                            "row": row_number,
+                            "errors": [f"{'.'.join(str(loc) for loc in error['loc']) or 'row'}: {error['msg']}" for error in e.errors()]
+                        })
+                        continue
+                    if transaction.category_id not in category_ids:
+                        errors.append({"row": row_number, "errors": [f"category_id: Category {transaction.category_id} does not exist"]})
+                        continue
+
+                    rows.append({**transaction.model_dump(), "user_id": user.id})
+
+                if rows:
+                    TransactionService._insert_rows(db, rows)
+                    changes.extend(TransactionChange(sign=1, **row) for row in rows)
+                    inserted += len(rows)
+            TransactionService._apply_changes(db, changes)
+            db.commit()
+        except SQLAlchemyError as e:
+            db.rollback()
+            raise ValueError(f"Error importing transactions: {str(e)}")
+
+        return {"inserted": inserted, "failed": len(errors), "errors": errors}
+
+
+    @staticmethod
+    def bulk_update_transactions(db: Session, request: BulkTransactionUpdate, user: CurrentUser) -> int:
+        """Apply one patch to the selected transactions with a single UPDATE; returns the rows changed.
+
+        The selected rows are locked and their old values read first, because derived totals need
+        both sides of each change and RETURNING only sees the new one.
+        """
+        values = request.changes.model_dump(exclude_unset=True)
+        try:
+            lock_ledgers(db, [user.id])
+            if "category_id" in values and not db.query(Category.id).filter(Category.id == values["category_id"]).first():
+                raise HTTPException(status_code=404, detail=f"Category with id {values['category_id']} not found")
+
+            previous = db.execute(
+                select(Transaction.id, *LEDGER_COLUMNS)
+                .where(Transaction.user_id == user.id, *TransactionService._selection_clauses(request))
+                .order_by(Transaction.id.asc())
+                .with_for_update()
+            ).all()
+            if not previous:
+                db.rollback()
+                return 0
+
+            updated = db.execute(
+                update(Transaction)
+                .where(Transaction.user_id == user.id, ids_clause(row.id for row in previous))
+                .values(**values)
+                .returning(*LEDGER_COLUMNS)
+                .execution_options(synchronize_session=False)
+            ).all()
+            changes = [TransactionChange(*row[1:], sign=-1) for row in previous]
+            changes.extend(TransactionChange(*row, sign=1) for row in updated)
+            TransactionService._apply_changes(db, changes)
+            db.commit()
+            return len(updated)
+        except SQLAlchemyError as e:
+            db.rollback()
+            raise ValueError(f"Error updating transactions: {str(e)}")
+
+
+    @staticmethod
+    def bulk_delete_transactions(db: Session, request: BulkTransactionDelete, user: CurrentUser) -> int:
+        """Delete the selected transactions with a single DELETE ... RETURNING; returns the rows removed."""
+        try:
+            lock_ledgers(db, [user.id])
+            deleted = db.execute(
+                delete(Transaction)
+                .where(Transaction.user_id == user.id, *TransactionService._selection_clauses(request))
+                .returning(*LEDGER_COLUMNS)
+                .execution_options(synchronize_session=False)
+            ).all()
+            TransactionService._apply_changes(db, [TransactionChange(*row, sign=-1) for row in deleted])
+            db.commit()
+            return len(deleted)
+        except SQLAlchemyError as e:
+            db.rollback()
+            raise ValueError(f"Error deleting transactions: {str(e)}")
+
+
+    @staticmethod
+    def _selection_clauses(request: BulkTransactionDelete) -> list:
+        if request.ids is not None:
+            return [ids_clause(request.ids)]
+        if request.all:
+            return []
+        return filter_clauses(request.filters)
+
+
+    @staticmethod
+    def _insert_rows(db: Session, rows: list):
+        connection = db.connection()
+        if connection.dialect.name == "postgresql" and connection.dialect.driver == "psycopg2":
+            # COPY skips per-row statement parsing and planning entirely
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for row in rows:
+                writer.writerow([row[column] for column in BULK_COLUMNS])
+            buffer.seek(0)
+            cursor = connection.connection.cursor()
+            try:
+                cursor.copy_expert(f"COPY transactions ({', '.join(BULK_COLUMNS)}) FROM STDIN WITH (FORMAT csv)", buffer)
+            finally:
+                cursor.close()
+        else:
+            db.execute(insert(Transaction), rows)
+
+
+    @staticmethod
+    def _apply_changes(db: Session, changes: list):
+        """Keep aggregates derived from transactions in step, inside the caller's DB transaction.
+
+        The caller must already hold lock_ledgers for every user in ``changes``.
+        """
+        BudgetService.apply_changes(db, changes)
+        ReportService.apply_changes(db, changes)
+        BalanceService.apply_changes(db, changes)
+
+
+class AsyncTransactionService:
+    """AsyncSession counterpart of TransactionService.
+
+    Relationships are loaded eagerly because lazy loads cannot run outside the greenlet,
+    and derived aggregates are maintained by the sync helpers through run_sync.
+    """
+
+    @staticmethod
+    def _select_for_user(user: CurrentUser):
+        return select(Transaction).options(selectinload(Transaction.category)).filter(Transaction.user_id == user.id)
+
+
+    @staticmethod
+    async def get_version(db: AsyncSession, user: CurrentUser) -> int | None:
+        return await db.run_sync(TransactionService.get_version, user)
+
+
+    @staticmethod
+    async def get_all_transactions(db: AsyncSession, page: int, limit: int, user: CurrentUser, filters: TransactionFilters = None, after: dict = None):
+        filters = filters or TransactionFilters()
+        try:
+            query = filter_transactions(AsyncTransactionService._select_for_user(user), filters)
+            query = order_transactions(query, filters.sort, after).limit(limit + 1)
+            if after is None:
+                query = query.offset((page-1)*limit)
+
+            transactions = (await db.execute(query)).scalars().all()
+            next_cursor = None
+            if len(transactions) > limit:
+                transactions = transactions[:limit]
+                next_cursor = encode_page_cursor(transactions[-1], filters.sort)
+            return transactions, next_cursor
+        except Exception as e:
+            raise ValueError(f"Error fetching transactions: {str(e)}")
+
+
+    @staticmethod
+    async def get_transaction_by_id(db: AsyncSession, transaction_id: int, user: CurrentUser, for_update: bool = False):
+        query = AsyncTransactionService._select_for_user(user).filter(Transaction.id == transaction_id)
+        if for_update:
+            query = query.with_for_update(of=Transaction)
+        return (await db.execute(query)).scalars().first()
+
+
+    @staticmethod
+    async def create_transaction(db: AsyncSession, transaction: TransactionCreate, user: CurrentUser, commit: bool = True):
+        """With ``commit=False`` the row is only flushed, for callers that commit more work with it."""
+        try:
+            await db.run_sync(lock_ledgers, [user.id])
+            db_transaction = Transaction(
+                amount = transaction.amount,
+                is_expense = transaction.is_expense,
+                transaction_date = transaction.transaction_date,
+                user_id = user.id,
+                category_id = transaction.category_id
+            )
+            db.add(db_transaction)
+            await db.run_sync(TransactionService._apply_changes, [TransactionChange.of(db_transaction, 1)])
+            if commit:
+                await db.commit()
+            else:
+                await db.flush()
+            return await AsyncTransactionService.get_transaction_by_id(db, db_transaction.id, user)
+        except IntegrityError:
+            await db.rollback()
+            raise ValueError("Error creating transaction")
+
+
+    @staticmethod
+    async def update_transaction(db: AsyncSession, transaction_id: int, transaction: TransactionUpdate, user: CurrentUser):
+        try:
+            await db.run_sync(lock_ledgers, [user.id])
+            db_transaction = await AsyncTransactionService.get_transaction_by_id(db, transaction_id, user, for_update=True)
+            if not db_transaction:
+                return None
+            previous = TransactionChange.of(db_transaction, -1)
+            for key, value in transaction.model_dump().items():
+                setattr(db_transaction, key, value)
+            await db.run_sync(TransactionService._apply_changes, [previous, TransactionChange.of(db_transaction, 1)])
+            await db.commit()
+            await db.refresh(db_transaction, attribute_names=["category"])
+            return db_transaction
+        except IntegrityError:
+            await db.rollback()
+            raise ValueError("Error updating transaction")
+
+
+    @staticmethod
+    async def delete_transaction(db: AsyncSession, transaction_id: int, user: CurrentUser):
+        try:
+            await db.run_sync(lock_ledgers, [user.id])
+            db_transaction = await AsyncTransactionService.get_transaction_by_id(db, transaction_id, user, for_update=True)
+            if not db_transaction:
+                return None
+            await db.run_sync(TransactionService._apply_changes, [TransactionChange.of(db_transaction, -1)])
+            await db.delete(db_transaction)
+            await db.commit()
+            return {"transaction_id": transaction_id }
+        except IntegrityError:
+            await db.rollback()
+            raise ValueError("Error deleting transaction")
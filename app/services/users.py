@@ -1,13 +1,38 @@
+from sqlalchemy import literal_column, select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.models import User
 from app.schemas.users import UserCreate, UserUpdate
-from app.core.security import get_password_hash
+from app.services.search import SearchService
+from app.core.security import get_password_hash, get_password_hash_async, invalidate_cached_user, revoke_tokens
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
 class UserService:
     @staticmethod
     def get_all_users(db: Session, page: int, limit: int, search: str = ""):
-        return db.query(User).order_by(User.id.asc()).filter(User.user_name.contains(search)).limit(limit).offset((page-1)*limit).all()
+        if search:
+            return SearchService.search_users(db, search, page, limit)
+        return db.query(User).order_by(User.id.asc()).limit(limit).offset((page-1)*limit).all()
+
+
+    @staticmethod
+    def get_page_version(db: Session, page: int, limit: int, search: str = "") -> str | None:
+        """Row versions of the page get_all_users returns, for ETags; None off Postgres.
+
+        A user row is rewritten by every balance update, so a per-table counter would be bumped by
+        every transaction write. Instead this reads only (id, xmin) for the page: xmin names the
+        transaction that wrote the row version, so it changes whenever the row does.
+        """
+        if not SearchService._is_postgres(db):
+            return None
+        query = SearchService.search_users_query(db, search) if search else db.query(User).order_by(User.id.asc())
+        rows = query.with_entities(User.id, literal_column("users.xmin::text")).limit(limit).offset((page-1)*limit).all()
+        return ",".join(f"{user_id}.{xmin}" for user_id, xmin in rows)
+
+
+    @staticmethod
+    def get_user_suggestions(db: Session, prefix: str, limit: int = 10):
+        return SearchService.typeahead_users(db, prefix, limit)
     
 
     @staticmethod
@@ -27,7 +52,8 @@ class UserService:
             user_name = user.user_name,
             email = user.email,
             hashed_password = hashed_password,
-            current_balance = user.current_balance
+            current_balance = user.current_balance,
+            opening_balance = user.current_balance
         )
         try:
             db.add(db_user)
@@ -46,8 +72,10 @@ class UserService:
             if db_user:
                 for key, value in user.model_dump().items():
                     setattr(db_user, key, value)
+                revoke_tokens(db_user)
                 db.commit()
                 db.refresh(db_user)
+                invalidate_cached_user(user_id)
                 return db_user
             return None
 
@@ -65,7 +93,82 @@ class UserService:
 
             db.delete(db_user)
             db.commit()
+            invalidate_cached_user(user_id)
             return db_user
         except IntegrityError:
             db.rollback()
-            raise ValueError(f"Error deleting user")
\ No newline at end of file
+            raise ValueError(f"Error deleting user")
+
+
+class AsyncUserService:
+    @staticmethod
+    async def get_all_users(db: AsyncSession, page: int, limit: int, search: str = ""):
+        return await db.run_sync(UserService.get_all_users, page, limit, search)
+
+
+    @staticmethod
+    async def get_page_version(db: AsyncSession, page: int, limit: int, search: str = "") -> str | None:
+        return await db.run_sync(UserService.get_page_version, page, limit, search)
+
+
+    @staticmethod
+    async def get_user_by_id(db: AsyncSession, user_id: int):
+        result = await db.execute(select(User).filter(User.id == user_id))
+        return result.scalars().first()
+
+
+    @staticmethod
+    async def create_user(db: AsyncSession, user: UserCreate):
+        hashed_password = await get_password_hash_async(user.password)
+        db_user = User(
+            first_name = user.first_name,
+            last_name = user.last_name,
+            user_name = user.user_name,
+            email = user.email,
+            hashed_password = hashed_password,
+            current_balance = user.current_balance,
+            opening_balance = user.current_balance
+        )
+        try:
+            db.add(db_user)
+            await db.commit()
+            await db.refresh(db_user)
+            return db_user
+        except IntegrityError:
+            await db.rollback()
+            raise ValueError("User with this email already exists")
+
+
+    @staticmethod
+    async def update_user(db: AsyncSession, user_id: int, user: UserUpdate):
+        try:
+            db_user = await AsyncUserService.get_user_by_id(db, user_id)
+            if db_user:
+                for key, value in user.model_dump().items():
+                    setattr(db_user, key, value)
+                revoke_tokens(db_user)
+                await db.commit()
+                await db.refresh(db_user)
+                invalidate_cached_user(user_id)
+                return db_user
+            return None
+
+        except SQLAlchemyError as e:
+            await db.rollback()
+            raise ValueError(f"Error updating user: {str(e)}")
+
+
+    @staticmethod
+    async def delete_user(db: AsyncSession, user_id: int):
+        try:
+            db_user = await AsyncUserService.get_user_by_id(db, user_id)
+            if not db_user:
+                return None
+
+            await db.delete(db_user)
+            await db.commit()
+            invalidate_cached_user(user_id)
+            return db_user
+        except IntegrityError:
+            await db.rollback()
+            raise ValueError(f"Error deleting user")
@@ -0,0 +1,61 @@
+import csv
+import json
+from typing import AsyncIterator, List
+
+JSON_CONTENT_TYPES = {"application/json"}
+NDJSON_CONTENT_TYPES = {"application/x-ndjson", "application/ndjson", "application/jsonl"}
+CSV_CONTENT_TYPES = {"text/csv", "application/csv"}
+
+
+class MalformedRow:
+    """Placeholder for an input row that could not be parsed, so it can be reported per row."""
+
+    def __init__(self, message: str):
+        self.message = message
+
+
+async def iter_lines(stream: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    buffer = b""
+    async for chunk in stream:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8-sig").rstrip("\r")
+    if buffer:
+        yield buffer.decode("utf-8-sig").rstrip("\r")
+
+
+async def read_records(content_type: str, stream: AsyncIterator[bytes]) -> List:
+    """Parse a JSON array, NDJSON or CSV request body into a list of raw records.
+
+    Raises ValueError for unsupported content types or a body that is not a JSON array.
+    """
+    if content_type in NDJSON_CONTENT_TYPES:
+        records = []
+        async for line in iter_lines(stream):
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                records.append(MalformedRow("Invalid JSON"))
+        return records
+
+    if content_type in CSV_CONTENT_TYPES:
+        lines = [line async for line in iter_lines(stream)]
+        records = []
+        for row in csv.DictReader(lines):
+            if None in row:
+                records.append(MalformedRow("Too many columns"))
+            else:
+                records.append(row)
+        return records
+
+    if content_type in JSON_CONTENT_TYPES:
+        body = b"".join([chunk async for chunk in stream])
+        records = json.loads(body)
+        if not isinstance(records, list):
+            raise ValueError("Expected a JSON array of transactions")
+        return records
+
+    raise ValueError(f"Unsupported content type: {content_type}")
@@ -1,14 +1,50 @@
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+from time import perf_counter
 from typing import Any
+from app.core.instrumentation import record_serialization
+
+
+class BadRequest(Exception):
+    """Raised where a handler cannot return a response itself, e.g. in a dependency, to answer with
+    ResponseHandler.bad_request_response; registered as an exception handler in app.main."""
+
+
+class SuccessEnvelope(BaseModel):
+    status: str = "success"
+    message: str
+    # Any is serialized by runtime type, so nested response models are dumped straight to JSON
+    data: Any
+
 
 class ResponseHandler:
     @staticmethod
-    def success_response(data: Any, message: str = "Request was successful", status_code: int = 200):
-        return JSONResponse(
+    def success_response(data: Any, message: str = "Request was successful", status_code: int = 200, headers: dict | None = None):
+        """Serialize the envelope once, in pydantic-core, instead of dumping models to dicts for JSONResponse."""
+        start = perf_counter()
+        body = SuccessEnvelope(message=message, data=data).model_dump_json()
+        record_serialization(perf_counter() - start)
+        return Response(
+            content=body,
             status_code=status_code,
-            content={"status": "success", "message": message, "data": data}
+            headers=headers,
+            media_type="application/json"
         )
     
+    @staticmethod
+    def replayed_response(body: str, status_code: int):
+        """Resend a stored success body verbatim, e.g. for an Idempotency-Key retry."""
+        return Response(
+            content=body,
+            status_code=status_code,
+            headers={"Idempotent-Replayed": "true"},
+            media_type="application/json"
+        )
+
+    @staticmethod
+    def not_modified_response(etag: str):
+        return Response(status_code=304, headers={"ETag": etag})
+    
     @staticmethod
     def not_found_response(message: str = "Resource not found", status_code: int = 404):
         return JSONResponse(
@@ -0,0 +1,18 @@
+from time import perf_counter
+
+# Shared by the seed script and the load generator, which must not need the app's settings
+BENCH_PASSWORD = "benchmark-password"
+
+
+def user_name(n: int) -> str:
+    return f"bench_user_{n}"
+
+
+def best_of(repeat: int, function, *args) -> float:
+    """Fastest of ``repeat`` runs in milliseconds; the minimum is the least noisy estimate."""
+    timings = []
+    for _ in range(repeat):
+        start = perf_counter()
+        function(*args)
+        timings.append(perf_counter() - start)
+    return round(min(timings) * 1000, 3)
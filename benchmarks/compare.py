@@ -0,0 +1,82 @@
+"""Compare two benchmarks.load results and flag endpoints that regressed.
+
+Usage: python -m benchmarks.compare BASELINE CURRENT [--threshold 0.10] [--min-requests 30]
+
+An endpoint regresses when a latency percentile grows, or its throughput drops, by more than the
+threshold, or when its error rate rises by more than a percentage point. The command exits with
+status 1 if any endpoint regressed, so it can gate CI.
+"""
+import argparse
+import json
+import sys
+
+LATENCY_KEYS = ("p50_ms", "p95_ms", "p99_ms")
+ERROR_RATE_TOLERANCE = 0.01
+
+
+def relative_change(old: float, new: float) -> float:
+    if not old:
+        return 0.0 if not new else float("inf")
+    return (new - old) / old
+
+
+def compare(baseline: dict, current: dict, threshold: float = 0.10, min_requests: int = 30) -> list:
+    rows = []
+    for name in sorted(set(baseline["endpoints"]) | set(current["endpoints"])):
+        old = baseline["endpoints"].get(name)
+        new = current["endpoints"].get(name)
+        row = {"endpoint": name, "changes": {}, "regressions": [], "note": None}
+        rows.append(row)
+        if old is None or new is None:
+            row["note"] = "only in current" if old is None else "only in baseline"
+            continue
+        if min(old["requests"], new["requests"]) < min_requests:
+            row["note"] = f"fewer than {min_requests} requests"
+            continue
+
+        for key in LATENCY_KEYS:
+            row["changes"][key] = relative_change(old[key], new[key])
+            if row["changes"][key] > threshold:
+                row["regressions"].append(key)
+        row["changes"]["throughput_rps"] = relative_change(old["throughput_rps"], new["throughput_rps"])
+        if row["changes"]["throughput_rps"] < -threshold:
+            row["regressions"].append("throughput_rps")
+        if new["error_rate"] > old["error_rate"] + ERROR_RATE_TOLERANCE:
+            row["regressions"].append("error_rate")
+    return rows
+
+
+def print_report(rows: list, threshold: float):
+    columns = LATENCY_KEYS + ("throughput_rps",)
+    width = max([len("endpoint")] + [len(row["endpoint"]) for row in rows])
+    print(f"{'endpoint':<{width}}  " + "  ".join(f"{column:>14}" for column in columns) + "  result")
+    for row in rows:
+        if row["note"]:
+            print(f"{row['endpoint']:<{width}}  " + "  ".join(f"{'-':>14}" for _ in columns) + f"  skipped: {row['note']}")
+            continue
+        changes = "  ".join(f"{row['changes'][column]:>+14.1%}" for column in columns)
+        result = "REGRESSED: " + ", ".join(row["regressions"]) if row["regressions"] else "ok"
+        print(f"{row['endpoint']:<{width}}  {changes}  {result}")
+
+    regressed = sum(1 for row in rows if row["regressions"])
+    print(f"\n{regressed} of {len(rows)} endpoints regressed beyond {threshold:.0%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline", help="Result JSON to compare against")
+    parser.add_argument("current", help="Result JSON of the run under test")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative change counted as a regression")
+    parser.add_argument("--min-requests", type=int, default=30, help="Endpoints with fewer samples are not compared")
+    args = parser.parse_args()
+
+    with open(args.baseline) as baseline_file, open(args.current) as current_file:
+        baseline, current = json.load(baseline_file), json.load(current_file)
+    rows = compare(baseline, current, args.threshold, args.min_requests)
+    print_report(rows, args.threshold)
+    if any(row["regressions"] for row in rows):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
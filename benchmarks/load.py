@@ -0,0 +1,291 @@
+"""Drive a running API with the weighted request mix and record per-endpoint throughput and latency.
+
+Usage: python -m benchmarks.load [--base-url http://localhost:8000] [--users 50] [--concurrency 20]
+       [--duration 60] [--warmup 10] [--label sync] [--output results.json]
+       [--compare baseline.json] [--threshold 0.10] [--login-burst 20]
+
+Each worker logs in as one of bench_user_1..N (see benchmarks.seed) and keeps issuing requests until
+the duration is up. Requests started during the warmup are not recorded. With --compare, the run
+is checked against a stored result and the command exits with status 1 if any endpoint regressed.
+
+With --login-burst N, the mix runs a second time alongside N clients that do nothing but log in,
+and ``login_burst`` reports every other endpoint's p99 with and without the burst. Password
+hashing runs on its own small pool, so the other endpoints' p99 should barely move.
+"""
+import argparse
+import asyncio
+import json
+import math
+import subprocess
+import sys
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from time import perf_counter
+from benchmarks import BENCH_PASSWORD, user_name
+from benchmarks.compare import compare, print_report, relative_change
+from benchmarks.scenarios import SCENARIOS, VirtualUser
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+BURST_ENDPOINT = "burst.login"
+
+
+class EndpointStats:
+    __slots__ = ("latencies", "statuses", "errors", "bytes", "server_timing", "timed")
+
+    def __init__(self):
+        self.latencies = []
+        self.statuses = Counter()
+        self.errors = 0
+        self.bytes = 0
+        # Summed Server-Timing durations, present when the API runs with INSTRUMENTATION_ENABLED
+        self.server_timing = defaultdict(float)
+        self.timed = 0
+
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    return sorted_values[max(0, math.ceil(fraction * len(sorted_values)) - 1)]
+
+
+def parse_server_timing(header: str) -> dict:
+    """``db;dur=1.2;desc="3 queries", serialize;dur=0.4`` -> {"db": 1.2, "db_queries": 3, "serialize": 0.4}"""
+    timings = {}
+    for metric in header.split(","):
+        name, *params = (part.strip() for part in metric.split(";"))
+        for param in params:
+            key, _, value = param.partition("=")
+            if key == "dur":
+                timings[name] = float(value)
+            elif key == "desc" and value.strip('"').endswith(" queries"):
+                timings[f"{name}_queries"] = int(value.strip('"').split()[0])
+    return timings
+
+
+async def login(client, vu: VirtualUser):
+    response = await client.post("/auth/login", json={"user_name": user_name(vu.user_number), "password": BENCH_PASSWORD})
+    response.raise_for_status()
+    vu.headers = {"Authorization": f"Bearer {response.json()['data']['access_token']}"}
+
+
+async def set_up(client, vu: VirtualUser):
+    """Log in and collect the ids the scenarios pick from; none of this is recorded."""
+    await login(client, vu)
+    suggestions = (await client.get("/users/typeahead", params={"q": user_name(vu.user_number), "limit": 50})).json()["data"]
+    vu.user_id = next(user["id"] for user in suggestions if user["user_name"] == user_name(vu.user_number))
+    categories = (await client.get("/categories/", params={"limit": 100})).json()["data"]["data"]
+    vu.category_ids = [category["id"] for category in categories]
+    transactions = (await client.get("/transactions/", params={"limit": 100}, headers=vu.headers)).json()["data"]["data"]
+    vu.transaction_ids = [transaction["id"] for transaction in transactions]
+
+
+async def worker(client, vu: VirtualUser, stats: dict, disabled: set, record_from: float, deadline: float):
+    weights = [scenario.weight for scenario in SCENARIOS]
+    while perf_counter() < deadline:
+        scenario = vu.rng.choices(SCENARIOS, weights)[0]
+        if scenario.name in disabled:
+            continue
+        request = scenario.build(vu)
+        if request is None:
+            continue
+
+        headers = {**vu.headers, **request.pop("headers", {})}
+        start = perf_counter()
+        try:
+            response = await client.request(headers=headers, **request)
+        except httpx.HTTPError:
+            if start >= record_from:
+                stats[scenario.name].errors += 1
+            continue
+        elapsed = perf_counter() - start
+
+        if response.status_code == 401 and not scenario.name.startswith("auth."):
+            # The access token expired mid-run; log in again and do not count the request
+            await login(client, vu)
+            continue
+        if response.status_code == 404 and scenario.optional:
+            disabled.add(scenario.name)
+            continue
+
+        if start >= record_from:
+            endpoint = stats[scenario.name]
+            endpoint.latencies.append(elapsed)
+            endpoint.statuses[response.status_code] += 1
+            endpoint.bytes += len(response.content)
+            if response.status_code not in scenario.ok:
+                endpoint.errors += 1
+            if "server-timing" in response.headers:
+                endpoint.timed += 1
+                for name, value in parse_server_timing(response.headers["server-timing"]).items():
+                    endpoint.server_timing[name] += value
+
+        if scenario.after is not None and response.status_code in scenario.ok:
+            scenario.after(vu, response)
+
+
+async def login_burst(client, vu: VirtualUser, stats: EndpointStats, record_from: float, deadline: float):
+    """Log in back to back, like a client retrying in a loop or many users arriving at once."""
+    credentials = {"user_name": user_name(vu.user_number), "password": BENCH_PASSWORD}
+    while perf_counter() < deadline:
+        start = perf_counter()
+        try:
+            response = await client.post("/auth/login", json=credentials)
+        except httpx.HTTPError:
+            if start >= record_from:
+                stats.errors += 1
+            continue
+        if start >= record_from:
+            stats.latencies.append(perf_counter() - start)
+            stats.statuses[response.status_code] += 1
+            # 503 is the hash queue shedding load, which is the point of the burst
+            if response.status_code not in (200, 503):
+                stats.errors += 1
+
+
+def summarize(stats: EndpointStats, seconds: float) -> dict:
+    latencies = sorted(stats.latencies)
+    requests = len(latencies)
+    summary = {
+        "requests": requests,
+        "errors": stats.errors,
+        "error_rate": round(stats.errors / requests, 4) if requests else 0.0,
+        "statuses": {str(status): count for status, count in sorted(stats.statuses.items())},
+        "throughput_rps": round(requests / seconds, 2),
+    }
+    if requests:
+        summary.update({
+            "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+            "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+            "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+            "mean_ms": round(sum(latencies) / requests * 1000, 2),
+            "max_ms": round(latencies[-1] * 1000, 2),
+            "bytes_per_request": round(stats.bytes / requests),
+        })
+    if stats.timed:
+        summary["server_timing_ms"] = {name: round(total / stats.timed, 2) for name, total in sorted(stats.server_timing.items())}
+    return summary
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def measure(client, users: list, args, burst: int = 0) -> tuple:
+    """One warmup and recording window of the mix, plus ``burst`` login-only clients; (stats, disabled)."""
+    stats = defaultdict(EndpointStats)
+    disabled = set()
+    start = perf_counter()
+    record_from = start + args.warmup
+    deadline = record_from + args.duration
+    await asyncio.gather(
+        *(worker(client, users[n % len(users)], stats, disabled, record_from, deadline) for n in range(args.concurrency)),
+        *(login_burst(client, users[n % len(users)], stats[BURST_ENDPOINT], record_from, deadline) for n in range(burst)),
+    )
+    return stats, disabled
+
+
+def burst_report(quiet: dict, burst: dict, args) -> dict:
+    """Each mix endpoint's p99 without and with the login burst; auth endpoints are left out."""
+    p99 = {}
+    for name in sorted(set(quiet) & set(burst)):
+        if name.startswith("auth.") or name == BURST_ENDPOINT or not (quiet[name].latencies and burst[name].latencies):
+            continue
+        quiet_ms = summarize(quiet[name], args.duration)["p99_ms"]
+        burst_ms = summarize(burst[name], args.duration)["p99_ms"]
+        p99[name] = {"quiet_ms": quiet_ms, "burst_ms": burst_ms, "change": round(relative_change(quiet_ms, burst_ms), 3)}
+    return {
+        "clients": args.login_burst,
+        "logins": summarize(burst[BURST_ENDPOINT], args.duration),
+        "p99": p99,
+    }
+
+
+async def run(args) -> dict:
+    headers = {"Accept-Encoding": args.accept_encoding} if args.accept_encoding else {}
+    connections = args.concurrency + args.login_burst
+    limits = httpx.Limits(max_connections=connections, max_keepalive_connections=connections)
+    async with httpx.AsyncClient(base_url=args.base_url, headers=headers, limits=limits, timeout=args.timeout) as client:
+        users = [VirtualUser(n, args.seed) for n in range(1, args.users + 1)]
+        await asyncio.gather(*(set_up(client, vu) for vu in users))
+
+        stats, disabled = await measure(client, users, args)
+        burst_stats = None
+        if args.login_burst:
+            burst_stats, _ = await measure(client, users, args, burst=args.login_burst)
+
+    total = EndpointStats()
+    for endpoint in stats.values():
+        total.latencies.extend(endpoint.latencies)
+        total.statuses.update(endpoint.statuses)
+        total.errors += endpoint.errors
+        total.bytes += endpoint.bytes
+
+    result = {
+        "label": args.label,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "git_commit": git_commit(),
+        "base_url": args.base_url,
+        "options": {
+            "users": args.users,
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "warmup": args.warmup,
+            "seed": args.seed,
+            "accept_encoding": args.accept_encoding,
+            "login_burst": args.login_burst,
+        },
+        "skipped": sorted(disabled),
+        "total": summarize(total, args.duration),
+        "endpoints": {name: summarize(stats[name], args.duration) for name in sorted(stats)},
+    }
+    if burst_stats is not None:
+        result["login_burst"] = burst_report(stats, burst_stats, args)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000", help="Where the API is listening")
+    parser.add_argument("--users", type=int, default=50, help="Seeded users to log in as")
+    parser.add_argument("--concurrency", type=int, default=20, help="Requests in flight at once")
+    parser.add_argument("--duration", type=float, default=60, help="Seconds to record for, after the warmup")
+    parser.add_argument("--warmup", type=float, default=10, help="Seconds to run before recording")
+    parser.add_argument("--timeout", type=float, default=30, help="Per-request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the request mix")
+    parser.add_argument("--accept-encoding", default=None, help="Override Accept-Encoding, e.g. identity to measure without compression")
+    parser.add_argument("--login-burst", type=int, default=0, help="Also run the mix alongside this many login-only clients and compare p99s")
+    parser.add_argument("--label", default="", help="Free-form run name, e.g. sync, async or instrumented")
+    parser.add_argument("--output", default=None, help="Write the result JSON here; only the totals and the burst report are printed then")
+    parser.add_argument("--compare", default=None, help="Result JSON to check this run against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative change counted as a regression")
+    parser.add_argument("--min-requests", type=int, default=30, help="Endpoints with fewer samples are not compared")
+    args = parser.parse_args()
+
+    if httpx is None:
+        parser.error("httpx is required to run the load generator")
+
+    result = asyncio.run(run(args))
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(result, output, indent=2)
+    summary = {key: result[key] for key in ("total", "login_burst") if key in result}
+    print(json.dumps(summary if args.output else result, indent=2))
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+        rows = compare(baseline, result, args.threshold, args.min_requests)
+        print_report(rows, args.threshold)
+        if any(row["regressions"] for row in rows):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""In-process micro-benchmarks for hot paths that need neither a server nor a database.
+
+Usage: python -m benchmarks.micro [--rows 200000] [--categories 50] [--repeat 5]
+
+- insights: the NumPy trend and anomaly pass of InsightService against a plain-Python loop over the
+  same expenses; the two must flag the same transactions. Only app.services.anomalies is imported,
+  which does not touch the models or the database.
+- serialization: one TransactionsResponse page through ResponseHandler (pydantic-core JSON) against
+  jsonable_encoder + json.dumps, the path JSONResponse takes.
+- compression: gzip and, when installed, brotli over the same page at the configured levels.
+"""
+import argparse
+import json
+import math
+import random
+from collections import defaultdict
+from datetime import date, timedelta
+from fastapi.encoders import jsonable_encoder
+from app.core.compression import Compressor, brotli
+from app.core.config import settings
+from app.schemas.transactions import TransactionsResponse
+from app.services.anomalies import EXPENSE_FIELDS, find_anomalies, np
+from app.utils.responses import ResponseHandler, SuccessEnvelope
+from benchmarks import best_of
+
+
+def synthetic_expenses(rng: random.Random, rows: int, categories: int, today: date, days: int) -> list:
+    first = today.toordinal() - days + 1
+    return [
+        (row_id, first + rng.randrange(days), rng.randrange(1, categories + 1), round(rng.lognormvariate(3.5, 1.0), 2))
+        for row_id in range(1, rows + 1)
+    ]
+
+
+def numpy_insights(expenses, today: date, days: int):
+    """The array part of InsightService.compute: rolling category means, then anomalies."""
+    categories, category_index = np.unique(expenses["category_id"], return_inverse=True)
+    daily = np.zeros((len(categories), days))
+    np.add.at(daily, (category_index, expenses["day"] - (today.toordinal() - days + 1)), expenses["amount"])
+    daily[:, -7:].mean(axis=1)
+    daily[:, -30:].mean(axis=1)
+    return find_anomalies(expenses, categories, category_index, today)
+
+
+def python_insights(rows: list, today: date, days: int):
+    """The same computation as numpy_insights, one row at a time."""
+    first = today.toordinal() - days + 1
+    daily = defaultdict(lambda: [0.0] * days)
+    sums = defaultdict(float)
+    squares = defaultdict(float)
+    counts = defaultdict(int)
+    for _, day, category_id, amount in rows:
+        daily[category_id][day - first] += amount
+        sums[category_id] += amount
+        squares[category_id] += amount * amount
+        counts[category_id] += 1
+    {category_id: (sum(values[-7:]) / 7, sum(values[-30:]) / 30) for category_id, values in daily.items()}
+
+    anomalies = []
+    for row_id, day, category_id, amount in rows:
+        count = counts[category_id]
+        mean = sums[category_id] / count
+        std = math.sqrt(max(squares[category_id] / count - mean * mean, 0.0))
+        z_score = (amount - mean) / std if std > 0 else 0.0
+        if count >= settings.insights_min_samples and z_score >= settings.insights_anomaly_z and day > today.toordinal() - settings.insights_recent_days:
+            anomalies.append((row_id, z_score))
+    return sorted(anomalies, key=lambda pair: -pair[1])
+
+
+def bench_insights(rng: random.Random, args) -> dict:
+    if np is None:
+        return {"skipped": "numpy is not installed"}
+    today = date.today()
+    rows = synthetic_expenses(rng, args.rows, args.categories, today, args.days)
+    expenses = np.array(rows, dtype=EXPENSE_FIELDS)
+
+    flagged = [anomaly["transaction_id"] for anomaly in numpy_insights(expenses, today, args.days)]
+    if flagged != [row_id for row_id, _ in python_insights(rows, today, args.days)]:
+        raise AssertionError("NumPy and Python insights flagged different transactions")
+
+    numpy_ms = best_of(args.repeat, numpy_insights, expenses, today, args.days)
+    python_ms = best_of(args.repeat, python_insights, rows, today, args.days)
+    return {"rows": args.rows, "anomalies": len(flagged), "numpy_ms": numpy_ms, "python_ms": python_ms, "speedup": round(python_ms / numpy_ms, 1)}
+
+
+def transactions_page(rng: random.Random, size: int) -> TransactionsResponse:
+    today = date.today()
+    return TransactionsResponse(total_count=size, next_cursor="eyJpZCI6IDEwMH0", data=[
+        {
+            "id": n,
+            "amount": round(rng.lognormvariate(3.5, 1.0), 2),
+            "is_expense": True,
+            "transaction_date": today - timedelta(days=n),
+            "category_id": n % 20 + 1,
+            "category": {"name": f"Category {n % 20 + 1}", "description": "Synthetic category"},
+        }
+        for n in range(1, size + 1)
+    ])
+
+
+def bench_serialization(rng: random.Random, args) -> dict:
+    page = transactions_page(rng, args.page_size)
+
+    def encoder_path():
+        json.dumps(jsonable_encoder(SuccessEnvelope(message="Request was successful", data=page))).encode()
+
+    envelope_ms = best_of(args.repeat * 20, ResponseHandler.success_response, page)
+    encoder_ms = best_of(args.repeat * 20, encoder_path)
+    return {"page_size": args.page_size, "pydantic_core_ms": envelope_ms, "jsonable_encoder_ms": encoder_ms, "speedup": round(encoder_ms / envelope_ms, 1)}
+
+
+def bench_compression(rng: random.Random, args) -> dict:
+    body = ResponseHandler.success_response(transactions_page(rng, args.page_size)).body
+    results = {"identity_bytes": len(body)}
+    for encoding in ("gzip", "br"):
+        if encoding == "br" and brotli is None:
+            results["br"] = {"skipped": "brotli is not installed"}
+            continue
+
+        def compress():
+            return Compressor(encoding, settings.compression_gzip_level, settings.compression_brotli_quality).finish(body)
+
+        results[encoding] = {"bytes": len(compress()), "ms": best_of(args.repeat * 20, compress)}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000, help="Synthetic expenses for the insights benchmark")
+    parser.add_argument("--categories", type=int, default=50, help="Distinct categories among those expenses")
+    parser.add_argument("--days", type=int, default=180, help="Days the expenses are spread over")
+    parser.add_argument("--page-size", type=int, default=100, help="Transactions in the serialized page")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement; the fastest is reported")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the synthetic data")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(json.dumps({
+        "insights": bench_insights(rng, args),
+        "serialization": bench_serialization(rng, args),
+        "compression": bench_compression(rng, args),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Report the latency cost of INSTRUMENTATION_ENABLED from a plain and an instrumented load run.
+
+Usage: python -m benchmarks.overhead PLAIN INSTRUMENTED [--budget 0.02] [--min-requests 30]
+
+Run benchmarks.load twice with the same options and seed against the same database: once with the
+API started with INSTRUMENTATION_ENABLED=false, once with it true. Overhead is the relative change
+in mean and median latency and in throughput, overall and per endpoint. Percentiles further out
+are too noisy to attribute a 2% difference to. The command exits with status 1 if the overall mean
+latency overhead exceeds the budget.
+"""
+import argparse
+import json
+import sys
+from benchmarks.compare import relative_change
+
+COLUMNS = ("mean_ms", "p50_ms", "throughput_rps")
+
+
+def overhead(plain: dict, instrumented: dict) -> dict:
+    return {column: relative_change(plain[column], instrumented[column]) for column in COLUMNS}
+
+
+def print_report(plain: dict, instrumented: dict, min_requests: int):
+    names = sorted(set(plain["endpoints"]) & set(instrumented["endpoints"]))
+    width = max([len("endpoint"), len("total")] + [len(name) for name in names])
+    print(f"{'endpoint':<{width}}  " + "  ".join(f"{column:>14}" for column in COLUMNS))
+    for name in names:
+        old, new = plain["endpoints"][name], instrumented["endpoints"][name]
+        if min(old["requests"], new["requests"]) < min_requests:
+            continue
+        changes = overhead(old, new)
+        print(f"{name:<{width}}  " + "  ".join(f"{changes[column]:>+14.1%}" for column in COLUMNS))
+    changes = overhead(plain["total"], instrumented["total"])
+    print(f"{'total':<{width}}  " + "  ".join(f"{changes[column]:>+14.1%}" for column in COLUMNS))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("plain", help="Result JSON of the run with INSTRUMENTATION_ENABLED=false")
+    parser.add_argument("instrumented", help="Result JSON of the run with INSTRUMENTATION_ENABLED=true")
+    parser.add_argument("--budget", type=float, default=0.02, help="Largest acceptable overall mean latency overhead")
+    parser.add_argument("--min-requests", type=int, default=30, help="Endpoints with fewer samples are not listed")
+    args = parser.parse_args()
+
+    with open(args.plain) as plain_file, open(args.instrumented) as instrumented_file:
+        plain, instrumented = json.load(plain_file), json.load(instrumented_file)
+    if plain["options"] != instrumented["options"]:
+        print("warning: the runs used different load options", file=sys.stderr)
+
+    print_report(plain, instrumented, args.min_requests)
+    mean_overhead = overhead(plain["total"], instrumented["total"])["mean_ms"]
+    print(f"\noverall mean latency overhead {mean_overhead:+.2%} against a budget of {args.budget:.0%}")
+    if mean_overhead > args.budget:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
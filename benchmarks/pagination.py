@@ -0,0 +1,78 @@
+"""Time OFFSET pages against the equivalent cursor seeks, deep into one user's transactions.
+
+Usage: python -m benchmarks.pagination [--user-id N] [--pages 1,10,100,1000] [--limit 10]
+       [--sort id] [--repeat 5]
+
+For every page, the cursor is the next_cursor the API hands out with the page before it, so both
+queries return the same rows; the script checks that they do. OFFSET reads and discards every row
+ahead of the page, so its latency grows with the page number, while the seek starts at the cursor
+through the matching index and stays flat. The queries run in process through TransactionService,
+the code the API runs, so HTTP and serialization do not blur the difference.
+
+The deepest page needs pages * limit transactions: seed with --transactions-per-user 20000 or more.
+"""
+import argparse
+import json
+from sqlalchemy import func, select
+from app.database.database import SessionLocal
+from app.models.models import Transaction, User
+from app.schemas.auth import CurrentUser
+from app.schemas.transactions import TransactionFilters
+from app.services.transactions import TransactionService, decode_page_cursor, encode_page_cursor
+from benchmarks import best_of, user_name
+
+
+def seek_position(db, page: int, limit: int, user: CurrentUser, filters: TransactionFilters) -> dict | None:
+    """The decoded next_cursor of the page before ``page``; None for the first page."""
+    if page == 1:
+        return None
+    previous, _ = TransactionService.get_all_transactions(db, page - 1, limit, user, filters)
+    return decode_page_cursor(encode_page_cursor(previous[-1], filters.sort), filters.sort)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--user-id", type=int, default=None, help=f"User whose transactions are paged; defaults to {user_name(1)}")
+    parser.add_argument("--pages", default="1,10,100,1000", help="Comma-separated page numbers to time")
+    parser.add_argument("--limit", type=int, default=10, help="Rows per page; the API's default")
+    parser.add_argument("--sort", default="id", help="Sort key, as in GET /transactions/?sort=")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement; the fastest is reported")
+    args = parser.parse_args()
+    pages = sorted(int(page) for page in args.pages.split(","))
+    filters = TransactionFilters(sort=args.sort)
+
+    db = SessionLocal()
+    try:
+        user_id = args.user_id or db.execute(select(User.id).where(User.user_name == user_name(1))).scalar()
+        if user_id is None:
+            parser.error(f"{user_name(1)} does not exist; run benchmarks.seed or pass --user-id")
+        user = CurrentUser(id=user_id)
+        total = db.execute(select(func.count()).select_from(Transaction).where(Transaction.user_id == user_id)).scalar()
+        if total < pages[-1] * args.limit:
+            parser.error(f"page {pages[-1]} needs {pages[-1] * args.limit} transactions but user {user_id} has {total}")
+
+        results = []
+        for page in pages:
+            after = seek_position(db, page, args.limit, user, filters)
+            offset_rows, _ = TransactionService.get_all_transactions(db, page, args.limit, user, filters)
+            cursor_rows, _ = TransactionService.get_all_transactions(db, 1, args.limit, user, filters, after)
+            if [row.id for row in offset_rows] != [row.id for row in cursor_rows]:
+                raise AssertionError(f"page {page}: OFFSET and cursor returned different rows")
+
+            offset_ms = best_of(args.repeat, TransactionService.get_all_transactions, db, page, args.limit, user, filters)
+            cursor_ms = best_of(args.repeat, TransactionService.get_all_transactions, db, 1, args.limit, user, filters, after)
+            results.append({
+                "page": page,
+                "rows_skipped": (page - 1) * args.limit,
+                "offset_ms": offset_ms,
+                "cursor_ms": cursor_ms,
+                "speedup": round(offset_ms / cursor_ms, 1),
+            })
+    finally:
+        db.close()
+
+    print(json.dumps({"user_id": user_id, "transactions": total, "limit": args.limit, "sort": args.sort, "pages": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""Weighted request mix covering every router in app/routers.
+
+Each scenario builds one request for a virtual user, or returns None when the user has nothing to
+act on yet (for example, no transaction of its own to delete). ``after`` reads the response to carry
+state forward: cursors, ETags, sync tokens and the ids the user created.
+"""
+import json
+import random
+from datetime import date, timedelta
+from typing import Callable, NamedTuple
+from uuid import uuid4
+from benchmarks import BENCH_PASSWORD, user_name
+
+
+class VirtualUser:
+    def __init__(self, user_number: int, seed: int):
+        self.user_number = user_number
+        self.rng = random.Random(seed + user_number)
+        self.user_id = None
+        self.headers = {}
+        self.category_ids = []
+        self.transaction_ids = []
+        self.created_ids = []
+        self.cursor = None
+        self.sync_token = None
+        self.etags = {}
+
+    def transaction_payload(self) -> dict:
+        return {
+            "amount": round(self.rng.uniform(1, 200), 2),
+            "is_expense": True,
+            "transaction_date": (date.today() - timedelta(days=self.rng.randrange(60))).isoformat(),
+            "category_id": self.rng.choice(self.category_ids),
+        }
+
+
+class Scenario(NamedTuple):
+    name: str
+    weight: int
+    build: Callable
+    after: Callable | None = None
+    ok: tuple = (200, 201)
+    # Endpoints mounted only by some settings (e.g. /metrics); a 404 disables the scenario for the run
+    optional: bool = False
+
+
+def data(response) -> dict:
+    return response.json()["data"]
+
+
+def get(url: str, params: dict = None, **kwargs) -> dict:
+    return {"method": "GET", "url": url, "params": params or {}, **kwargs}
+
+
+def conditional(name: str, url: str, params: dict = None):
+    """A GET that revalidates with the ETag of its previous response, so repeats should be 304s."""
+    def build(vu):
+        headers = {"If-None-Match": vu.etags[name]} if name in vu.etags else {}
+        return get(url, params, headers=headers)
+
+    def after(vu, response):
+        if "etag" in response.headers:
+            vu.etags[name] = response.headers["etag"]
+
+    return build, after
+
+
+def follow_cursor(vu, response):
+    vu.cursor = data(response)["next_cursor"]
+
+
+def follow_sync_token(vu, response):
+    body = data(response)
+    # Restart from a full download once caught up, so the delta scenario keeps doing work
+    vu.sync_token = body["next_token"] if body["has_more"] else None
+
+
+def record_created(vu, response):
+    vu.created_ids.append(data(response)["id"])
+
+
+def pop_created(vu, count: int = 1) -> list:
+    taken, vu.created_ids = vu.created_ids[-count:], vu.created_ids[:-count]
+    return taken
+
+
+def delete_one(vu):
+    ids = pop_created(vu)
+    return {"method": "DELETE", "url": f"/transactions/{ids[0]}"} if ids else None
+
+
+def bulk_create(vu):
+    body = "\n".join(json.dumps(vu.transaction_payload()) for _ in range(500))
+    return {"method": "POST", "url": "/transactions/bulk", "content": body, "headers": {"Content-Type": "application/x-ndjson"}}
+
+
+def bulk_patch(vu):
+    if not vu.created_ids:
+        return None
+    return {
+        "method": "PATCH",
+        "url": "/transactions/bulk",
+        "json": {"ids": vu.created_ids[-20:], "changes": {"category_id": vu.rng.choice(vu.category_ids)}},
+    }
+
+
+def bulk_delete(vu):
+    if len(vu.created_ids) < 20:
+        return None
+    return {"method": "DELETE", "url": "/transactions/bulk", "json": {"ids": pop_created(vu, 20)}}
+
+
+def signup(vu):
+    name = f"bench_signup_{uuid4().hex[:12]}"
+    return {
+        "method": "POST",
+        "url": "/auth/signup",
+        "json": {"first_name": "Bench", "last_name": "Signup", "user_name": name, "email": f"{name}@example.com", "password": BENCH_PASSWORD},
+    }
+
+
+def recent(days: int) -> str:
+    return (date.today() - timedelta(days=days)).isoformat()
+
+
+transactions_conditional = conditional("transactions", "/transactions/", {"limit": 50})
+categories_conditional = conditional("categories", "/categories/", {"limit": 50})
+users_conditional = conditional("users", "/users/", {"limit": 50})
+
+SCENARIOS = [
+    Scenario("auth.login", 2, lambda vu: {"method": "POST", "url": "/auth/login", "json": {"user_name": user_name(vu.user_number), "password": BENCH_PASSWORD}}),
+    Scenario("auth.signup", 1, signup),
+
+    Scenario("users.list", 3, lambda vu: get("/users/", {"page": vu.rng.randint(1, 20), "limit": 50})),
+    Scenario("users.list_conditional", 3, users_conditional[0], users_conditional[1], ok=(200, 304)),
+    Scenario("users.typeahead", 3, lambda vu: get("/users/typeahead", {"q": user_name(vu.rng.randint(1, 99))})),
+    Scenario("users.get", 3, lambda vu: get(f"/users/{vu.user_id}")),
+
+    Scenario("categories.list", 3, lambda vu: get("/categories/", {"limit": 50})),
+    Scenario("categories.list_conditional", 3, categories_conditional[0], categories_conditional[1], ok=(200, 304)),
+    Scenario("categories.typeahead", 3, lambda vu: get("/categories/typeahead", {"q": "bench-category-1"})),
+    Scenario("categories.get", 3, lambda vu: get(f"/categories/{vu.rng.choice(vu.category_ids)}")),
+
+    # OFFSET pages against keyset pagination through the same rows; benchmarks.pagination goes to page 1000
+    Scenario("transactions.list_offset", 8, lambda vu: get("/transactions/", {"page": vu.rng.randint(20, 60), "limit": 50})),
+    Scenario("transactions.list_cursor", 8, lambda vu: get("/transactions/", {"limit": 50, **({"cursor": vu.cursor} if vu.cursor else {})}), follow_cursor),
+    Scenario("transactions.list_filtered", 6, lambda vu: get("/transactions/", {
+        "date_from": recent(90),
+        "category_id": vu.rng.sample(vu.category_ids, 2),
+        "sort": "-transaction_date",
+        "limit": 50,
+    })),
+    Scenario("transactions.list_by_amount", 3, lambda vu: get("/transactions/", {"min_amount": 100, "sort": "-amount", "limit": 50})),
+    Scenario("transactions.list_conditional", 6, transactions_conditional[0], transactions_conditional[1], ok=(200, 304)),
+    Scenario("transactions.get", 8, lambda vu: get(f"/transactions/{vu.rng.choice(vu.transaction_ids)}") if vu.transaction_ids else None),
+    Scenario("transactions.create", 5, lambda vu: {
+        "method": "POST",
+        "url": "/transactions/",
+        "json": vu.transaction_payload(),
+        "headers": {"Idempotency-Key": uuid4().hex},
+    }, record_created),
+    Scenario("transactions.update", 3, lambda vu: {
+        "method": "PUT",
+        "url": f"/transactions/{vu.rng.choice(vu.created_ids)}",
+        "json": vu.transaction_payload(),
+    } if vu.created_ids else None),
+    Scenario("transactions.delete", 2, delete_one),
+    Scenario("transactions.bulk_create", 1, bulk_create),
+    Scenario("transactions.bulk_update", 1, bulk_patch),
+    Scenario("transactions.bulk_delete", 1, bulk_delete),
+    Scenario("transactions.export", 1, lambda vu: get("/transactions/export", {"format": "ndjson", "date_from": recent(30)})),
+
+    Scenario("budgets.list", 3, lambda vu: get("/budgets/")),
+    Scenario("budgets.status", 3, lambda vu: get("/budgets/status")),
+
+    Scenario("recurring.list", 2, lambda vu: get("/recurring-transactions/")),
+
+    Scenario("reports.monthly", 3, lambda vu: get("/reports/monthly", {"date_from": recent(365)})),
+    Scenario("reports.by_category", 3, lambda vu: get("/reports/by-category", {"date_from": recent(365)})),
+
+    Scenario("insights.stored", 3, lambda vu: get("/insights/")),
+    Scenario("insights.refresh", 1, lambda vu: get("/insights/", {"refresh": "true"})),
+
+    Scenario("sync.full", 1, lambda vu: get("/sync/", {"limit": 500})),
+    Scenario("sync.delta", 3, lambda vu: get("/sync/", {"limit": 500, **({"since": vu.sync_token} if vu.sync_token else {})}), follow_sync_token),
+
+    # Admins only: a 403 unless the bench users are listed in ADMIN_USER_NAMES
+    Scenario("internal.db_pool", 1, lambda vu: get("/internal/db-pool"), ok=(200, 403)),
+    Scenario("metrics.scrape", 1, lambda vu: get("/metrics"), optional=True),
+]
@@ -0,0 +1,146 @@
+"""Seed the configured database with synthetic benchmark users, categories and transactions.
+
+Usage: python -m benchmarks.seed [--scale small|medium|large] [--users N] [--transactions-per-user N] [--days 730]
+
+Seed an empty, fully migrated database (alembic upgrade head). Every user is called bench_user_<n>,
+starting at 1, and has the password BENCH_PASSWORD, which the load generator logs in with.
+"""
+import argparse
+import json
+import random
+from datetime import date, timedelta
+from time import perf_counter
+from sqlalchemy import insert, select, text
+from benchmarks import BENCH_PASSWORD, user_name
+from app.database.database import SessionLocal
+from app.core.security import get_password_hash
+from app.models.models import Budget, Category, RecurringTransaction, User
+from app.services.ledger import TransactionChange
+from app.services.partitions import PartitionService
+from app.services.transactions import TransactionService
+
+# users, categories, transactions per user
+SCALES = {
+    "small": (50, 20, 2_000),
+    "medium": (500, 50, 4_000),
+    "large": (2_000, 100, 5_000),
+}
+
+
+def seed_categories(db, count: int) -> list:
+    db.execute(insert(Category), [
+        {"name": f"bench-category-{n}", "description": f"Synthetic category {n}"} for n in range(1, count + 1)
+    ])
+    db.commit()
+    return db.execute(select(Category.id).where(Category.name.like("bench-category-%")).order_by(Category.id)).scalars().all()
+
+
+def seed_users(db, count: int) -> list:
+    # One bcrypt hash shared by every user; hashing per user would dominate the seed time
+    hashed_password = get_password_hash(BENCH_PASSWORD)
+    db.execute(insert(User), [
+        {
+            "first_name": "Bench",
+            "last_name": f"User {n}",
+            "user_name": user_name(n),
+            "email": f"{user_name(n)}@example.com",
+            "hashed_password": hashed_password,
+        }
+        for n in range(1, count + 1)
+    ])
+    db.commit()
+    return db.execute(select(User.id).where(User.user_name.like("bench\\_user\\_%")).order_by(User.id)).scalars().all()
+
+
+def ensure_partitions(db, first_day: date):
+    month = first_day.replace(day=1)
+    while month <= date.today():
+        db.execute(text("SELECT create_transaction_partition(:month)"), {"month": month})
+        month = (month + timedelta(days=32)).replace(day=1)
+    db.commit()
+    PartitionService.ensure_partitions(db)
+
+
+def seed_user_data(db, rng: random.Random, user_id: int, category_ids: list, transactions: int, first_day: date, days: int) -> int:
+    """One user's budgets, recurring rules and transactions, committed together."""
+    favourites = rng.sample(category_ids, min(len(category_ids), 8))
+    db.execute(insert(Budget), [
+        {"user_id": user_id, "category_id": category_id, "period": rng.choice(("weekly", "monthly")), "limit": rng.choice((200.0, 500.0, 1500.0))}
+        for category_id in favourites[:3]
+    ])
+    db.execute(insert(RecurringTransaction), [
+        {
+            "user_id": user_id,
+            "category_id": favourites[0],
+            "amount": 1200.0,
+            "is_expense": True,
+            "frequency": "monthly",
+            "start_date": first_day,
+            # Already caught up, so a scheduler running during a benchmark has nothing to post
+            "next_run_date": date.today() + timedelta(days=days),
+        }
+    ])
+
+    rows = []
+    for _ in range(transactions):
+        is_expense = rng.random() < 0.85
+        rows.append({
+            "amount": round(rng.lognormvariate(3.5, 1.0), 2) if is_expense else round(rng.uniform(500, 3000), 2),
+            "is_expense": is_expense,
+            "transaction_date": first_day + timedelta(days=rng.randrange(days)),
+            "user_id": user_id,
+            # Most spend lands in a handful of categories, like real ledgers
+            "category_id": rng.choice(favourites) if rng.random() < 0.8 else rng.choice(category_ids),
+        })
+    TransactionService._insert_rows(db, rows)
+    TransactionService._apply_changes(db, [TransactionChange(sign=1, **row) for row in rows])
+    db.commit()
+    return len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", choices=SCALES, default="small", help="Preset sizes for the options below")
+    parser.add_argument("--users", type=int, default=None, help="Users to create")
+    parser.add_argument("--categories", type=int, default=None, help="Categories to create")
+    parser.add_argument("--transactions-per-user", type=int, default=None, help="Transactions per user")
+    parser.add_argument("--days", type=int, default=730, help="Spread transactions over this many days up to today")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed, so runs are reproducible")
+    args = parser.parse_args()
+
+    users, categories, transactions = SCALES[args.scale]
+    users = args.users or users
+    categories = args.categories or categories
+    transactions = args.transactions_per_user or transactions
+    first_day = date.today() - timedelta(days=args.days - 1)
+    rng = random.Random(args.seed)
+
+    db = SessionLocal()
+    try:
+        if db.execute(select(User.id).where(User.user_name == user_name(1))).first():
+            parser.error("the database already holds benchmark data; seed a fresh database instead")
+
+        start = perf_counter()
+        ensure_partitions(db, first_day)
+        category_ids = seed_categories(db, categories)
+        user_ids = seed_users(db, users)
+        inserted = 0
+        for user_id in user_ids:
+            inserted += seed_user_data(db, rng, user_id, category_ids, transactions, first_day, args.days)
+        elapsed = perf_counter() - start
+        db.execute(text("ANALYZE"))
+        db.commit()
+    finally:
+        db.close()
+
+    print(json.dumps({
+        "users": len(user_ids),
+        "categories": len(category_ids),
+        "transactions": inserted,
+        "seconds": round(elapsed, 1),
+        "rows_per_second": round(inserted / elapsed) if elapsed else None,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Rows the tests create directly, bypassing the API; every name is unique so runs never collide."""
+from uuid import uuid4
+from sqlalchemy import delete, text
+from sqlalchemy.orm import Session
+from app.models.models import Budget, Category, User
+from app.schemas.auth import CurrentUser
+
+
+def unique_name(prefix: str) -> str:
+    return f"{prefix}_{uuid4().hex[:12]}"
+
+
+def create_user(db: Session) -> CurrentUser:
+    name = unique_name("test_user")
+    # No usable password; tests authenticate with tokens minted for the user
+    user = User(first_name="Test", last_name="User", user_name=name, email=f"{name}@example.com", hashed_password="!")
+    db.add(user)
+    db.commit()
+    return CurrentUser(id=user.id, user_name=name)
+
+
+def delete_user(db: Session, user_id: int):
+    # Cascades to the user's transactions, budgets and aggregates
+    db.execute(delete(User).where(User.id == user_id))
+    db.commit()
+
+
+def create_category(db: Session) -> int:
+    category = Category(name=unique_name("test_category"), description="Created by the test suite")
+    db.add(category)
+    db.commit()
+    return category.id
+
+
+def delete_category(db: Session, category_id: int):
+    db.execute(delete(Category).where(Category.id == category_id))
+    db.commit()
+
+
+def insert_transactions(db: Session, user_id: int, category_id: int, count: int, days: int = 28):
+    """Insert ``count`` expenses server-side, so building them costs the test process no memory.
+
+    Amounts cycle through 0.5, 1.5, ... 999.5 and dates through the last ``days`` days. The derived
+    aggregates (budget spend, rollups, balances) are not updated.
+    """
+    db.execute(text(
+        "INSERT INTO transactions (amount, is_expense, transaction_date, user_id, category_id) "
+        "SELECT n % 1000 + 0.5, true, CURRENT_DATE - n % :days, :user_id, :category_id "
+        "FROM generate_series(1, :count) AS n"
+    ), {"user_id": user_id, "category_id": category_id, "count": count, "days": days})
+    db.commit()
+
+
+def create_budget(db: Session, user_id: int, category_id: int, period: str = "monthly", limit: float = 500.0) -> int:
+    budget = Budget(user_id=user_id, category_id=category_id, period=period, limit=limit)
+    db.add(budget)
+    db.commit()
+    return budget.id
@@ -0,0 +1,99 @@
+"""Concurrent writers for one user must queue on the ledger lock, never deadlock.
+
+Each pair of jobs runs on two threads with their own sessions, for the same user, and afterwards the
+monthly rollups must still add up to the transactions that survived.
+"""
+import threading
+from datetime import date
+import pytest
+from sqlalchemy import func, select
+from app.database.database import SessionLocal
+from app.models.models import MonthlyRollup, Transaction
+from app.schemas.transactions import BulkTransactionDelete, BulkTransactionUpdate, TransactionCreate, TransactionPatch, TransactionUpdate
+from app.services.transactions import TransactionService
+
+ROUNDS = 50
+
+
+def transaction_payload(category_id: int) -> dict:
+    return {"amount": 10.0, "is_expense": True, "transaction_date": date.today(), "category_id": category_id}
+
+
+def create_one(db, user, category_id):
+    TransactionService.create_transaction(db, TransactionCreate(**transaction_payload(category_id)), user)
+
+
+def newest_id(db, user) -> int | None:
+    newest = db.execute(select(func.max(Transaction.id)).where(Transaction.user_id == user.id)).scalar()
+    db.rollback()
+    return newest
+
+
+def update_newest(db, user, category_id):
+    newest = newest_id(db, user)
+    if newest is not None:
+        payload = {**transaction_payload(category_id), "amount": 7.0}
+        TransactionService.update_transaction(db, newest, TransactionUpdate(**payload), user)
+
+
+def delete_newest(db, user, category_id):
+    newest = newest_id(db, user)
+    if newest is not None:
+        TransactionService.delete_transaction(db, newest, user)
+
+
+def bulk_create(db, user, category_id):
+    TransactionService.bulk_create_transactions(db, [transaction_payload(category_id)] * 20, user)
+
+
+def bulk_delete_all(db, user, category_id):
+    TransactionService.bulk_delete_transactions(db, BulkTransactionDelete(all=True), user)
+
+
+def bulk_update_all(db, user, category_id):
+    request = BulkTransactionUpdate(all=True, changes=TransactionPatch(amount=3.0))
+    TransactionService.bulk_update_transactions(db, request, user)
+
+
+def run_concurrently(jobs: tuple, user, category_id: int) -> list:
+    """Run every job ROUNDS times on its own thread and session; returns the exceptions raised."""
+    errors = []
+    barrier = threading.Barrier(len(jobs))
+
+    def loop(job):
+        db = SessionLocal()
+        try:
+            barrier.wait()
+            for _ in range(ROUNDS):
+                try:
+                    job(db, user, category_id)
+                except Exception as exc:
+                    db.rollback()
+                    errors.append(exc)
+        finally:
+            db.close()
+
+    threads = [threading.Thread(target=loop, args=(job,)) for job in jobs]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return errors
+
+
+@pytest.mark.parametrize("jobs", [
+    (create_one, bulk_delete_all),
+    (create_one, bulk_create),
+    (delete_newest, bulk_create),
+    (update_newest, bulk_update_all),
+    (delete_newest, bulk_update_all),
+], ids=lambda jobs: " vs ".join(job.__name__ for job in jobs))
+def test_concurrent_writers_do_not_deadlock(db, user, category, jobs):
+    bulk_create(db, user, category)
+    errors = run_concurrently(jobs, user, category)
+
+    assert not errors, errors
+    expenses = db.execute(select(func.coalesce(func.sum(Transaction.amount), 0.0)).where(Transaction.user_id == user.id)).scalar()
+    rolled_up = db.execute(select(func.coalesce(func.sum(MonthlyRollup.expense), 0.0)).where(MonthlyRollup.user_id == user.id)).scalar()
+    db.rollback()
+    assert rolled_up == pytest.approx(expenses)
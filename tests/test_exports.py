@@ -0,0 +1,42 @@
+import resource
+import pytest
+from app.schemas.transactions import TransactionFilters
+from app.services.exports import ExportService
+from tests.factories import create_user, delete_user, insert_transactions
+
+EXPORT_ROWS = 1_000_000
+# Headroom for allocator noise; materializing a million rows would take several hundred MB
+MAX_RSS_GROWTH_MB = 64
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def exported_bytes(user, export_format: str, filters: TransactionFilters = None) -> int:
+    return sum(len(chunk) for chunk in ExportService.stream(user, export_format, filters))
+
+
+@pytest.fixture(scope="module")
+def exporter(db, category):
+    user = create_user(db)
+    insert_transactions(db, user.id, category, EXPORT_ROWS)
+    yield user
+    delete_user(db, user.id)
+
+
+@pytest.mark.parametrize("export_format", [
+    "csv",
+    "ndjson",
+    pytest.param("parquet", marks=pytest.mark.skipif(not ExportService.parquet_available(), reason="pyarrow is not installed")),
+])
+def test_peak_rss_stays_flat_for_a_million_row_export(exporter, export_format):
+    # A small export first, so imports, the connection pool and the writers are already paid for
+    exported_bytes(exporter, export_format, TransactionFilters(max_amount=1))
+    baseline = peak_rss_mb()
+
+    size = exported_bytes(exporter, export_format)
+
+    assert size > EXPORT_ROWS
+    assert peak_rss_mb() - baseline < MAX_RSS_GROWTH_MB
@@ -0,0 +1,74 @@
+"""List and detail endpoints must run a fixed number of queries, however many rows they return.
+
+A lazy relationship load per row (an N+1) shows up here as a count that grows with the page size.
+"""
+import pytest
+from tests.factories import create_budget, create_category, delete_category, insert_transactions
+
+ROWS = 20
+
+
+@pytest.fixture
+def categories(db):
+    category_ids = [create_category(db) for _ in range(ROWS)]
+    yield category_ids
+    for category_id in category_ids:
+        delete_category(db, category_id)
+
+
+@pytest.fixture
+def transactions(db, user, categories):
+    # Spread across categories, so a per-row category load would hit a different row every time
+    for category_id in categories:
+        insert_transactions(db, user.id, category_id, 1)
+
+
+@pytest.fixture
+def budgets(db, user, categories):
+    return [create_budget(db, user.id, category_id, period) for category_id, period in zip(categories, ["monthly", "weekly"] * ROWS)]
+
+
+def queries_for(client, count_queries, headers: dict, url: str, **params) -> list:
+    """Statements run by one GET, after a first request has warmed the principal and version caches."""
+    client.get(url, headers=headers, params=params)
+    with count_queries() as statements:
+        response = client.get(url, headers=headers, params=params)
+    assert response.status_code == 200, response.text
+    return statements
+
+
+def test_transaction_list_queries_do_not_grow_with_page_size(client, count_queries, auth_headers, transactions):
+    one = queries_for(client, count_queries, auth_headers, "/transactions/", limit=1)
+    full = queries_for(client, count_queries, auth_headers, "/transactions/", limit=ROWS)
+
+    # The ETag version lookup, then the page with its categories joined in
+    assert len(full) == len(one) == 2, full
+
+
+def test_transaction_detail_runs_one_query(client, count_queries, auth_headers, transactions):
+    page = client.get("/transactions/", headers=auth_headers, params={"limit": 1}).json()["data"]["data"]
+
+    statements = queries_for(client, count_queries, auth_headers, f"/transactions/{page[0]['id']}")
+
+    assert len(statements) == 1, statements
+
+
+def test_budget_list_queries_do_not_grow_with_page_size(client, count_queries, auth_headers, budgets):
+    one = queries_for(client, count_queries, auth_headers, "/budgets/", limit=1)
+    full = queries_for(client, count_queries, auth_headers, "/budgets/", limit=ROWS)
+
+    assert len(full) == len(one) == 1, full
+
+
+def test_budget_statuses_run_two_queries(client, count_queries, auth_headers, budgets):
+    # The budgets with their categories, then every current spend bucket in one lookup
+    statements = queries_for(client, count_queries, auth_headers, "/budgets/status")
+
+    assert len(statements) == 2, statements
+
+
+@pytest.mark.parametrize("suffix, expected", [("", 1), ("/status", 2)])
+def test_budget_detail_query_count(client, count_queries, auth_headers, budgets, suffix, expected):
+    statements = queries_for(client, count_queries, auth_headers, f"/budgets/{budgets[0]}{suffix}")
+
+    assert len(statements) == expected, statements
@@ -0,0 +1,107 @@
+"""Every GET /transactions/ filter and sort must be planned as an index scan on transactions.
+
+Each check builds the listing query the API runs and EXPLAINs it with the values inlined, which is
+how psycopg2 sends them, so the plan is the one the server actually picks. A check fails if any
+transactions partition is read by a sequential scan or through an index that does not lead with one
+of the expected column lists. The planned user gets enough rows, analyzed, for the planner's
+choices to match a production-sized ledger.
+"""
+from datetime import date, timedelta
+import pytest
+from sqlalchemy import text
+from app.models.models import Transaction
+from app.schemas.transactions import TransactionFilters
+from app.services.transactions import filter_transactions, order_transactions
+from tests.factories import create_category, create_user, delete_category, delete_user, insert_transactions
+
+CATEGORIES = 10
+ROWS_PER_CATEGORY = 10_000
+DAYS = 730
+SCAN_NODES = ("Index Scan", "Index Only Scan", "Bitmap Index Scan")
+INDEX_COLUMNS = text("""
+    SELECT i.indrelid::regclass::text AS relation, a.attname
+    FROM pg_index i
+    CROSS JOIN LATERAL unnest(i.indkey::int2[]) WITH ORDINALITY AS k(attnum, position)
+    JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = k.attnum
+    WHERE i.indexrelid = CAST(:index_name AS regclass)
+    ORDER BY k.position
+""")
+
+
+def checks(category_ids: list) -> dict:
+    """name -> (filters, seek position, acceptable index column lists)"""
+    today = date.today()
+    by_id = [("user_id", "id")]
+    by_date = [("user_id", "transaction_date", "id")]
+    by_category = [("user_id", "category_id", "transaction_date", "id")]
+    return {
+        "default page": (TransactionFilters(), None, by_id),
+        "newest first": (TransactionFilters(sort="-id"), None, by_id),
+        "id cursor": (TransactionFilters(), {"id": 1000}, by_id),
+        "last 90 days by date": (TransactionFilters(date_from=today - timedelta(days=90), sort="-transaction_date"), None, by_date),
+        "date cursor": (TransactionFilters(sort="transaction_date"), {"k": today - timedelta(days=365), "id": 0}, by_date),
+        "one category by date": (TransactionFilters(category_ids=category_ids[:1], sort="-transaction_date"), None, by_category),
+        # Either index answers a multi-category filter; the planner picks by selectivity
+        "two categories by date": (TransactionFilters(category_ids=category_ids[:2], sort="-transaction_date"), None, by_category + by_date),
+        "large amounts first": (TransactionFilters(min_amount=100, sort="-amount"), None, [("user_id", "amount", "id")]),
+        "expenses in a month": (TransactionFilters(date_from=today - timedelta(days=30), date_to=today, is_expense=True, sort="transaction_date"), None, by_date),
+    }
+
+
+def plan_nodes(node: dict):
+    yield node
+    for child in node.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def explain(db, query) -> dict:
+    sql = str(query.statement.compile(dialect=db.get_bind().dialect, compile_kwargs={"literal_binds": True}))
+    return db.connection().exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}").scalar()[0]["Plan"]
+
+
+def transaction_scans(db, plan: dict) -> list:
+    """(relation, index columns or None for a sequential scan) for every read of a transactions partition."""
+    scans = []
+    for node in plan_nodes(plan):
+        if node["Node Type"] == "Seq Scan" and node["Relation Name"].startswith("transactions"):
+            scans.append((node["Relation Name"], None))
+        elif node["Node Type"] in SCAN_NODES:
+            # Bitmap index scans name only the index, so the table comes from pg_index
+            rows = db.execute(INDEX_COLUMNS, {"index_name": node["Index Name"]}).all()
+            if rows and rows[0].relation.startswith("transactions"):
+                scans.append((rows[0].relation, tuple(row.attname for row in rows)))
+    return scans
+
+
+@pytest.fixture(scope="module")
+def ledger(db):
+    """(user id, category ids) of a user with a two-year ledger spread over several categories."""
+    user = create_user(db)
+    category_ids = [create_category(db) for _ in range(CATEGORIES)]
+    for category_id in category_ids:
+        insert_transactions(db, user.id, category_id, ROWS_PER_CATEGORY, days=DAYS)
+    db.execute(text("ANALYZE transactions"))
+    db.commit()
+    yield user.id, category_ids
+    delete_user(db, user.id)
+    for category_id in category_ids:
+        delete_category(db, category_id)
+
+
+@pytest.mark.parametrize("name", list(checks([1, 2])))
+def test_transaction_listing_uses_an_index(db, ledger, name):
+    user_id, category_ids = ledger
+    filters, after, expected = checks(category_ids)[name]
+    query = db.query(Transaction).filter(Transaction.user_id == user_id)
+    query = order_transactions(filter_transactions(query, filters), filters.sort, after).limit(51)
+
+    scans = transaction_scans(db, explain(db, query))
+    db.rollback()
+
+    assert scans, "no scan of transactions found in the plan"
+    problems = [
+        f"{relation}: " + ("sequential scan" if columns is None else f"index on ({', '.join(columns)})")
+        for relation, columns in scans
+        if columns is None or not any(columns[:len(prefix)] == prefix for prefix in expected)
+    ]
+    assert not problems, problems
@@ -0,0 +1,11 @@
+import pytest
+
+
+@pytest.mark.parametrize("url", ["/transactions/", "/transactions/export"])
+def test_invalid_filters_get_the_error_envelope(client, auth_headers, url):
+    response = client.get(url, headers=auth_headers, params={"min_amount": 5, "max_amount": 1})
+
+    assert response.status_code == 400
+    body = response.json()
+    assert body["status"] == "error"
+    assert "min_amount must not be greater than max_amount" in body["message"]